@@ -0,0 +1,618 @@
+""" AVL tree whose nodes live in parallel arrays instead of node objects.
+
+    A node is an index into the arrays: keys and values are lists of references, the children and sub-tree sizes are
+    array('i') of indices and counts and the heights are array('b'). Index 0 is a sentinel for "no node", with height 0
+    and size 0, so children never have to be checked for None. Deleted slots go on a free list and are reused by the next insert.
+    The public methods are the same as AVLTree (except the ones that hand out node objects, split/join and persistence),
+    so it can be used in place of AVLTree. kth_largest, floor and the like return one reused TreeNode instead of a new one.
+    It trades speed for memory: the pool takes far fewer bytes per node, but every access goes through list and array
+    indexing in Python, so inserts are slower than in the object-based AVLTree (see tree_benchmark.py).
+"""
+
+from __future__ import annotations
+from array import array
+from typing import TypeVar, Generic
+from node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+NIL = 0
+
+
+class ArrayAVLTree(Generic[K, I]):
+    """ AVL tree stored in a pool of parallel arrays.
+
+        Attributes:
+            keys, values: key and item of every slot
+            left, right: index of the children of every slot, NIL (0) for none
+            heights: height of every slot, 0 for NIL
+            sizes: number of nodes in the sub-tree of every slot, 0 for NIL
+            free: slots of deleted nodes that can be reused
+            cursor: the one TreeNode handed out by the methods that return a node
+            root: index of the root, NIL when the tree is empty
+            length: number of nodes in the tree
+    """
+
+    def __init__(self) -> None:
+        """
+        A method to initialise an empty tree, with only the NIL slot in the arrays
+
+        Time complexity: O(1)
+        """
+        self.keys = [None]
+        self.values = [None]
+        self.left = array('i', [NIL])
+        self.right = array('i', [NIL])
+        self.heights = array('b', [0])
+        self.sizes = array('i', [0])
+        self.free = []
+        self.root = NIL
+        self.length = 0
+        self.cursor = TreeNode(None) # the node handed out by kth_largest, floor and the like, see node
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list) -> 'ArrayAVLTree':
+        """
+        A method to build a perfectly balanced tree from (key, item) pairs sorted by key in increasing order, like AVLTree.from_sorted.
+        Slot i + 1 holds pairs[i], so the arrays are filled in one go and only the links are computed.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) where n is the length of pairs
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        n = len(pairs)
+        tree = cls()
+        tree.keys.extend(pair[0] for pair in pairs)
+        tree.values.extend(pair[1] for pair in pairs)
+        tree.left.extend(array('i', [NIL]) * n)
+        tree.right.extend(array('i', [NIL]) * n)
+        tree.heights.extend(array('b', [0]) * n)
+        tree.sizes.extend(array('i', [0]) * n)
+        tree.root = tree.build_balanced(1, n + 1)
+        tree.length = n
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs) -> 'ArrayAVLTree':
+        """
+        A method to build a balanced tree from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort, then O(n)
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]))
+
+
+
+    def build_balanced(self, lo: int, hi: int) -> int:
+        """
+        A method to link slots lo to hi - 1 (already in key order) into a balanced sub-tree and return the index of its root.
+        The middle slot of every range is its root, and the ranges are handed out in a loop with a queue instead of recursing.
+        The heights and sizes are set afterwards in the reverse order of the queue, so the children of a slot are always done first.
+
+        Time complexity: O(hi - lo)
+        """
+        if lo >= hi:
+            return NIL
+        left = self.left
+        right = self.right
+        ranges = [(lo, hi)]
+        order = array('i')
+        for lo, hi in ranges: # ranges grows while it is read
+            mid = (lo + hi) // 2
+            order.append(mid)
+            if lo < mid:
+                left[mid] = (lo + mid) // 2
+                ranges.append((lo, mid))
+            if mid + 1 < hi:
+                right[mid] = (mid + 1 + hi) // 2
+                ranges.append((mid + 1, hi))
+        for i in range(len(order) - 1, -1, -1):
+            self.update(order[i])
+        return order[0]
+
+
+
+    def __len__(self) -> int:
+        """
+        A method that returns the number of nodes in the tree.
+
+        Time complexity: O(1)
+        """
+        return self.length
+
+
+
+    def is_empty(self) -> bool:
+        """
+        A method to check if the tree is empty
+
+        Time complexity: O(1)
+        """
+        return self.root == NIL
+
+
+
+    def find(self, key: K) -> int:
+        """
+        A method to return the slot holding key, or NIL when key is not in the tree
+
+        Time complexity: O(log n)
+        """
+        keys = self.keys
+        current = self.root
+        while current != NIL:
+            current_key = keys[current]
+            if key == current_key:
+                return current
+            current = self.left[current] if key < current_key else self.right[current]
+        return NIL
+
+
+
+    def __contains__(self, key: K) -> bool:
+        """
+        A method to check if the key is in the tree
+
+        Time complexity: O(log n)
+        """
+        return self.find(key) != NIL
+
+
+
+    def __getitem__(self, key: K) -> I:
+        """
+        A method to return the item of key
+        :raises KeyError: when key is not in the tree
+
+        Time complexity: O(log n)
+        """
+        current = self.find(key)
+        if current == NIL:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.values[current]
+
+
+
+    def new_node(self, key: K, item: I) -> int:
+        """
+        A method to put key and item in a free slot (or a new one at the end of the arrays) as a leaf and return its index
+
+        Time complexity: O(1) amortised
+        """
+        if self.free:
+            current = self.free.pop()
+            self.keys[current] = key
+            self.values[current] = item
+            self.left[current] = NIL
+            self.right[current] = NIL
+            self.heights[current] = 1
+            self.sizes[current] = 1
+        else:
+            current = len(self.keys)
+            self.keys.append(key)
+            self.values.append(item)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.heights.append(1)
+            self.sizes.append(1)
+        return current
+
+
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+        A method to insert key with item, walking down in a loop and rebalancing the recorded path on the way back up.
+        :raises ValueError: when key is already in the tree
+
+        Time complexity: O(log n)
+        """
+        keys = self.keys
+        path = []
+        went_left = []
+        current = self.root
+        while current != NIL:
+            current_key = keys[current]
+            if key < current_key:
+                path.append(current)
+                went_left.append(True)
+                current = self.left[current]
+            elif current_key < key:
+                path.append(current)
+                went_left.append(False)
+                current = self.right[current]
+            else:
+                raise ValueError('Inserting duplicate item')
+
+        self.root = self.retrace(path, went_left, self.new_node(key, item))
+        self.length += 1
+
+
+
+    def __delitem__(self, key: K) -> None:
+        """
+        A method to delete key. A node with two children takes the key and item of its successor and the successor slot is removed instead.
+        The removed slot goes on the free list.
+        :raises ValueError: when key is not in the tree
+
+        Time complexity: O(log n)
+        """
+        keys = self.keys
+        left = self.left
+        right = self.right
+        path = []
+        went_left = []
+        current = self.root
+        while current != NIL:
+            current_key = keys[current]
+            if key < current_key:
+                path.append(current)
+                went_left.append(True)
+                current = left[current]
+            elif current_key < key:
+                path.append(current)
+                went_left.append(False)
+                current = right[current]
+            else:
+                break
+        if current == NIL:
+            raise ValueError('Deleting non-existent item')
+
+        if left[current] != NIL and right[current] != NIL:
+            target = current
+            path.append(current)
+            went_left.append(False)
+            current = right[current]
+            while left[current] != NIL:
+                path.append(current)
+                went_left.append(True)
+                current = left[current]
+            keys[target] = keys[current]
+            self.values[target] = self.values[current]
+
+        child = left[current] if left[current] != NIL else right[current]
+        keys[current] = None
+        self.values[current] = None
+        self.free.append(current)
+        self.root = self.retrace(path, went_left, child)
+        self.length -= 1
+
+
+
+    def update(self, current: int) -> None:
+        """
+        A method to recompute the height and size of current from its children
+
+        Time complexity: O(1)
+        """
+        heights = self.heights
+        left_height = heights[self.left[current]]
+        right_height = heights[self.right[current]]
+        heights[current] = 1 + (left_height if left_height > right_height else right_height)
+        self.sizes[current] = 1 + self.sizes[self.left[current]] + self.sizes[self.right[current]]
+
+
+
+    def retrace(self, path: list, went_left: list, child: int) -> int:
+        """
+        A method to link child under the last node of path, then go up the path updating and rebalancing every node.
+        returns the new root of the sub-tree of the first node of path (child if path is empty).
+
+        Time complexity: O(log n)
+        """
+        left = self.left
+        right = self.right
+        heights = self.heights
+        for i in range(len(path) - 1, -1, -1):
+            current = path[i]
+            if went_left[i]:
+                left[current] = child
+            else:
+                right[current] = child
+            self.update(current)
+            balance = heights[right[current]] - heights[left[current]]
+            child = current if -2 < balance < 2 else self.rebalance(current)
+        return child
+
+
+
+    def left_rotate(self, current: int) -> int:
+        """
+        A method to rotate the sub-tree of current to the left, its right child becomes the root of the sub-tree (see AVLTree.left_rotate)
+
+        Time complexity: O(1)
+        """
+        child = self.right[current]
+        self.right[current] = self.left[child]
+        self.left[child] = current
+        self.update(current)
+        self.update(child)
+        return child
+
+
+
+    def right_rotate(self, current: int) -> int:
+        """
+        A method to rotate the sub-tree of current to the right, its left child becomes the root of the sub-tree (see AVLTree.right_rotate)
+
+        Time complexity: O(1)
+        """
+        child = self.left[current]
+        self.left[current] = self.right[child]
+        self.right[child] = current
+        self.update(current)
+        self.update(child)
+        return child
+
+
+
+    def rebalance(self, current: int) -> int:
+        """
+        A method to rebalance the sub-tree of current with one or two rotations if its balance factor is 2 or -2,
+        returns the new root of the sub-tree.
+
+        Time complexity: O(1)
+        """
+        heights = self.heights
+        balance = heights[self.right[current]] - heights[self.left[current]]
+        if balance >= 2:
+            child = self.right[current]
+            if heights[self.left[child]] > heights[self.right[child]]:
+                self.right[current] = self.right_rotate(child)
+            return self.left_rotate(current)
+        if balance <= -2:
+            child = self.left[current]
+            if heights[self.right[child]] > heights[self.left[child]]:
+                self.left[current] = self.left_rotate(child)
+            return self.right_rotate(current)
+        return current
+
+
+
+    def node(self, current: int) -> TreeNode:
+        """
+        A method to return the tree's one TreeNode (self.cursor) set to the key and item of slot current, or None for NIL.
+        Used by the methods that return nodes in AVLTree. No node is allocated per call: the TreeNode has no children and is
+        overwritten by the next call, so copy its key and item out before asking for another node.
+
+        Time complexity: O(1)
+        """
+        if current == NIL:
+            return None
+        cursor = self.cursor
+        cursor.key = self.keys[current]
+        cursor.item = self.values[current]
+        return cursor
+
+
+
+    def kth_largest(self, k: int) -> TreeNode:
+        """
+        A method that returns the kth largest node as self.cursor (see node), k = 1 is the largest.
+        :raises IndexError: when k is not between 1 and the number of nodes
+
+        Time complexity: O(log n), using the sub-tree sizes like AVLTree.aux_kthLargest
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k is out of range')
+        sizes = self.sizes
+        current = self.root
+        while True:
+            larger = sizes[self.right[current]]
+            if k <= larger:
+                current = self.right[current]
+            elif k == larger + 1:
+                return self.node(current)
+            else:
+                k -= larger + 1
+                current = self.left[current]
+
+
+
+    def in_order(self, ascending: bool, with_items: bool):
+        """
+        A generator that goes through the tree in-order with a stack preallocated to the height of the tree,
+        yielding (key, item) pairs or keys (see BinarySearchTree.in_order).
+
+        Time complexity: O(n) for the whole traversal
+        """
+        first = self.left if ascending else self.right
+        second = self.right if ascending else self.left
+        keys = self.keys
+        values = self.values
+        stack = array('i', [NIL]) * self.heights[self.root]
+        top = 0
+        current = self.root
+        while True:
+            while current != NIL:
+                stack[top] = current
+                top += 1
+                current = first[current]
+            if top == 0:
+                return
+            top -= 1
+            current = stack[top]
+            yield (keys[current], values[current]) if with_items else keys[current]
+            current = second[current]
+
+
+
+    def __iter__(self):
+        """
+        A method to iterate over the keys in increasing order
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.in_order(True, False)
+
+
+
+    def items(self):
+        """
+        A generator of the (key, item) pairs in increasing order of key
+
+        Time complexity: O(n) for the whole traversal
+        """
+        return self.in_order(True, True)
+
+
+
+    def reversed(self):
+        """
+        A generator of the keys in decreasing order
+
+        Time complexity: O(n) for the whole traversal
+        """
+        return self.in_order(False, False)
+
+
+
+    def __reversed__(self):
+        """
+        A method so that reversed(tree) gives the keys in decreasing order
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.in_order(False, False)
+
+
+
+    def items_desc(self):
+        """
+        A generator of the (key, item) pairs in decreasing order of key
+
+        Time complexity: O(n) for the whole traversal
+        """
+        return self.in_order(False, True)
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator of the (key, item) pairs with lo <= key <= hi in increasing order (see BinarySearchTree.range)
+
+        Time complexity: O(log n + k) where k is the number of pairs yielded
+        """
+        keys = self.keys
+        stack = []
+        current = self.root
+        while current != NIL:
+            if keys[current] < lo:
+                current = self.right[current]
+            else:
+                stack.append(current)
+                current = self.left[current]
+
+        while stack:
+            current = stack.pop()
+            if hi < keys[current]:
+                return
+            yield keys[current], self.values[current]
+            current = self.right[current]
+            while current != NIL:
+                stack.append(current)
+                current = self.left[current]
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True)
+
+        Time complexity: O(log n)
+        """
+        keys = self.keys
+        count = 0
+        current = self.root
+        while current != NIL:
+            if keys[current] < key or (inclusive and keys[current] == key):
+                count += self.sizes[self.left[current]] + 1
+                current = self.right[current]
+            else:
+                current = self.left[current]
+        return count
+
+
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        A method to return the number of keys with lo <= key <= hi
+
+        Time complexity: O(log n)
+        """
+        if hi < lo:
+            return 0
+        return self.count_less(hi, True) - self.count_less(lo, False)
+
+
+
+    def closest(self, key: K, below: bool, inclusive: bool) -> TreeNode:
+        """
+        A method to return the node with the largest key below key (or the smallest key above key when below is False),
+        counting key itself when inclusive is True. Used by floor, ceiling, predecessor and successor.
+
+        Time complexity: O(log n)
+        """
+        keys = self.keys
+        best = NIL
+        current = self.root
+        while current != NIL:
+            current_key = keys[current]
+            if inclusive and current_key == key:
+                return self.node(current)
+            if (current_key < key) if below else (key < current_key):
+                best = current
+                current = self.right[current] if below else self.left[current]
+            else:
+                current = self.left[current] if below else self.right[current]
+        return self.node(best)
+
+
+
+    def floor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the largest key <= key, or None
+
+        Time complexity: O(log n)
+        """
+        return self.closest(key, True, True)
+
+
+
+    def ceiling(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the smallest key >= key, or None
+
+        Time complexity: O(log n)
+        """
+        return self.closest(key, False, True)
+
+
+
+    def predecessor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the largest key < key, or None
+
+        Time complexity: O(log n)
+        """
+        return self.closest(key, True, False)
+
+
+
+    def successor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the smallest key > key, or None
+
+        Time complexity: O(log n)
+        """
+        return self.closest(key, False, False)
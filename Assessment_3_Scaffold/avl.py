@@ -15,7 +15,9 @@ Last modified by: Tuan Muhammad Zafri on 29/05/2022
 from bst import BinarySearchTree
 from typing import TypeVar, Generic
 from node import AVLTreeNode
-from stack_adt import ArrayStack
+import gc
+import heapq
+import pickle
 
 K = TypeVar('K')
 I = TypeVar('I')
@@ -24,10 +26,14 @@ I = TypeVar('I')
 class AVLTree(BinarySearchTree, Generic[K, I]):
     """ Self-balancing binary search tree using rebalancing by sub-tree
         rotations of Adelson-Velsky and Landis (AVL).
+
+        In persistent mode a node is never changed once it is in the tree. Insert and delete copy the nodes on the path
+        they change (and the nodes a rotation moves) and link the copies to the untouched sub-trees, so every operation
+        gives a new root and an older root still describes the tree as it was. snapshot() uses this to hand out stable versions.
     """
 
 
-    def __init__(self) -> None:
+    def __init__(self, persistent: bool = False) -> None:
         """
         A method to initialises an empty Binary Search Tree
         
@@ -35,6 +41,324 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         """
 
         BinarySearchTree.__init__(self)
+        self.persistent = persistent
+
+
+
+    def snapshot(self) -> 'AVLTree':
+
+        """
+        A method to return a version of the tree that shares every node with it and is not affected by later changes to either tree.
+        This tree is switched to persistent mode, so from now on its operations copy the paths they change instead of
+        changing the shared nodes.
+
+        Time complexity: O(1), no node is copied until one of the trees is changed
+        """
+        self.persistent = True
+        return self.wrap(self.root)
+
+
+
+    def copy_node(self, current: AVLTreeNode) -> AVLTreeNode:
+
+        """
+        A method to return a node that may be changed in place of current.
+        In persistent mode that is a new node with the same key, item, children, height and size, otherwise it is current itself.
+
+        Time complexity: O(1)
+        """
+        if not self.persistent or current is None:
+            return current
+        node = AVLTreeNode(current.key, current.item)
+        node.left = current.left
+        node.right = current.right
+        node.height = current.height
+        node.size = current.size
+        return node
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list, persistent: bool = False) -> 'AVLTree':
+
+        """
+        A method to build a balanced tree from a list of (key, item) pairs sorted by key in increasing order.
+        The nodes are laid out as a complete binary tree by build_balanced, so every height is known while building
+        and no rotation is needed.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) where n is the length of pairs, every pair is checked once and becomes one node.
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls(persistent)
+        tree.root = tree.build_balanced([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        tree.length = len(pairs)
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs, persistent: bool = False) -> 'AVLTree':
+
+        """
+        A method to build a balanced tree from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort where n is the number of pairs, then O(n) to build the tree
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]), persistent)
+
+
+
+    def split(self, key: K) -> tuple:
+
+        """
+        A method to split the tree into two trees, the first with every key < key and the second with every key >= key.
+        The nodes are moved, not copied, so this tree is empty afterwards.
+
+        Time complexity: O(log n) where n is the number of nodes, please refer to split_aux
+        """
+        left, right = self.split_aux(self.root, key)
+        self.root = None
+        self.length = 0
+        return self.wrap(left), self.wrap(right)
+
+
+
+    @classmethod
+    def join(cls, left: 'AVLTree', right: 'AVLTree') -> 'AVLTree':
+
+        """
+        A method to join two trees, where every key of left is smaller than every key of right, into one tree.
+        The smallest node of right is taken out and used as the middle node for join_aux.
+        The nodes are moved, so left and right are empty afterwards.
+        :raises ValueError: when a key of left is not smaller than every key of right
+
+        Time complexity: O(log n) where n is the number of nodes in both trees, taking the smallest node out of right is O(log n)
+                         and join_aux is O(log n)
+        """
+        if left.root is not None and right.root is not None and not left.kth_largest(1).key < right.get_minimal(right.root).key:
+            raise ValueError('Every key of left must be smaller than every key of right')
+
+        tree = cls(left.persistent or right.persistent)
+        if right.root is None:
+            tree.root = left.root
+        else:
+            smallest = right.get_minimal(right.root)
+            middle = AVLTreeNode(smallest.key, smallest.item)
+            rest = right.delete_aux(right.root, smallest.key)
+            tree.root = tree.join_aux(left.root, middle, rest)
+        tree.length = tree.get_size(tree.root)
+        left.root, left.length = None, 0
+        right.root, right.length = None, 0
+        return tree
+
+
+
+    @classmethod
+    def merge(cls, first: 'AVLTree', second: 'AVLTree') -> 'AVLTree':
+
+        """
+        A method to build a new tree with the pairs of both trees, whose keys may interleave.
+        Both trees are read in order and merged like in merge sort, then the sorted pairs are bulk loaded. first and second are not changed.
+        :raises ValueError: when both trees have the same key
+
+        Time complexity: O(n + m) where n and m are the number of nodes in first and second
+        """
+        return cls.from_sorted(list(heapq.merge(first.items(), second.items(), key=lambda pair: pair[0])))
+
+
+
+    DUMP_MAGIC = b'AVD1'
+    DUMP_CHUNK = 65536 # pairs per pickled chunk
+
+
+    def dump(self, fp) -> None:
+
+        """
+        A method to write the tree to the binary file fp: a pickled header (DUMP_MAGIC, number of pairs) followed by the pairs
+        in increasing order of key, pickled with protocol 5 in chunks of DUMP_CHUNK as a list of keys and a list of items.
+        The tree is read in-order with a stack of stack_capacity() slots, so no recursion is used and a chunk at a time is held in memory.
+
+        Time complexity: O(n) where n is the number of nodes
+        """
+        pickle.dump((self.DUMP_MAGIC, self.length), fp, protocol=5)
+        keys = []
+        items = []
+        stack = [None] * self.stack_capacity()
+        top = 0
+        current = self.root
+        while True:
+            while current is not None:
+                stack[top] = current
+                top += 1
+                current = current.left
+            if top == 0:
+                break
+            top -= 1
+            current = stack[top]
+            keys.append(current.key)
+            items.append(current.item)
+            if len(keys) == self.DUMP_CHUNK:
+                pickle.dump((keys, items), fp, protocol=5)
+                keys = []
+                items = []
+            current = current.right
+        if keys:
+            pickle.dump((keys, items), fp, protocol=5)
+
+
+
+    @classmethod
+    def load(cls, fp, persistent: bool = False) -> 'AVLTree':
+
+        """
+        A method to read a tree written by dump from the binary file fp.
+        The keys are already sorted and unique, so they go straight to build_balanced without being checked again.
+        The garbage collector is paused while the nodes are created, since it would otherwise scan the growing tree again and again.
+        :raises ValueError: when fp does not start with a dump
+
+        Time complexity: O(n) where n is the number of nodes
+        """
+        header = pickle.load(fp)
+        if not isinstance(header, tuple) or len(header) != 2 or header[0] != cls.DUMP_MAGIC:
+            raise ValueError('not an AVLTree dump')
+        length = header[1]
+
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            keys = []
+            items = []
+            while len(keys) < length:
+                chunk_keys, chunk_items = pickle.load(fp)
+                keys.extend(chunk_keys)
+                items.extend(chunk_items)
+            tree = cls(persistent)
+            tree.root = tree.build_balanced(keys, items)
+            tree.length = length
+        finally:
+            if collecting:
+                gc.enable()
+        return tree
+
+
+
+    def wrap(self, root: AVLTreeNode) -> 'AVLTree':
+
+        """
+        A method to make a new tree of the same class with root as its root
+
+        Time complexity: O(1)
+        """
+        tree = type(self)(self.persistent)
+        tree.root = root
+        tree.length = self.get_size(root)
+        return tree
+
+
+
+    def join_aux(self, left: AVLTreeNode, middle: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+
+        """
+        A method to join the sub-trees left and right with the node middle between them, where left < middle < right.
+        If the heights are close, middle simply becomes the root. Otherwise it goes down the spine of the taller sub-tree that faces the
+        shorter one until it reaches a sub-tree of about the same height, puts middle there and retraces the spine to rebalance it.
+        returns the root of the joined sub-tree.
+
+        Time complexity: O(|height(left) - height(right)| + 1) since the walk down the spine stops at the height of the shorter sub-tree
+        """
+        left_height = self.get_height(left)
+        right_height = self.get_height(right)
+        path = []
+        if left_height > right_height + 1: # attach on the right spine of left
+            node = left
+            while self.get_height(node) > right_height + 1:
+                path.append(node)
+                node = node.right
+            middle.left, middle.right = node, right
+            went_left = [False] * len(path)
+        elif right_height > left_height + 1: # attach on the left spine of right
+            node = right
+            while self.get_height(node) > left_height + 1:
+                path.append(node)
+                node = node.left
+            middle.left, middle.right = left, node
+            went_left = [True] * len(path)
+        else:
+            middle.left, middle.right = left, right
+            went_left = []
+
+        middle.height = 1 + max(self.get_height(middle.left), self.get_height(middle.right))
+        middle.size = 1 + self.get_size(middle.left) + self.get_size(middle.right)
+        return self.retrace(path, went_left, self.rebalance(middle))
+
+
+
+    def split_aux(self, current: AVLTreeNode, key: K) -> tuple:
+
+        """
+        A method to split the sub-tree of current into (sub-tree of keys < key, sub-tree of keys >= key).
+        It walks down to key recording the path, then goes back up: a node with a smaller key is joined with its left sub-tree onto the
+        left result, and a node with a larger or equal key is joined with its right sub-tree onto the right result.
+
+        Time complexity: O(log n) where n is the number of nodes. Each join costs the difference in height of the two pieces,
+                         and these differences add up to the height of the tree.
+        """
+        path = []
+        while current is not None:
+            path.append(current)
+            current = current.right if current.key < key else current.left
+
+        left = None
+        right = None
+        for i in range(len(path) - 1, -1, -1):
+            node = self.copy_node(path[i])
+            if node.key < key:
+                left = self.join_aux(node.left, node, left)
+            else:
+                right = self.join_aux(right, node, node.right)
+        return left, right
+
+
+
+    def build_balanced(self, keys: list, items: list) -> AVLTreeNode:
+
+        """
+        A method to build a balanced tree from keys sorted in increasing order and their items, and return its root.
+        The nodes are placed in a complete binary tree whose in-order positions are numbered 1 to 2^H - 1: a node at position p
+        whose lowest set bit is 2^t has its children at p - 2^(t-1) and p + 2^(t-1). Only the lowest level may have gaps, and its
+        leaves are filled from the left, so no node has sub-trees that differ in height by more than 1.
+        The levels are linked from the bottom up in loops, so no recursion is used.
+
+        Time complexity: O(n) where n is the length of keys, every node is created once and linked once
+        """
+        n = len(keys)
+        if n == 0:
+            return None
+        levels = n.bit_length()
+        leaves = n - ((1 << (levels - 1)) - 1) # nodes on the lowest level
+        at = [None] * (1 << levels) # node at each position, position 0 is not used
+        nodes = list(map(AVLTreeNode, keys, items))
+        at[1:2 * leaves + 1] = nodes[:2 * leaves] # leaves and the nodes between them
+        at[2 * leaves + 2::2] = nodes[2 * leaves:] # past the last leaf only the even positions are used
+
+        for level in range(1, levels):
+            half = 1 << (level - 1)
+            first = 1 << level
+            step = 1 << (level + 1)
+            for current, left, right in zip(at[first::step], at[first - half::step], at[first + half::step]): # every node of this level
+                current.left = left
+                current.right = right
+                if left is not None: # a missing left child means a node with no children, the right leaf is filled after the left one
+                    current.height = left.height + 1
+                    current.size = left.size + 1 if right is None else left.size + right.size + 1
+        return at[1 << (levels - 1)]
 
 
 
@@ -53,6 +377,17 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
 
 
+    def stack_capacity(self) -> int:
+
+        """
+        A method to return the most nodes an in-order traversal can have on its stack, which is the height of the root.
+
+        Time complexity: O(1)
+        """
+        return self.get_height(self.root)
+
+
+
     def get_balance(self, current: AVLTreeNode) -> int:
 
         """
@@ -75,29 +410,47 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         A method that attempts to insert an item into the tree, it uses the Key to insert
         it. After insertion, performs sub-tree rotation whenever it becomes
         unbalanced.
+        The walk down (walk_down) is a loop that records the path, and retrace goes back up that path, so no recursion is used.
         returns the new root of the subtree.
 
         Time complexity: O(log n) because in an avl tree, it is guarenteed to be balanced and the depth of a tree is always log n where
                          n is the number of nodes in a tree
 
         """
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
+        path, went_left, node = self.walk_down(current, key)
+        if node is not None:
             raise ValueError('Inserting duplicate item')
-        
-        # Update height
-        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
 
-        # Rebalance if needed
-        current = self.rebalance(current)
+        self.length += 1
+        return self.retrace(path, went_left, AVLTreeNode(key, item))
 
-        return current
+
+
+    def walk_down(self, current: AVLTreeNode, key: K) -> tuple:
+
+        """
+        A method to walk down from current to key in a loop, the search shared by insert_aux and delete_aux.
+        Returns (path, went_left, node): path holds the nodes from current down to the parent of where key is or would be,
+        went_left whether the walk went left or right from the node at the same position in path, and node is the node
+        with key, or None when key is not in the tree.
+
+        Time complexity: O(log n) as the path is at most the depth of the tree
+        """
+        path = []
+        went_left = []
+        node = current
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                went_left.append(True)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                went_left.append(False)
+                node = node.right
+            else: # if key is found
+                break
+        return path, went_left, node
 
 
 
@@ -107,41 +460,62 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         A method that attempts to delete an item from the tree, it uses the Key to
         determine the node to delete. After deletion,
         performs sub-tree rotation whenever it becomes unbalanced.
+        Like insert_aux, the path is recorded in a loop and retrace rebalances it bottom up.
         returns the new root of the subtree.
 
         Time complexity: O(log n) because in an avl tree, it is guarenteed to be balanced and the depth of a tree is always log n where
                          n is the number of nodes in a tree
         """ 
-        if current is None:
+        path, went_left, node = self.walk_down(current, key)
+        if node is None:
             raise ValueError("Item not found")
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else: # if key is found
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-            
-            # Get successor and swap
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-        # Update height
-        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
 
-        # Rebalance if needed
-        current = self.rebalance(current)
+        if node.left is not None and node.right is not None:
+            # Get successor and swap, then remove the successor node instead (it has no left child)
+            target = self.copy_node(node)
+            path.append(target)
+            went_left.append(False)
+            node = node.right
+            while node.left is not None:
+                path.append(node)
+                went_left.append(True)
+                node = node.left
+            target.key = node.key
+            target.item = node.item
 
-        return current
+        self.length -= 1
+        return self.retrace(path, went_left, node.left if node.left is not None else node.right)
+
+
+
+    def retrace(self, path: list, went_left: list, child: AVLTreeNode) -> AVLTreeNode:
+
+        """
+        A method to go back up path after the sub-tree below its last node was replaced by child.
+        Every node on the path gets its new child linked in, its height updated and is rebalanced if needed.
+        returns the new root of the subtree, which is the rebalanced first node of the path (or child if path is empty).
+
+        Time complexity: O(log n) as the path is at most the depth of the tree and every step is O(1)
+        """
+        for i in range(len(path) - 1, -1, -1):
+            current = self.copy_node(path[i])
+            if went_left[i]:
+                current.left = child
+            else:
+                current.right = child
+
+            # Update height
+            left_height = current.left.height if current.left is not None else 0
+            right_height = current.right.height if current.right is not None else 0
+            current.height = 1 + (left_height if left_height > right_height else right_height)
+            current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+
+            # Rebalance if needed
+            if -2 < right_height - left_height < 2:
+                child = current
+            else:
+                child = self.rebalance(current)
+        return child
 
 
 
@@ -159,15 +533,19 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
                     /     \                           /     \
                 center     r-tree                 l-tree     center
 
+        In persistent mode the child is copied before it is changed, current must already be safe to change.
+
         Time complexity: O(1)
         """
-        r_child = current.right
+        r_child = self.copy_node(current.right)
         r_subchild = r_child.left
         r_child.left = current
         current.right = r_subchild
 
         current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
         r_child.height = 1 + max(self.get_height(r_child.left), self.get_height(r_child.right))
+        r_child.size = current.size
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
 
         return r_child
 
@@ -188,15 +566,19 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
                 /     \                                           /     \
         l-tree     center                                 center     r-tree
 
+        In persistent mode the child is copied before it is changed, current must already be safe to change.
+
         Time complexity: O(1)
         """
-        l_child = current.left
+        l_child = self.copy_node(current.left)
         l_subchild = l_child.right
         l_child.right = current
         current.left = l_subchild
 
         current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
         l_child.height = 1 + max(self.get_height(l_child.left), self.get_height(l_child.right))
+        l_child.size = current.size
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
 
         return l_child
 
@@ -214,89 +596,21 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         - a combination of right + left rotate
         returns the new root of the subtree.
 
+        current must be safe to change (a copy in persistent mode), the child rotated first in a double rotation is copied here.
+
         Time complexity: O(1) since the if condition is only checking get_balance if the current node >= 2 or <= -2.
                          Besides that, calling the function and returning the value is also O(1)
         """
         if self.get_balance(current) >= 2:
             child = current.right
             if self.get_height(child.left) > self.get_height(child.right):
-                current.right = self.right_rotate(child)
+                current.right = self.right_rotate(self.copy_node(child))
             return self.left_rotate(current)
 
         if self.get_balance(current) <= -2:
             child = current.left
             if self.get_height(child.right) > self.get_height(child.left):
-                current.left = self.left_rotate(child)
+                current.left = self.left_rotate(self.copy_node(child))
             return self.right_rotate(current)
 
         return current
-
-
-
-    def kth_largest(self, k: int) -> AVLTreeNode:
-
-        """
-        A method that returns the kth largest node in the tree, using recursion. 
-        Here k = 1 should give the largest node in the subtree
-
-        Time complexity: O(aux_kthLargegst method), which will be O(log n), where n is the total number of nodes, please refer below
-        """
-        
-        return self.aux_kthLargest(self.root, k)
-           
-
-
-    def aux_kthLargest(self, root, k):
-
-        """
-        A helper method that finds the kth largest node in the tree, using recursion. 
-        Here k = 1 should give the largest node in the subtree
-
-        Time complexity: O(log n), where n is the total number of nodes.
-        This is because this method will only go down the tree log n times.
-        When going down a tree to search, I used stack ADT because the push and pop methods are O(1).
-        For example, 
-        8
-        ╟─4
-        ║ ╟─2
-        ║ ║ ╟─1
-        ║ ║ ╙─3
-        ║ ╙─6
-        ║   ╟─5
-        ║   ╙─7
-        ╙─12
-          ╟─10
-          ║ ╟─9
-          ║ ╙─11
-          ╙─14
-            ╟─13
-            ╙─15
-              ╟─
-              ╙─16
-        Because we are findin the kth largest so this method will go down right every time. 
-        The first time it goes down the path(8,12,10,9,11,14,13,14,16)
-        The second time it goes down the path(4,6,5,7)
-        The third time it goes down the path(2,3)
-        The fourth time it goes down the path(1)
-        Note that the path is not in the order as mentioned above, this algorithm will push and pop the nodes that is in that path and 
-        the poped node will be from largest to smallest so it returns kth largest. The time complexity of pushing and popping is O(1),
-        so for every path, when popping the node, it is O(1). So the time complexity depends on how many times it goes down the tree
-        and it will be the depth of the leftmost path(8,4,2,1). AVL is always balance so the it is also the depth of the whole tree.
-        Thats why O(log n)
-        """
-        arr = ArrayStack(self.length)
-        
-        while True:
-            while root:
-                arr.push(root)
-                root = root.right
-            root = arr.pop()
-            k -= 1
-            if not k:
-                return root
-            root = root.left
-                
-
-    
-
-
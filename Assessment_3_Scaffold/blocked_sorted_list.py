@@ -0,0 +1,409 @@
+""" Ordered map built from a list of short sorted blocks.
+
+    The keys are kept in order across a list of Python lists (blocks) of at most 2 * LOAD keys, with a parallel list of
+    items per block. A key is found by bisecting the list of block maxima and then bisecting inside one block, which in
+    CPython is much cheaper than following node references. Blocks are split when they grow past 2 * LOAD and merged with a
+    neighbour when they shrink below LOAD / 2. A FenwickTree over the block lengths is the positional index for kth_largest.
+    It has the same map interface as AVLTree, so it can be used as the tree of Game.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import TypeVar, Generic
+from fenwick import FenwickTree
+from node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class BlockedSortedList(Generic[K, I]):
+    """ Ordered map over sorted blocks.
+
+        Attributes:
+            key_blocks: sorted blocks of keys, every key of a block is smaller than the keys of the next block
+            item_blocks: the items, in the same blocks and positions as their keys
+            maxes: the largest key of every block
+            index: FenwickTree of the block lengths
+            length: number of keys
+    """
+    LOAD = 256
+
+    def __init__(self) -> None:
+        """
+        A method to initialise an empty map
+
+        Time complexity: O(1)
+        """
+        self.key_blocks = []
+        self.item_blocks = []
+        self.maxes = []
+        self.index = FenwickTree([])
+        self.length = 0
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list) -> 'BlockedSortedList':
+        """
+        A method to build the map from (key, item) pairs sorted by key in increasing order, cutting them into blocks of LOAD.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) where n is the length of pairs
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls()
+        for start in range(0, len(pairs), cls.LOAD):
+            chunk = pairs[start:start + cls.LOAD]
+            tree.key_blocks.append([pair[0] for pair in chunk])
+            tree.item_blocks.append([pair[1] for pair in chunk])
+            tree.maxes.append(chunk[-1][0])
+        tree.length = len(pairs)
+        tree.reindex()
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs) -> 'BlockedSortedList':
+        """
+        A method to build the map from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort, then O(n)
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]))
+
+
+
+    def reindex(self) -> None:
+        """
+        A method to rebuild the positional index after blocks were split, merged or removed
+
+        Time complexity: O(B) where B is the number of blocks
+        """
+        self.index = FenwickTree([len(block) for block in self.key_blocks])
+
+
+
+    def __len__(self) -> int:
+        """
+        A method that returns the number of keys
+
+        Time complexity: O(1)
+        """
+        return self.length
+
+
+
+    def is_empty(self) -> bool:
+        """
+        A method to check if the map is empty
+
+        Time complexity: O(1)
+        """
+        return self.length == 0
+
+
+
+    def locate(self, key: K) -> tuple:
+        """
+        A method to return (block, position) of key, or None when key is not in the map
+
+        Time complexity: O(log n), two bisects
+        """
+        block = bisect_left(self.maxes, key)
+        if block == len(self.maxes):
+            return None
+        keys = self.key_blocks[block]
+        position = bisect_left(keys, key)
+        if keys[position] == key:
+            return block, position
+        return None
+
+
+
+    def __contains__(self, key: K) -> bool:
+        """
+        A method to check if the key is in the map
+
+        Time complexity: O(log n)
+        """
+        return self.locate(key) is not None
+
+
+
+    def __getitem__(self, key: K) -> I:
+        """
+        A method to return the item of key
+        :raises KeyError: when key is not in the map
+
+        Time complexity: O(log n)
+        """
+        found = self.locate(key)
+        if found is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.item_blocks[found[0]][found[1]]
+
+
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+        A method to insert key with item into the block it belongs to (the last block if it is larger than every key).
+        A block that grows past 2 * LOAD is split in half.
+        :raises ValueError: when key is already in the map
+
+        Time complexity: O(log n + LOAD) for the bisects and the list insert, plus O(B) on the rare split
+        """
+        if not self.maxes:
+            self.key_blocks.append([key])
+            self.item_blocks.append([item])
+            self.maxes.append(key)
+            self.length = 1
+            self.reindex()
+            return
+
+        block = bisect_left(self.maxes, key)
+        if block == len(self.maxes):
+            block -= 1
+            self.maxes[block] = key
+        keys = self.key_blocks[block]
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            raise ValueError('Inserting duplicate item')
+        keys.insert(position, key)
+        self.item_blocks[block].insert(position, item)
+        self.length += 1
+
+        if len(keys) > 2 * self.LOAD:
+            half = len(keys) // 2
+            self.key_blocks.insert(block + 1, keys[half:])
+            self.item_blocks.insert(block + 1, self.item_blocks[block][half:])
+            del keys[half:]
+            del self.item_blocks[block][half:]
+            self.maxes.insert(block, keys[-1])
+            self.reindex()
+        else:
+            self.index.add(block, 1)
+
+
+
+    def __delitem__(self, key: K) -> None:
+        """
+        A method to delete key. A block that becomes empty is removed and one that shrinks below LOAD / 2 is merged into a neighbour
+        (and split again if that makes it too large).
+        :raises ValueError: when key is not in the map
+
+        Time complexity: O(log n + LOAD), plus O(B) when blocks are merged or removed
+        """
+        found = self.locate(key)
+        if found is None:
+            raise ValueError('Deleting non-existent item')
+        block, position = found
+        keys = self.key_blocks[block]
+        del keys[position]
+        del self.item_blocks[block][position]
+        self.length -= 1
+
+        if not keys:
+            del self.key_blocks[block]
+            del self.item_blocks[block]
+            del self.maxes[block]
+            self.reindex()
+            return
+
+        self.maxes[block] = keys[-1]
+        if len(keys) < self.LOAD // 2 and len(self.key_blocks) > 1:
+            first = block - 1 if block > 0 else block # merge block into the one before it, or the one after for the first block
+            self.key_blocks[first] += self.key_blocks[first + 1]
+            self.item_blocks[first] += self.item_blocks[first + 1]
+            del self.key_blocks[first + 1]
+            del self.item_blocks[first + 1]
+            del self.maxes[first]
+            if len(self.key_blocks[first]) > 2 * self.LOAD:
+                merged_keys = self.key_blocks[first]
+                merged_items = self.item_blocks[first]
+                half = len(merged_keys) // 2
+                self.key_blocks.insert(first + 1, merged_keys[half:])
+                self.item_blocks.insert(first + 1, merged_items[half:])
+                del merged_keys[half:]
+                del merged_items[half:]
+                self.maxes.insert(first, merged_keys[-1])
+            self.reindex()
+        else:
+            self.index.add(block, -1)
+
+
+
+    def node_at(self, position: int) -> TreeNode:
+        """
+        A method to return a TreeNode with the key and item at position (0 is the smallest key), found through the positional index
+
+        Time complexity: O(log n)
+        """
+        block = self.index.find(position + 1)
+        offset = position - self.index.prefix_sum(block)
+        return TreeNode(self.key_blocks[block][offset], self.item_blocks[block][offset])
+
+
+
+    def kth_largest(self, k: int) -> TreeNode:
+        """
+        A method that returns (a TreeNode copy of) the kth largest entry, k = 1 is the largest.
+        :raises IndexError: when k is not between 1 and the number of keys
+
+        Time complexity: O(log n)
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k is out of range')
+        return self.node_at(self.length - k)
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True)
+
+        Time complexity: O(log n)
+        """
+        search = bisect_right if inclusive else bisect_left
+        block = search(self.maxes, key)
+        if block == len(self.maxes):
+            return self.length
+        return self.index.prefix_sum(block) + search(self.key_blocks[block], key)
+
+
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        A method to return the number of keys with lo <= key <= hi
+
+        Time complexity: O(log n)
+        """
+        if hi < lo:
+            return 0
+        return self.count_less(hi, True) - self.count_less(lo, False)
+
+
+
+    def floor(self, key: K) -> TreeNode:
+        """
+        A method to return the entry with the largest key <= key, or None
+
+        Time complexity: O(log n)
+        """
+        rank = self.count_less(key, True)
+        return self.node_at(rank - 1) if rank else None
+
+
+
+    def ceiling(self, key: K) -> TreeNode:
+        """
+        A method to return the entry with the smallest key >= key, or None
+
+        Time complexity: O(log n)
+        """
+        rank = self.count_less(key, False)
+        return self.node_at(rank) if rank < self.length else None
+
+
+
+    def predecessor(self, key: K) -> TreeNode:
+        """
+        A method to return the entry with the largest key < key, or None
+
+        Time complexity: O(log n)
+        """
+        rank = self.count_less(key, False)
+        return self.node_at(rank - 1) if rank else None
+
+
+
+    def successor(self, key: K) -> TreeNode:
+        """
+        A method to return the entry with the smallest key > key, or None
+
+        Time complexity: O(log n)
+        """
+        rank = self.count_less(key, True)
+        return self.node_at(rank) if rank < self.length else None
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator of the (key, item) pairs with lo <= key <= hi in increasing order
+
+        Time complexity: O(log n + k) where k is the number of pairs yielded
+        """
+        block = bisect_left(self.maxes, lo)
+        position = bisect_left(self.key_blocks[block], lo) if block < len(self.maxes) else 0
+        while block < len(self.key_blocks):
+            keys = self.key_blocks[block]
+            items = self.item_blocks[block]
+            while position < len(keys):
+                if hi < keys[position]:
+                    return
+                yield keys[position], items[position]
+                position += 1
+            block += 1
+            position = 0
+
+
+
+    def items(self):
+        """
+        A generator of the (key, item) pairs in increasing order of key
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for keys, items in zip(self.key_blocks, self.item_blocks):
+            yield from zip(keys, items)
+
+
+
+    def items_desc(self):
+        """
+        A generator of the (key, item) pairs in decreasing order of key
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for block in range(len(self.key_blocks) - 1, -1, -1):
+            yield from zip(reversed(self.key_blocks[block]), reversed(self.item_blocks[block]))
+
+
+
+    def __iter__(self):
+        """
+        A generator of the keys in increasing order
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for keys in self.key_blocks:
+            yield from keys
+
+
+
+    def reversed(self):
+        """
+        A generator of the keys in decreasing order
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for block in range(len(self.key_blocks) - 1, -1, -1):
+            yield from reversed(self.key_blocks[block])
+
+
+
+    def __reversed__(self):
+        """
+        A method so that reversed(tree) gives the keys in decreasing order
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.reversed()
@@ -17,7 +17,6 @@ Last modified by: Ally Teh Tze-Rou on 29/05/2022
 """
 
 from typing import TypeVar, Generic
-from linked_stack import LinkedStack
 from node import TreeNode
 import sys
 
@@ -30,17 +29,20 @@ T = TypeVar('T')
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal on one array stack with a top index,
+        so no stack node is allocated for the tree nodes visited.
     """
 
-    def __init__(self, root: TreeNode[K, I]) -> None:
+    def __init__(self, root: TreeNode[K, I], capacity: int = 0) -> None:
         """
-        A method to initialise the Iterator.
+        A method to initialise the Iterator. The stack gets capacity slots up front (the tree's stack_capacity())
+        and only grows if a deeper path is found.
         
-        Time complexity: O(1)
+        Time complexity: O(capacity)
         """
 
-        self.stack = LinkedStack()
+        self.stack = [None] * capacity
+        self.top = 0
         self.current = root
 
     def __iter__(self) -> BSTInOrderIterator:
@@ -55,18 +57,27 @@ class BSTInOrderIterator:
         """ 
         The main body of the iterator.
         Returns keys of the BST one by one respecting the in-order.
-        #not sure
-        Time complexity: O(1)
+        
+        Time complexity: O(1) amortised, every node is pushed and popped once over the whole traversal
         """
 
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
+        stack = self.stack
+        current = self.current
+        while current is not None:
+            if self.top < len(stack):
+                stack[self.top] = current
+            else:
+                stack.append(current)
+            self.top += 1
+            current = current.left
 
-        if self.stack.is_empty():
+        if self.top == 0:
+            self.current = None
             raise StopIteration
 
-        result = self.stack.pop()
+        self.top -= 1
+        result = stack[self.top]
+        stack[self.top] = None
         self.current = result.right
 
         return result.key
@@ -75,6 +86,8 @@ class BSTInOrderIterator:
 class BinarySearchTree(Generic[K, I]):
     """ Basic binary search tree. """
 
+    STACK_START = 32 # slots an in-order traversal starts with, enough for a balanced tree of 2^32 nodes
+
     def __init__(self) -> None:
         """
         Initialises an empty Binary Search Tree
@@ -124,11 +137,91 @@ class BinarySearchTree(Generic[K, I]):
 
     def __iter__(self) -> BSTInOrderIterator:
         """
-        A method to create an in-order iterator. 
+        A method to create an in-order iterator, with a stack sized for the tree.
+
+        Time complexity: O(stack_capacity())
+        """
+        return BSTInOrderIterator(self.root, self.stack_capacity())
+
+
+
+    def items(self):
+        """
+        A generator of the (key, item) pairs of the tree in increasing order of key.
+
+        Time complexity: O(N) for the whole traversal, see in_order
+        """
+        return self.in_order(True, True)
+
+
+
+    def reversed(self):
+        """
+        A generator of the keys of the tree in decreasing order.
+
+        Time complexity: O(N) for the whole traversal, see in_order
+        """
+        return self.in_order(False, False)
+
+
+
+    def __reversed__(self):
+        """
+        A method so that reversed(tree) gives the keys in decreasing order, same as self.reversed()
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.in_order(False, False)
+
+
+
+    def items_desc(self):
+        """
+        A generator of the (key, item) pairs of the tree in decreasing order of key.
+
+        Time complexity: O(N) for the whole traversal, see in_order
+        """
+        return self.in_order(False, True)
+
+
+
+    def stack_capacity(self) -> int:
+        """
+        A method to return how many slots the stack of an in-order traversal starts with. The stack never holds more nodes
+        than the height of the tree, but a plain bst does not store its height, so it starts at STACK_START slots
+        (fewer for a smaller tree) and in_order doubles it when a deeper path comes.
 
         Time complexity: O(1)
         """
-        return BSTInOrderIterator(self.root)
+        return min(self.length, self.STACK_START)
+
+
+
+    def in_order(self, ascending: bool, with_items: bool):
+        """
+        A generator that goes through the tree in-order, from the smallest key if ascending is True or from the largest otherwise,
+        yielding (key, item) pairs if with_items is True or just the keys otherwise.
+        The stack is one array of stack_capacity() slots allocated up front with a top index, so no node is allocated per step.
+        It is doubled when a path is deeper than the stack, so it ends up at most twice the height of the tree.
+
+        Time complexity: O(N) for the whole traversal where N is the number of nodes, every node is pushed and popped once.
+        """
+        stack = [None] * self.stack_capacity()
+        top = 0
+        current = self.root
+        while True:
+            while current is not None:
+                if top == len(stack):
+                    stack.extend([None] * (len(stack) or 1))
+                stack[top] = current
+                top += 1
+                current = current.left if ascending else current.right
+            if top == 0:
+                return
+            top -= 1
+            node = stack[top]
+            yield (node.key, node.item) if with_items else node.key
+            current = node.right if ascending else node.left
 
 
 
@@ -166,14 +259,14 @@ class BinarySearchTree(Generic[K, I]):
                          Worst case(unbalanced): O(N) where N is the number of nodes in the tree. When unbalanced, the depth of the
                          tree is N-1
         """
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        while current is not None:
+            if key == current.key:  # found
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
 
 
@@ -188,14 +281,7 @@ class BinarySearchTree(Generic[K, I]):
                          Worst case(unbalanced): O(N) where N is the number of nodes in the tree. When unbalanced, the depth of the
                          tree is N-1
         """
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current.item
-        elif key < current.key:
-            return self.getitem_aux(current.left, key)
-        else:  # key > current.key
-            return self.getitem_aux(current.right, key)
+        return self.get_tree_node_by_key_aux(current, key).item
 
 
 
@@ -211,7 +297,9 @@ class BinarySearchTree(Generic[K, I]):
 
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
-        A method that attempts to insert an item into the tree, it uses the Key to insert it
+        A method that attempts to insert an item into the tree, it uses the Key to insert it.
+        It walks down from current in a loop instead of recursing, so a deep (unbalanced) tree does not hit the recursion limit.
+        returns the root of the subtree.
         
         Time complexity: Best case: O(1) when all nodes are in either left of right subtree.
                          Worst case(balanced): when the node we are finding is at the deppest part of tree
@@ -220,15 +308,29 @@ class BinarySearchTree(Generic[K, I]):
                          Worst case(unbalanced): O(N) where N is the number of nodes in the tree. When unbalanced, the depth of the
                          tree is N-1
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
+        if current is None:  # empty subtree
             self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
+            return TreeNode(key, item)
+
+        path = []
+        node = current
+        while True:
+            path.append(node)
+            if key < node.key:
+                if node.left is None:  # at the leaf
+                    node.left = TreeNode(key, item)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:  # at the leaf
+                    node.right = TreeNode(key, item)
+                    break
+                node = node.right
+            else:  # key == node.key
+                raise ValueError('Inserting duplicate item')
+        for node in path:  # every node above the new leaf has one more node in its sub-tree
+            node.size += 1
+        self.length += 1
         return current
 
 
@@ -246,7 +348,8 @@ class BinarySearchTree(Generic[K, I]):
     def delete_aux(self, current: TreeNode, key: K) -> TreeNode:
         """
         A method that attempts to delete an item from the tree, it uses the Key to
-        determine the node to delete.
+        determine the node to delete. It keeps the parent of the node while walking down in a loop instead of recursing.
+        returns the root of the subtree.
 
        Time complexity: Best case: O(1) when all nodes are in either left of right subtree.
                         Worst case(balanced): when the node we are finding is at the deppest part of tree
@@ -254,32 +357,45 @@ class BinarySearchTree(Generic[K, I]):
                         tree is log N
                         Worst case(unbalanced): O(N) where N is the number of nodes in the tree. When unbalanced, the depth of the
                         tree is N-1
-                        The deletion of nodes is O(1) because get_successor is O(1).
-
-        """
-        if current is None:  # key not found
+                        Finding the successor is part of the same walk down the tree.
+
+        """
+        path = [] # ancestors of node
+        parent = None
+        node = current
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                parent, node = node, node.left
+            elif key > node.key:
+                path.append(node)
+                parent, node = node, node.right
+            else:  # we found our key
+                break
+        if node is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
 
+        if node.left is not None and node.right is not None:
+            # general case => copy the successor here, then unlink the successor instead (it has no left child)
+            path.append(node)
+            parent, succ = node, node.right
+            while succ.left is not None:
+                path.append(succ)
+                parent, succ = succ, succ.left
+            node.key = succ.key
+            node.item = succ.item
+            node = succ
+
+        for ancestor in path:
+            ancestor.size -= 1
+        child = node.left if node.left is not None else node.right
+        if parent is None:
+            current = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        self.length -= 1
         return current
 
 
@@ -305,12 +421,199 @@ class BinarySearchTree(Generic[K, I]):
         Clearly, due to the properties of BST, it should be the
         left-most node.
 
+        Time complexity: O(D) where D is the depth of the left-most path of the sub-tree
+        """
+        while current.left is not None:
+            current = current.left
+        return current
+
+
+
+    def get_size(self, current: TreeNode) -> int:
+        """
+        A method to return the number of nodes in the sub-tree of current, 0 for an empty sub-tree
+
         Time complexity: O(1)
         """
-        if current.left is None:
-            return current
-        else:
-            return self.get_minimal(current.left)
+        if current is not None:
+            return current.size
+        return 0
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator of the (key, item) pairs with lo <= key <= hi, in increasing order of key.
+        It walks down to lo once, pushing the nodes it will come back to, then goes through the tree in-order until a key is above hi,
+        so nothing outside of the range is visited apart from the path to it.
+
+        Time complexity: O(D + k) where D is the depth of the tree and k is the number of pairs yielded (O(log N + k) when balanced)
+        """
+        stack = []
+        current = self.root
+        while current is not None:  # go down to lo, remembering the nodes that are >= lo
+            if current.key < lo:
+                current = current.right
+            else:
+                stack.append(current)
+                current = current.left
+
+        while stack:
+            node = stack.pop()
+            if hi < node.key:
+                return
+            yield node.key, node.item
+            current = node.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+
+
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        A method to return the number of keys with lo <= key <= hi, from the sub-tree sizes.
+
+        Time complexity: O(D) where D is the depth of the tree (O(log N) when balanced)
+        """
+        if hi < lo:
+            return 0
+        return self.count_less(hi, True) - self.count_less(lo, False)
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True).
+        Whenever the walk goes right, the node and its left sub-tree are all smaller, so their size is added.
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        count = 0
+        current = self.root
+        while current is not None:
+            if current.key < key or (inclusive and current.key == key):
+                count += self.get_size(current.left) + 1
+                current = current.right
+            else:
+                current = current.left
+        return count
+
+
+
+    def floor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the largest key <= key, or None if there is none
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            elif current.key < key:
+                best = current
+                current = current.right
+            else:
+                return current
+        return best
+
+
+
+    def ceiling(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the smallest key >= key, or None if there is none
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if current.key < key:
+                current = current.right
+            elif key < current.key:
+                best = current
+                current = current.left
+            else:
+                return current
+        return best
+
+
+
+    def predecessor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the largest key < key, or None if there is none.
+        key does not need to be in the tree.
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if current.key < key:
+                best = current
+                current = current.right
+            else:
+                current = current.left
+        return best
+
+
+
+    def successor(self, key: K) -> TreeNode:
+        """
+        A method to return the node with the smallest key > key, or None if there is none.
+        key does not need to be in the tree.
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                best = current
+                current = current.left
+            else:
+                current = current.right
+        return best
+
+
+
+    def kth_largest(self, k: int) -> TreeNode:
+        """
+        A method that returns the kth largest node in the tree. 
+        Here k = 1 should give the largest node in the subtree
+        :raises IndexError: when k is not between 1 and the number of nodes
+
+        Time complexity: O(aux_kthLargegst method), please refer below
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k is out of range')
+        return self.aux_kthLargest(self.root, k)
+           
+
+
+    def aux_kthLargest(self, root, k):
+        """
+        A helper method that finds the kth largest node in the sub-tree of root, using the sub-tree sizes.
+        Here k = 1 should give the largest node in the subtree
+
+        Time complexity: O(D) where D is the depth of the tree, O(log n) for a balanced tree where n is the total number of nodes.
+        Every node knows how many nodes are in its sub-tree, so at each node we know how many keys are larger than it
+        (the size of its right sub-tree). If that is k - 1 it is the answer, if it is k or more the answer is in the right sub-tree,
+        otherwise the answer is in the left sub-tree and the k is reduced by the nodes skipped.
+        It goes down one level per step, so it is at most D steps.
+        """
+        while root is not None:
+            larger = self.get_size(root.right)
+            if k <= larger:
+                root = root.right
+            elif k == larger + 1:
+                return root
+            else:
+                k -= larger + 1
+                root = root.left
+        raise IndexError('k is out of range')
 
 
 
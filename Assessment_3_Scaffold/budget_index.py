@@ -0,0 +1,236 @@
+""" Order-statistics tree for the budget queries of solve_game.
+
+    An adventurer with a budget buys the potions with the best ratio of valuation to buy price first, and only the last one
+    partly. The potions are kept in a treap in that order, and every node also holds the sums of cost (price * quantity) and
+    revenue (valuation * quantity) of its sub-tree. Those sums tell whether a budget covers a whole sub-tree, so the best
+    revenue of a budget is found by going down the tree once. A change to the quantity of a potion only changes the sums on
+    the path to its node, and a change to its valuation moves it in the order with one delete and one insert.
+"""
+
+from __future__ import annotations
+from treap import Treap
+from node import TreapNode
+
+
+class BudgetEntry:
+    """ Item of a node of BudgetTreap: one potion and the sums of the sub-tree of its node. """
+
+    __slots__ = ('potion_id', 'price', 'quantity', 'value', 'cost_sum', 'revenue_sum')
+
+    def __init__(self, potion_id: int, price: float, quantity: float, value: float) -> None:
+        """
+        A method to initialise the entry of a potion, the sums are set by BudgetTreap.update_node
+
+        Time complexity: O(1)
+        """
+        self.potion_id = potion_id
+        self.price = price
+        self.quantity = quantity
+        self.value = value
+        self.cost_sum = 0.0
+        self.revenue_sum = 0.0
+
+    def cost(self) -> float:
+        """
+        A method to return what buying all of the potion costs, 0 when it does not make a profit (ratio <= 1)
+
+        Time complexity: O(1)
+        """
+        return self.price * self.quantity if self.value > self.price else 0.0
+
+    def revenue(self) -> float:
+        """
+        A method to return what all of the potion sells for, 0 when it does not make a profit
+
+        Time complexity: O(1)
+        """
+        return self.value * self.quantity if self.value > self.price else 0.0
+
+
+
+class BudgetTreap(Treap):
+    """ Treap keyed by (-ratio, id) with BudgetEntry items, whose nodes keep the cost and revenue sums of their sub-trees. """
+
+
+    def update_node(self, node: TreapNode) -> None:
+        """
+        A method to set the size and the sums of node from its own entry and its children
+
+        Time complexity: O(1)
+        """
+        Treap.update_node(self, node)
+        entry = node.item
+        entry.cost_sum = entry.cost()
+        entry.revenue_sum = entry.revenue()
+        for child in (node.left, node.right):
+            if child is not None:
+                entry.cost_sum += child.item.cost_sum
+                entry.revenue_sum += child.item.revenue_sum
+
+
+
+    def update_all(self) -> None:
+        """
+        A method to set the sums of every node, children before their parents
+
+        Time complexity: O(n)
+        """
+        stack = [self.root] if self.root is not None else []
+        post_order = []
+        while stack:
+            node = stack.pop()
+            post_order.append(node)
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append(child)
+        for i in range(len(post_order) - 1, -1, -1):
+            self.update_node(post_order[i])
+
+
+
+    def update_path(self, key: tuple) -> None:
+        """
+        A method to set the sums of the node of key and of every node above it again, after its entry was changed
+
+        Time complexity: O(log n) expected
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            if key == node.key:
+                break
+            node = node.left if key < node.key else node.right
+        for i in range(len(path) - 1, -1, -1):
+            self.update_node(path[i])
+
+
+
+class BudgetIndex:
+    """ The potions of solve_game in decreasing order of valuation / buy price, ties broken by increasing id.
+
+        Potions that do not make a profit (ratio <= 1) stay in the tree but count as 0, so a later valuation can make them count.
+
+        Attributes:
+            tree: BudgetTreap of the potions
+            keys: the key in tree of every potion id
+    """
+
+    def __init__(self, potions: list) -> None:
+        """
+        A method to build the tree from (potion_id, buy_price, quantity, valuation) tuples in any order
+        :raises ValueError: when a buy price is not positive, as the ratio valuation / buy price is the key
+
+        Time complexity: O(n log n) for the sort where n is the length of potions, then O(n) for the tree and the sums
+        """
+        self.keys = {}
+        pairs = []
+        for potion_id, price, quantity, value in potions:
+            if not price > 0:
+                raise ValueError("buy price of potion {0} must be positive".format(potion_id))
+            self.keys[potion_id] = (-value / price, potion_id)
+            pairs.append((self.keys[potion_id], BudgetEntry(potion_id, price, quantity, value)))
+        self.tree = BudgetTreap.from_items(pairs)
+        self.tree.update_all()
+
+
+
+    def __len__(self) -> int:
+        """
+        A method to return the number of potions
+
+        Time complexity: O(1)
+        """
+        return len(self.tree)
+
+
+
+    def __contains__(self, potion_id: int) -> bool:
+        """
+        A method to check if the potion is in the index
+
+        Time complexity: O(1)
+        """
+        return potion_id in self.keys
+
+
+
+    def order(self) -> list:
+        """
+        A method to return the potion ids in the order they are bought, best ratio first
+
+        Time complexity: O(n)
+        """
+        return [entry.potion_id for _, entry in self.tree.items()]
+
+
+
+    def set_quantity(self, potion_id: int, quantity: float) -> None:
+        """
+        A method to change the quantity of a potion
+        :raises KeyError: when the potion is not in the index
+
+        Time complexity: O(log n) expected, one walk down to the potion and the sums of its path
+        """
+        key = self.keys[potion_id]
+        self.tree[key].quantity = quantity
+        self.tree.update_path(key)
+
+
+
+    def set_valuation(self, potion_id: int, valuation: float) -> None:
+        """
+        A method to change the valuation of a potion, which moves it to its new place in the order:
+        its node is deleted and inserted again under the new key, and both fix the sums on their way.
+        :raises KeyError: when the potion is not in the index
+
+        Time complexity: O(log n) expected, one delete and one insert
+        """
+        key = self.keys[potion_id]
+        entry = self.tree[key]
+        del self.tree[key]
+        entry.value = valuation
+        self.keys[potion_id] = (-valuation / entry.price, potion_id)
+        self.tree[self.keys[potion_id]] = entry
+
+
+
+    def max_revenue(self, budget: float) -> float:
+        """
+        A method to return the most money an adventurer with budget can make, buying the best ratios first.
+        At every node the budget buys all of the left sub-tree if it can, then the potion of the node, and then goes on to
+        the right sub-tree. Where it can not, it goes left, or buys a part of the potion of the node and stops.
+        :raises ValueError: when budget is negative
+
+        Time complexity: O(log n) expected
+        """
+        if budget < 0:
+            raise ValueError("starting money must not be negative")
+        total = 0.0
+        node = self.tree.root
+        while node is not None:
+            left = node.left.item if node.left is not None else None
+            if left is not None and budget < left.cost_sum:
+                node = node.left
+                continue
+            if left is not None:
+                budget -= left.cost_sum
+                total += left.revenue_sum
+            entry = node.item
+            if budget < entry.cost():
+                return total + budget / entry.price * entry.value
+            budget -= entry.cost()
+            total += entry.revenue()
+            node = node.right
+        return total
+
+
+
+    def solve(self, starting_money: list) -> list:
+        """
+        A method to return max_revenue of every budget in starting_money
+        :raises ValueError: when a budget is negative
+
+        Time complexity: O(M log n) expected where M is the length of starting_money
+        """
+        return [self.max_revenue(money) for money in starting_money]
@@ -0,0 +1,248 @@
+"""
+Memory mapped binary potion catalog.
+
+Layout of the file (all integers little endian):
+    header      magic, version, number of potions, table size, good_hash flag, then the byte offsets of the sections below
+    offsets     uint64 * (2n + 1), start of each string in the string table, the n types first and then the n names
+    strings     utf-8 bytes of every type and name, one after the other
+    prices      float64 * n, buy price of every potion, indexed by id
+    slots       int64 * table size, the table of a LinearProbePotionTable, holding the id stored in each slot or -1 when it is empty
+
+Every section is padded to 8 bytes. Opening a file maps it with mmap and reads the columns through memoryview,
+so nothing is copied or parsed until a potion is actually used.
+"""
+
+import mmap
+import struct
+from array import array
+from hash_table import LinearProbePotionTable
+from potion import PotionView
+
+MAGIC = b'PCAT'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQIQQQQ') # magic, version, potions, table size, good_hash, offsets, strings, prices, slots
+EMPTY_SLOT = -1
+
+
+
+def write_catalog(path: str, catalog, hashtable: LinearProbePotionTable) -> None:
+    """
+    A method to write catalog and the table of hashtable (mapping every name to its id) into a binary catalog file at path.
+
+    Time complexity: O(n + T) where n is the number of potions and T is the table size
+    """
+    count = len(catalog)
+    offsets = array('Q', [0])
+    strings = bytearray()
+    for column in (catalog.types, catalog.names):
+        for i in range(count):
+            strings += str(column[i]).encode('utf-8')
+            offsets.append(len(strings))
+
+    slots = array('q', [EMPTY_SLOT]) * len(hashtable.table)
+    for position in range(len(hashtable.table)):
+        if hashtable.table[position] is not None:
+            slots[position] = hashtable.table[position][1]
+
+    sections = [offsets.tobytes(), bytes(strings), array('d', catalog.prices).tobytes(), slots.tobytes()]
+    starts = []
+    position = _pad(HEADER.size)
+    for section in sections:
+        starts.append(position)
+        position = _pad(position + len(section))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, len(hashtable.table), hashtable.good_hash, *starts))
+        for start, section in zip(starts, sections):
+            f.write(bytes(start - f.tell()))
+            f.write(section)
+
+
+
+def open_catalog(path: str) -> tuple:
+    """
+    A method to map the binary catalog file at path and return (MappedPotionCatalog, MappedPotionTable).
+    :raises ValueError: when the file is not a binary catalog
+
+    Time complexity: O(n) to allocate the quantity column, the rest of the file is mapped and not read
+    """
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(data) < HEADER.size:
+        data.close()
+        raise ValueError("{} is not a potion catalog".format(path))
+    magic, version, count, tablesize, good_hash, offsets, strings, prices, slots = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        data.close()
+        raise ValueError("{} is not a potion catalog".format(path))
+
+    view = memoryview(data)
+    catalog = MappedPotionCatalog(data, view, count, offsets, strings, prices)
+    table = MappedPotionTable(catalog, view[slots:slots + 8 * tablesize].cast('q'), bool(good_hash))
+    return catalog, table
+
+
+
+def _pad(position: int) -> int:
+    """
+    A method to round position up to a multiple of 8
+
+    Time complexity: O(1)
+    """
+    return (position + 7) & ~7
+
+
+
+class MappedStrings:
+    """
+    Read only sequence of strings in the string table of a mapped catalog. A string is decoded only when it is asked for.
+    """
+
+    def __init__(self, strings: memoryview, offsets: memoryview, first: int, count: int) -> None:
+        """
+        A method to initialise the view on count strings, starting from the string at index first of offsets
+
+        Time complexity: O(1)
+        """
+        self.strings = strings
+        self.offsets = offsets
+        self.first = first
+        self.count = count
+
+    def __len__(self) -> int:
+        """
+        A method to return the number of strings
+
+        Time complexity: O(1)
+        """
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        """
+        A method to decode and return the string at index
+        :raises IndexError: when index is not a valid position
+
+        Time complexity: O(k) where k is the length of the string
+        """
+        if not 0 <= index < self.count:
+            raise IndexError("String index out of range")
+        i = self.first + index
+        return str(self.strings[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+
+
+class MappedPotionCatalog:
+    """
+    A PotionCatalog whose types, names and buy prices are read from a mapped file.
+    Quantities are not part of the file, so they are kept in memory and start at 0.
+    """
+
+    def __init__(self, data: mmap.mmap, view: memoryview, count: int, offsets: int, strings: int, prices: int) -> None:
+        """
+        A method to initialise the columns from the sections of the mapped file
+
+        Time complexity: O(n) where n is count, to allocate the quantity column
+        """
+        self.data = data
+        offset_column = view[offsets:offsets + 8 * (2 * count + 1)].cast('Q')
+        string_table = view[strings:prices]
+        self.types = MappedStrings(string_table, offset_column, 0, count)
+        self.names = MappedStrings(string_table, offset_column, count, count)
+        self.prices = view[prices:prices + 8 * count].cast('d')
+        self.quantities = array('d', bytes(8 * count))
+
+    def __len__(self) -> int:
+        """
+        A method to return the number of potions in the catalog
+
+        Time complexity: O(1)
+        """
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> PotionView:
+        """
+        A method to return a view of the potion at the given position
+        :raises IndexError: when index is not a valid position
+
+        Time complexity: O(1)
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("Potion index out of range")
+        return PotionView(self, index % len(self))
+
+    def extend(self, rows: list) -> int:
+        """
+        A mapped catalog can not be added to, save the catalog again with the new potions instead
+        :raises TypeError: always
+
+        Time complexity: O(1)
+        """
+        raise TypeError("A mapped potion catalog is read only")
+
+
+
+class MappedSlots:
+    """
+    The table of a MappedPotionTable. A slot reads as (name, id) like the table of a LinearProbePotionTable, or None when it is empty.
+    """
+
+    def __init__(self, catalog: MappedPotionCatalog, slots: memoryview) -> None:
+        """
+        A method to initialise the table on the slot column of the file
+
+        Time complexity: O(1)
+        """
+        self.catalog = catalog
+        self.slots = slots
+
+    def __len__(self) -> int:
+        """
+        A method to return the table size
+
+        Time complexity: O(1)
+        """
+        return len(self.slots)
+
+    def __getitem__(self, position: int) -> tuple:
+        """
+        A method to return the (name, id) pair in the slot at position, or None if it is empty
+
+        Time complexity: O(k) where k is the length of the name
+        """
+        potion_id = self.slots[position]
+        if potion_id == EMPTY_SLOT:
+            return None
+        return self.catalog.names[potion_id], potion_id
+
+
+
+class MappedPotionTable(LinearProbePotionTable):
+    """
+    Read only LinearProbePotionTable from the slots saved in a binary catalog.
+    Lookups hash and probe exactly like the table that was saved, so a name is found without rebuilding the table.
+    """
+
+    def __init__(self, catalog: MappedPotionCatalog, slots: memoryview, good_hash: bool) -> None:
+        """
+        A method to initialise the table on the slots of the file
+
+        Time complexity: O(1)
+        """
+        self.conflict_count = 0
+        self.probe_max = 0
+        self.probe_total = 0
+
+        self.count = len(catalog)
+        self.max_potions = len(catalog)
+        self.good_hash = good_hash
+        self.tablesize = len(slots)
+        self.table = MappedSlots(catalog, slots)
+
+    def __setitem__(self, key: str, data: int) -> None:
+        """
+        A mapped table can not be changed
+        :raises TypeError: always
+
+        Time complexity: O(1)
+        """
+        raise TypeError("A mapped potion table is read only")
@@ -0,0 +1,100 @@
+""" Fenwick (binary indexed) tree.
+
+    Keeps a list of non-negative counts so that a count can be changed, a prefix sum read and the position where the
+    running total reaches k found, each in O(log n).
+"""
+
+
+class FenwickTree:
+    """ Fenwick tree over n counts, indexed from 0.
+
+        Attributes:
+            tree: the partial sums, tree[i] (1-indexed) holds the sum of the counts in (i - lowbit(i), i]
+            mask: the largest power of two <= n, where find starts descending
+    """
+
+    def __init__(self, counts: list) -> None:
+        """
+        A method to build the tree from the initial counts, by adding every partial sum to its parent once.
+
+        Time complexity: O(n) where n is the length of counts
+        """
+        n = len(counts)
+        tree = [0] * (n + 1)
+        for i in range(1, n + 1):
+            tree[i] += counts[i - 1]
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.mask = 1 << (n.bit_length() - 1) if n else 0
+
+
+
+    def __len__(self) -> int:
+        """
+        A method to return the number of counts
+
+        Time complexity: O(1)
+        """
+        return len(self.tree) - 1
+
+
+
+    def add(self, index: int, delta: int) -> None:
+        """
+        A method to add delta to the count at index
+
+        Time complexity: O(log n)
+        """
+        tree = self.tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+
+
+    def prefix_sum(self, index: int) -> int:
+        """
+        A method to return the sum of the counts before index, i.e. of counts[0:index]
+
+        Time complexity: O(log n)
+        """
+        tree = self.tree
+        total = 0
+        i = index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+
+    def total(self) -> int:
+        """
+        A method to return the sum of all counts
+
+        Time complexity: O(log n)
+        """
+        return self.prefix_sum(len(self))
+
+
+
+    def find(self, k: int) -> int:
+        """
+        A method to return the smallest index such that counts[0] + ... + counts[index] >= k, for 1 <= k <= total().
+        It goes down the implicit tree from the largest power of two, taking a step whenever the partial sum there is still below k.
+
+        Time complexity: O(log n)
+        """
+        tree = self.tree
+        position = 0
+        mask = self.mask
+        while mask:
+            step = position + mask
+            if step < len(tree) and tree[step] < k:
+                position = step
+                k -= tree[step]
+            mask >>= 1
+        return position
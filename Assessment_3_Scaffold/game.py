@@ -7,47 +7,183 @@ Last modified by: Tuan Muhammad Zafri on 29/05/2022
 """
 
 from __future__ import annotations
-from potion import Potion
+from potion import PotionCatalog, PotionView
 from hash_table import LinearProbePotionTable
 from random_gen import RandomGen
 from avl import AVLTree
+from integer_index import IntegerKeyIndex
+from fenwick import FenwickTree
+from budget_index import BudgetIndex
 # ^ In case you aren't on Python 3.10
 from random_gen import RandomGen
+from potion_io import catalog_rows, inventory_rows, count_rows, chunked
+from catalog_file import write_catalog, open_catalog
+from bisect import bisect_right
+from itertools import accumulate
+import struct
+import time
+
+try:
+    import numpy
+except ImportError: # solve_vectorized falls back to plain lists
+    numpy = None
 
 class Game:
+
+    SNAPSHOT_MAGIC = b'PGS2'
+    SNAPSHOT_HEADER = struct.Struct('<4sqQQIIIBI') # magic, rng seed/record/state, max_potions, tablesize, potions, good_hash, in stock
+    SNAPSHOT_POTION = struct.Struct('<IIdd') # type length, name length, buy_price, quantity
+    QUANTITY_EPSILON = 1e-9 # a quantity this close to 0 after a change is float residue (0.3 - 0.1 - 0.2) and is set to 0
     
 
-    def __init__(self, seed=0) -> None:
+    def __init__(self, seed=0, tree_class=AVLTree) -> None:
 
         """
-        This method initialises the instance variables rand, hashtable, tree, length_potion_with_quantity, and tree_solvegame.
+        This method initialises the instance variables rand, catalog, hashtable, tree, length_potion_with_quantity, and tree_solvegame.
+        tree_class is the ordered map used for both trees, AVLTree by default or BlockedSortedList, Treap, SkipList, ScapegoatTree
+        or IntegerKeyIndex (any class with from_sorted, from_items, __setitem__, __delitem__, items, items_desc and kth_largest).
+        IntegerKeyIndex only takes bounded price keys, so with it tree_solvegame, keyed by valuation / price ratios, is an AVLTree.
+        InstrumentedAVLTree counts the lookups, inserts and deletes done in self.tree, see self.tree.statistics(). Vendor selection
+        goes through the stock flags and does not touch self.tree, so it adds nothing to those counters.
 
         Time complexity: O(1) as it only calls the function RandomGen and initialises the values to the variable.
         """
         self.rand = RandomGen(seed=seed)
+        self.tree_class = tree_class
+        self.solve_tree_class = AVLTree if issubclass(tree_class, IntegerKeyIndex) else tree_class # ratios are not bounded
+        self.catalog = None
         self.hashtable = None
         self.tree = None 
         self.length_potion_with_quantity = 0
         self.tree_solvegame = None
+        self.price_order = None # ids of the whole catalog sorted by (buy price, id), built when vendors are first chosen
+        self.price_position = None # position of every id in price_order
+        self.stock_flags = None # FenwickTree over price_order, 1 for every potion in self.tree
+        self.budget_index = None # BudgetIndex of the last build_budget_index, kept up to date with the quantities
       
     
 
     def set_total_potion_data(self, potion_data: list) -> None:
 
         """
-        A method to set total potion data in the hash table, it will call the insert function and insert the data into the hash table.
+        A method to set total potion data. Every potion is appended to the catalog, and its position in the catalog is its id.
+        The hash table maps the potion name to the id, so names are only hashed when they come in through the methods of Game,
+        everything after that works on the id.
         
         Time complexity: O(2n + n) where n is the size of potion_data, 
                          O(2n) when calling the LinearProbePotionTable class, it will initialise
-                         an array with size of len(potion_data)*2. O(n) is the for loop that loops n times. 
-                         create_empty method creates a Potion object with quantity 0 and this is O(1),
+                         an array with size of len(potion_data)*2. O(n) is adding every potion to the catalog and the hash table,
+                         appending to the catalog is O(1) amortised,
                          inserting an item into a hash table is also O(1).
         """
-        self.hashtable = LinearProbePotionTable(len(potion_data), True, len(potion_data)*2)
-        for i in range (len(potion_data)):
-            p = Potion.create_empty(potion_data[i][0],potion_data[i][1],potion_data[i][2])
-            self.hashtable.insert(potion_data[i][1],p)
-          
+        self.create_catalog(len(potion_data))
+        self.add_catalog_rows(potion_data)
+
+
+
+    def load_catalog(self, path: str, chunk_size: int = 4096) -> tuple:
+
+        """
+        A method to set total potion data from a CSV or JSON lines file (see potion_io.py).
+        The rows are streamed from the file in chunks of chunk_size, so the whole catalog is never held as a list.
+        The file is read twice, once to count the lines to size the hash table and once to load the rows.
+        Returns a tuple of the number of potions loaded and the number of rows loaded per second.
+
+        Time complexity: O(n) where n is the number of rows in the file, the same as set_total_potion_data
+        """
+        start = time.perf_counter()
+        self.create_catalog(count_rows(path))
+        count = 0
+        for chunk in chunked(catalog_rows(path), chunk_size):
+            self.add_catalog_rows(chunk)
+            count += len(chunk)
+        return count, self.rows_per_second(count, start)
+
+
+
+    def save_catalog(self, path: str) -> None:
+
+        """
+        A method to write the catalog and its hash table into a binary catalog file (see catalog_file.py)
+
+        Time complexity: O(N + T) where N is the number of potions and T is the table size
+        """
+        write_catalog(path, self.catalog, self.hashtable)
+
+
+
+    def open_catalog(self, path: str) -> None:
+
+        """
+        A method to set total potion data from a binary catalog file written by save_catalog.
+        The file is memory mapped, names, types and prices are read from it when they are used and name lookups
+        go through the hash table saved in the file, so nothing is parsed or inserted. Every quantity starts at 0, and the
+        inventory and the solve_game tree are emptied like create_catalog does. The mapped catalog is read only,
+        add_catalog_rows raises TypeError on it.
+
+        Time complexity: O(N) where N is the number of potions, only to allocate the quantities
+        """
+        self.catalog, self.hashtable = open_catalog(path)
+        self.clear_inventory()
+        self.tree_solvegame = None
+        self.price_order = None
+
+
+
+    def create_catalog(self, max_potions: int) -> None:
+
+        """
+        A method to replace the catalog and the hash table with empty ones that can hold max_potions potions.
+        The inventory and the solve_game tree hold ids of the old catalog, so they are emptied as well.
+
+        Time complexity: O(max_potions) to initialise the table of the hash table
+        """
+        self.catalog = PotionCatalog()
+        self.hashtable = LinearProbePotionTable(max_potions, True, max_potions*2)
+        self.clear_inventory()
+        self.tree_solvegame = None
+        self.price_order = None
+
+
+
+    def add_catalog_rows(self, rows: list) -> None:
+
+        """
+        A method to add a chunk of (potion_type, name, buy_price) rows to the catalog in one go, then map each name to its id.
+        rows can be a generator, it is only read once by the catalog.
+
+        Time complexity: O(R) where R is the number of rows, inserting an item into a hash table is O(1)
+        """
+        first = self.catalog.extend(rows)
+        names = self.catalog.names
+        for potion_id in range(first, len(self.catalog)):
+            self.hashtable.insert(names[potion_id], potion_id)
+        self.price_order = None # the new ids are not in the order yet
+        self.stock_flags = None
+
+
+
+    def rows_per_second(self, count: int, start: float) -> float:
+
+        """
+        A method to return how many rows per second were loaded if count rows were loaded since start
+
+        Time complexity: O(1)
+        """
+        elapsed = time.perf_counter() - start
+        return count / elapsed if elapsed > 0 else float('inf')
+
+
+
+    def get_potion(self, potion_name: str) -> PotionView:
+
+        """
+        A method to get a view of the potion with the given name
+        :raises KeyError: when the potion is not in the catalog
+
+        Time complexity: O(1), one lookup in the hash table
+        """
+        return self.catalog[self.hashtable[potion_name]]
 
 
 
@@ -55,29 +191,129 @@ class Game:
     def add_potions_to_inventory(self, potion_name_amount_pairs: list[tuple[str, float]]) -> None:
 
         """
-        I updated the quantity of potions in the hashtable for the potion_name that are in the list potion_name_amount_pairs.
+        I updated the quantity of potions in the catalog for the potion_name that are in the list potion_name_amount_pairs.
         Next, I created an avl tree to store the potions that are only in potion_name_amount_pairs list because the vendors can only
-        sell potions with positive quantity. This avl tree will use the buy price of the potion as the key and the Potion objecy as the data.
+        sell potions with positive quantity. This avl tree will use (buy price, potion id) as the key and the potion id as the data,
+        the id breaks ties so potions with the same buy price can be in the tree together.
 
 
-        Time complexity: O(C * log N)
-                        where C is the length of potion_name_amount_pairs, N is the number of potions provided in set_total_potion_data.
-                        The for loop will run C times and the log N comes from inserting items into the avl tree. It is log N instead of log C
-                        because only potions from the set_total_potion_data method can be added into the avl tree and the worst case is when all
-                        potion in potion_data has positive quantity.
+        The tree is bulk loaded with from_items of tree_class instead of inserting the potions one by one, so no rotation is done.
+
+        Time complexity: O(C * log C)
+                        where C is the length of potion_name_amount_pairs.
+                        The for loop will run C times, then sorting the C (buy price, id) pairs is C log C and building the tree from
+                        the sorted pairs is linear. The sort is on plain (float, int) pairs, which is much cheaper than C insertions.
 
         """
-        self.length_potion_with_quantity = len(potion_name_amount_pairs)
-        self.tree = AVLTree()
+        pairs = self.set_inventory_quantities(potion_name_amount_pairs)
+        self.clear_inventory()
+        self.tree = self.tree_class.from_items(pairs) # potions with stock in an avl tree
+        self.length_potion_with_quantity = len(pairs)
+
 
-        for i in range(len(potion_name_amount_pairs)):
-            self.hashtable[potion_name_amount_pairs[i][0]].quantity = potion_name_amount_pairs[i][1] #Update quantity of potions in inventory
-        
-            self.tree[self.hashtable[potion_name_amount_pairs[i][0]].buy_price] = self.hashtable[potion_name_amount_pairs[i][0]]# insert potions with stock into an avl tree
-            
-       
-        
- 
+
+    def set_inventory_quantities(self, rows: list) -> list:
+
+        """
+        A method to set the quantity of each (name, quantity) row in the catalog and return the ((buy price, id), id) pairs
+        of the inventory tree for them
+
+        Time complexity: O(R) where R is the number of rows, looking a name up in the hash table is O(1)
+        """
+        prices = self.catalog.prices
+        quantities = self.catalog.quantities
+        pairs = []
+        for i in range(len(rows)):
+            potion_id = self.hashtable[rows[i][0]]
+            quantities[potion_id] = rows[i][1] #Update quantity of potions in inventory
+            pairs.append(((prices[potion_id], potion_id), potion_id))
+        return pairs
+
+
+
+    def load_inventory(self, path: str, chunk_size: int = 4096) -> tuple:
+
+        """
+        A method to replace the inventory with the (name, quantity) rows of a CSV or JSON lines file (see potion_io.py),
+        the same as add_potions_to_inventory. The rows are streamed in chunks of chunk_size and only their ((buy price, id), id)
+        pairs are kept. Those pairs are the one list this needs: the file is not in key order, and a balanced tree can only be
+        bulk loaded from all of its keys in order, so they are sorted in place once the file is read and the tree is built from
+        them with from_sorted, without another copy. Every tree_class holds those pairs anyway once it is built.
+        Returns a tuple of the number of rows loaded and the number of rows loaded per second.
+
+        Time complexity: O(C * log C) where C is the number of rows in the file, same as add_potions_to_inventory
+        """
+        start = time.perf_counter()
+        pairs = []
+        for chunk in chunked(inventory_rows(path), chunk_size):
+            pairs.extend(self.set_inventory_quantities(chunk))
+        pairs.sort() # the keys are unique, so the items are never compared
+        self.clear_inventory()
+        self.tree = self.tree_class.from_sorted(pairs)
+        self.length_potion_with_quantity = len(pairs)
+        return len(pairs), self.rows_per_second(len(pairs), start)
+
+
+
+    def clear_inventory(self) -> None:
+
+        """
+        A method to start a new empty inventory tree. The vendor stock flags and the budget index were built from the old
+        inventory, so they are dropped, the flags are built again when vendors are chosen and build_budget_index makes a new index.
+
+        Time complexity: O(1)
+        """
+        self.length_potion_with_quantity = 0
+        self.tree = self.tree_class()
+        self.stock_flags = None
+        self.budget_index = None
+
+
+
+    def apply_inventory_delta(self, potion_name_change_pairs: list[tuple[str, float]]) -> None:
+
+        """
+        A method to change the quantity of some potions in place by the amounts in (name, change) pairs, instead of building the
+        inventory again. A potion that comes into stock is inserted into self.tree, one that drops to 0 is deleted from it, and
+        the stock flags of choose_potions_for_vendors, the budget index and length_potion_with_quantity follow. A name may appear more than once.
+        Changes may be fractions, and a quantity within QUANTITY_EPSILON of 0 is set to exactly 0 so that the potion leaves the stock.
+        Every row is checked before anything is changed.
+        :raises KeyError: when a name is not in the catalog
+        :raises ValueError: when a quantity would become negative by more than QUANTITY_EPSILON
+
+        Time complexity: O(K * log(N)) where K is the length of potion_name_change_pairs and N is the number of potions in the tree,
+                         one lookup in the hash table, one search of the tree and at most one insert or delete per row.
+        """
+        quantities = self.catalog.quantities
+        new_quantities = {}
+        for name, change in potion_name_change_pairs:
+            potion_id = self.hashtable[name]
+            quantity = new_quantities.get(potion_id, quantities[potion_id]) + change
+            if abs(quantity) <= self.QUANTITY_EPSILON:
+                quantity = 0
+            elif quantity < 0:
+                raise ValueError("quantity of {0} would be negative".format(name))
+            new_quantities[potion_id] = quantity
+
+        if self.tree is None: # nothing was added to the inventory yet
+            self.clear_inventory()
+        prices = self.catalog.prices
+        for potion_id, quantity in new_quantities.items():
+            quantities[potion_id] = quantity
+            if self.budget_index is not None and potion_id in self.budget_index:
+                self.budget_index.set_quantity(potion_id, quantity)
+            key = (prices[potion_id], potion_id)
+            stocked = key in self.tree
+            if quantity > 0 and not stocked:
+                self.tree[key] = potion_id
+                self.length_potion_with_quantity += 1
+                if self.stock_flags is not None:
+                    self.stock_flags.add(self.price_position[potion_id], 1)
+            elif quantity <= 0 and stocked:
+                del self.tree[key]
+                self.length_potion_with_quantity -= 1
+                if self.stock_flags is not None:
+                    self.stock_flags.add(self.price_position[potion_id], -1)
 
 
 
@@ -85,70 +321,294 @@ class Game:
 
         """
         This method lets the vendor selects the pth expensive potion in the inventory where p is a random number between 1 and total number
-        of potions in stock. Then the name and quantity of the potion chosen will be added to lst. The potion is then deleted from the avl tree
-        so that the other vendors cannot select it. After the whole process, the potions are added back using temp. 
+        of potions in stock. The potion is then taken out so that the other vendors cannot select it.
+        The potions in stock are flags in a FenwickTree over the whole catalog sorted by (buy price, id), the same order as the keys
+        of self.tree. The pth most expensive potion left is found by descending the Fenwick tree, and its flag is cleared. When every
+        vendor has chosen, the cleared flags are set again. self.tree is never changed, so there are no deletes and no rebalancing,
+        and the picks are the same as taking the kth largest node of the tree for the same random numbers.
 
         Time complexity: O(C * log(N)) Where C is equal to num_vendors, and N is the number of potions provided in set_total_potion_data. 
-                         The first for loop will run C times and the log N comes from calling the kth largest method and 
-                         getting the pth_expensive node from the tree. So it is 2log(N) but we drop the constant when considering big O.
-                         The second for loop will run C times also but is not considered in Big O because C*log(N) dominates.
+                         The for loop will run C times and the log N comes from finding the pth potion and clearing its flag.
+                         Setting the flags again is also C * log N.
+                         The flags are built in O(N) (plus O(N log N) to sort the catalog the first time) after the inventory
+                         or the catalog was replaced, see build_stock_index.
     
         """
         if num_vendors > self.length_potion_with_quantity or num_vendors < 1: # Only potions in stock(quantity > 0) is available in inventory
             raise ValueError("num_vendors is invalid")
-            
-        lst = []
-        temp = [] #to hold potions that will be deleted and add them back after the process is finished
+        if self.stock_flags is None:
+            self.build_stock_index()
+
+        flags = self.stock_flags
+        chosen = []
         for i in range (num_vendors):
-            randnum = self.rand.randint(self.length_potion_with_quantity - i) # c-i
-            pth_expensive = self.tree.kth_largest(randnum).key #gets the key of the pth largest node
-            temp += [(pth_expensive,self.tree[pth_expensive])] 
-            lst += [(self.tree[pth_expensive].name, self.tree[pth_expensive].quantity)] #store the name and quantity of selected potions
-            del(self.tree[pth_expensive])
-           
-        for i in range (len(temp)): #add back after delete
-            self.tree[temp[i][0]] = temp[i][1]
-        return lst
+            left = self.length_potion_with_quantity - i # potions not chosen yet
+            randnum = self.rand.randint(left) # c-i
+            position = flags.find(left - randnum + 1) # the pth most expensive is the (left - p + 1)th cheapest
+            flags.add(position, -1)
+            chosen.append(position)
+        for position in chosen: # put the chosen potions back in stock
+            flags.add(position, 1)
+        return [(self.catalog.names[self.price_order[position]], self.catalog.quantities[self.price_order[position]]) for position in chosen]
+
+
+
+    def build_stock_index(self) -> None:
+
+        """
+        A method to build the flags used by choose_potions_for_vendors: every potion of self.tree gets a 1 at its position in
+        price_order. price_order itself is only sorted again when the catalog has changed.
+
+        Time complexity: O(N) where N is the number of potions in the catalog, plus O(N log N) when price_order is sorted
+        """
+        prices = self.catalog.prices
+        if self.price_order is None:
+            self.price_order = sorted(range(len(self.catalog)), key=prices.__getitem__) # the sort is stable, so ids break ties
+            self.price_position = [0] * len(self.price_order)
+            for position in range(len(self.price_order)):
+                self.price_position[self.price_order[position]] = position
+
+        flags = [0] * len(self.price_order)
+        for _, potion_id in self.tree.items():
+            flags[self.price_position[potion_id]] = 1
+        self.stock_flags = FenwickTree(flags)
 
 
 
-    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int]) -> list[float]:
+    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int], shared_stock: bool = False,
+                   vectorized: bool = False) -> list[float]:
 
         """
-        A method to solve the game, more explanation are given below this method
+        A method to solve the game, more explanation are given below this method.
+        The names in potion_valuations are turned into ids once. After the tree is built, the potions are copied in order of times
+        into arrays of buy price, quantity and valuation, so each attempt is a plain loop over those arrays.
+        With shared_stock the attempts are adventurers who buy one after another from the same stock, so each one starts where
+        the one before ran out of money, see solve_shared_stock. The quantities in the catalog are not changed either way.
+        With vectorized all attempts are answered at once from the running totals of cost and revenue, see solve_vectorized.
+        :raises ValueError: when both shared_stock and vectorized are set, adventurers who share the stock depend on each other
 
         Time complexity: O(N * log(N) + M * N) where N is the length of potion_valuations, 
                          and M is the length of starting_money.
+                         O(N * log(N) + M + N) with shared_stock, O(N * log(N) + M * log(N)) with vectorized.
         """
+        if shared_stock and vectorized:
+            raise ValueError("shared_stock attempts cannot be vectorized")
         times = [] # a part of the key for the avl tree
         final_ans = [] # the final output of max money of each attempt
-        self.tree_solvegame = AVLTree()
+        prices = self.catalog.prices
+        quantities = self.catalog.quantities
+        pairs = []
         for i in range (len(potion_valuations)):
-            times += [potion_valuations[i][1] / self.hashtable[potion_valuations[i][0]].buy_price] # how many times more the adventure is willing to pay
+            potion_id = self.hashtable[potion_valuations[i][0]]
+            times += [potion_valuations[i][1] / prices[potion_id]] # how many times more the adventure is willing to pay
             if times[i] > 1: # Greater than 1 so that any potions that do not make profit wont be considered
-                self.tree_solvegame[str(times[i]) + self.hashtable[potion_valuations[i][0]].name] = (self.hashtable[potion_valuations[i][0]], potion_valuations[i][1])
+                pairs.append(((times[i], -potion_id), (potion_id, potion_valuations[i][1])))
                 # for the above line, the key and data is explained below
+        self.tree_solvegame = self.solve_tree_class.from_items(pairs)
+
+        order = [item for _, item in self.tree_solvegame.items_desc()] # most times first
+        order_price = [prices[potion_id] for potion_id, _ in order]
+        order_quantity = [quantities[potion_id] for potion_id, _ in order]
+        order_value = [value for _, value in order]
+        if shared_stock:
+            return self.solve_shared_stock(order_price, order_quantity, order_value, starting_money)
+        if vectorized:
+            return self.solve_vectorized(order_price, order_quantity, order_value, starting_money)
+
         for i in range (len(starting_money)):
+            money = starting_money[i]
             sum = 0 # reset the sum for each attempt
-            for j in range(len(self.tree_solvegame)): # all are explained below
-                buy_potion_litre = min(starting_money[i]/self.tree_solvegame.kth_largest(j+1).item[0].buy_price, self.tree_solvegame.kth_largest(j+1).item[0].quantity)
-                starting_money[i] -= buy_potion_litre * self.tree_solvegame.kth_largest(j+1).item[0].buy_price # due to the above line, starting_money will never go below 0
-                sum += (buy_potion_litre * self.tree_solvegame.kth_largest(j+1).item[1]) # adds the sum of money earned for 1 attempt
+            for j in range(len(order)): # all are explained below
+                buy_potion_litre = min(money/order_price[j], order_quantity[j])
+                money -= buy_potion_litre * order_price[j] # due to the above line, money will never go below 0
+                sum += (buy_potion_litre * order_value[j]) # adds the sum of money earned for 1 attempt
                 
             final_ans.append(sum) # append the sum of money earned for each attempt
         return final_ans
 
 
+
+    def solve_shared_stock(self, order_price: list[float], order_quantity: list[float], order_value: list[float], starting_money: list[int]) -> list[float]:
+
+        """
+        A method to return the money made by every adventurer in starting_money when they buy in turn from one stock, with the
+        potions given in order of times (most times first) as arrays of buy price, quantity and valuation.
+        Every adventurer buys the best potions that are left, so the potions bought out so far are always a prefix of the order:
+        j points at the first potion that is not sold out and left is what remains of it. An adventurer either buys all of
+        potion j and j moves on, or runs out of money there, so j only moves forward over all the adventurers together.
+
+        Time complexity: O(M + N) where M is the length of starting_money and N is the length of the arrays.
+        """
+        final_ans = []
+        j = 0
+        left = order_quantity[0] if order_quantity else 0
+        for money in starting_money:
+            sum = 0
+            while j < len(order_price) and money > 0:
+                buy_potion_litre = min(money/order_price[j], left)
+                money -= buy_potion_litre * order_price[j]
+                sum += buy_potion_litre * order_value[j]
+                left -= buy_potion_litre
+                if left > 0:
+                    break # out of money before potion j is sold out
+                j += 1
+                left = order_quantity[j] if j < len(order_quantity) else 0
+            final_ans.append(sum)
+        return final_ans
+
+
+
+    def solve_vectorized(self, order_price: list[float], order_quantity: list[float], order_value: list[float], starting_money: list[int]) -> list[float]:
+
+        """
+        A method to return the money made by every attempt in starting_money, with the potions given in order of times as arrays
+        of buy price, quantity and valuation, all attempts at once.
+        cost[k] and revenue[k] are the totals of the first k potions bought out. An attempt with money buys out the first k
+        potions where k is the last one with cost[k] <= money, found by binary search, and spends the rest on potion k.
+        The arrays are worked on by numpy when it is installed (searchsorted over the whole starting_money), otherwise with
+        bisect over lists, and the answers are the same as the loop of solve_game up to rounding.
+
+        :raises ValueError: when an amount of starting money is negative
+
+        Time complexity: O(N + M * log(N)) where N is the length of the arrays and M is the length of starting_money.
+        """
+        count = len(order_price)
+        if numpy is not None:
+            price = numpy.asarray(order_price + [1], dtype=float) # the padding is never bought, it keeps potion k in range
+            value = numpy.asarray(order_value + [0], dtype=float)
+            cost = numpy.concatenate(([0.0], numpy.cumsum(price[:count] * numpy.asarray(order_quantity, dtype=float))))
+            revenue = numpy.concatenate(([0.0], numpy.cumsum(value[:count] * numpy.asarray(order_quantity, dtype=float))))
+            money = numpy.asarray(starting_money, dtype=float)
+            if (money < 0).any():
+                raise ValueError("starting money must not be negative")
+            k = numpy.searchsorted(cost, money, side='right') - 1
+            return (revenue[k] + (money - cost[k]) / price[k] * value[k]).tolist()
+
+        cost = [0] + list(accumulate(order_price[j] * order_quantity[j] for j in range(count)))
+        revenue = [0] + list(accumulate(order_value[j] * order_quantity[j] for j in range(count)))
+        final_ans = []
+        for money in starting_money:
+            if money < 0:
+                raise ValueError("starting money must not be negative")
+            k = bisect_right(cost, money) - 1
+            if k == count:
+                final_ans.append(revenue[k])
+            else:
+                final_ans.append(revenue[k] + (money - cost[k]) / order_price[k] * order_value[k])
+        return final_ans
+
+
+
+    def build_budget_index(self, potion_valuations: list[tuple[str, float]]) -> BudgetIndex:
+
+        """
+        A method to build a BudgetIndex of the potions in potion_valuations with their buy prices and current quantities, so the
+        answer of solve_game for one budget is index.max_revenue(budget) in O(log N). The index is kept as self.budget_index,
+        and quantities changed through apply_inventory_delta are passed on to it. Use set_valuation
+        of the index when an adventurer changes their mind about a potion.
+
+        Time complexity: O(N * log(N)) where N is the length of potion_valuations, to sort the potions by ratio.
+        """
+        prices = self.catalog.prices
+        quantities = self.catalog.quantities
+        potions = []
+        for name, valuation in potion_valuations:
+            potion_id = self.hashtable[name]
+            potions.append((potion_id, prices[potion_id], quantities[potion_id], valuation))
+        self.budget_index = BudgetIndex(potions)
+        return self.budget_index
+
+
+
+    def snapshot(self) -> bytes:
+
+        """
+        A method to save the state of the game into a compact binary blob, which can be given to restore to continue the game.
+        The blob holds a fixed header (with the raw position of the random generator), one record for every potion in the catalog
+        in id order (type and name as utf-8 strings, buy price and quantity as float64) and then the id of every potion in the
+        inventory tree.
+
+        Time complexity: O(N) where N is the number of potions in the catalog, every potion is packed in O(1)
+                         (ignoring the length of the strings).
+        """
+        catalog = self.catalog if self.catalog is not None else PotionCatalog()
+        in_stock = []
+        if self.tree is not None:
+            for _, potion_id in self.tree.items():
+                in_stock.append(potion_id)
+
+        seed, record, state = self.rand.getstate()
+        parts = [self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, seed, record, state,
+                                           self.hashtable.max_potions if self.hashtable is not None else 0,
+                                           self.hashtable.tablesize if self.hashtable is not None else 0,
+                                           len(catalog),
+                                           self.hashtable.good_hash if self.hashtable is not None else True,
+                                           len(in_stock))]
+        for potion_id in range(len(catalog)):
+            potion_type = str(catalog.types[potion_id]).encode('utf-8')
+            name = catalog.names[potion_id].encode('utf-8')
+            parts.append(self.SNAPSHOT_POTION.pack(len(potion_type), len(name), catalog.prices[potion_id], catalog.quantities[potion_id]))
+            parts.append(potion_type)
+            parts.append(name)
+        parts.append(struct.pack('<{}I'.format(len(in_stock)), *in_stock))
+        return b''.join(parts)
+
+
+
+    def restore(self, blob: bytes) -> None:
+
+        """
+        A method to load a state saved by snapshot. The catalog, the hash table, the inventory tree and the position of the random
+        generator are rebuilt so the game continues exactly where the snapshot was taken. Potions keep their ids.
+        :raises ValueError: when blob is not a snapshot
+
+        Time complexity: O(T + N) where T is the table size and N is the number of potions.
+                         Creating the table is O(T), inserting every potion into it is O(1) each and the stocked
+                         potions were saved in key order, so the avl tree is bulk loaded in O(C) where C <= N.
+        """
+        view = memoryview(blob)
+        try:
+            magic, seed, record, state, max_potions, tablesize, count, good_hash, stocked = self.SNAPSHOT_HEADER.unpack_from(view, 0)
+        except struct.error:
+            raise ValueError("blob is not a game snapshot")
+        if magic != self.SNAPSHOT_MAGIC:
+            raise ValueError("blob is not a game snapshot")
+
+        offset = self.SNAPSHOT_HEADER.size
+        catalog = PotionCatalog()
+        for _ in range(count):
+            type_length, name_length, buy_price, quantity = self.SNAPSHOT_POTION.unpack_from(view, offset)
+            offset += self.SNAPSHOT_POTION.size
+            potion_type = str(view[offset:offset + type_length], 'utf-8')
+            offset += type_length
+            name = str(view[offset:offset + name_length], 'utf-8')
+            offset += name_length
+            catalog.append(potion_type, name, buy_price, quantity)
+        in_stock = struct.unpack_from('<{}I'.format(stocked), view, offset)
+
+        self.catalog = catalog
+        self.hashtable = LinearProbePotionTable(max_potions, bool(good_hash), tablesize) if tablesize else None
+        for potion_id in range(len(catalog)):
+            self.hashtable.insert(catalog.names[potion_id], potion_id)
+        self.tree = self.tree_class.from_sorted([((catalog.prices[potion_id], potion_id), potion_id) for potion_id in in_stock]) # written in key order
+        self.length_potion_with_quantity = stocked
+        self.tree_solvegame = None
+        self.price_order = None
+        self.stock_flags = None
+        self.budget_index = None
+        self.rand.setstate((seed, record, state))
+
+
 """
 Selection of ADT
 For the methods in Game class, I used 2 ADTs, which is hash table and avl tree.
-For the first method, set_total_potion_data, I used a hash table to store the potion objects. This is because we can use the potion name 
-that is in the list potion_data as the key to store the potion objects. The time complexity of setting and getting an item using hash table
+For the first method, set_total_potion_data, I used a hash table to store the id of every potion, the potion itself is kept in the
+catalog at that id. This is because we can use the potion name that is in the list potion_data as the key to find the id. The time complexity of setting and getting an item using hash table
 is O(1), so storing, searching, getting the potion objects in a hash table is very fast compared to using an array. if we use an array to store the objects, 
 the worst case will be O(n) where n is the length of potion_data.
 
-For the methods add_potions_to_inventory and solve_game, I used 2 seperate avl trees. The choose_potions_for_vendors uses the same avl tree with
-the add_potions_to_inventory method.
+For the methods add_potions_to_inventory and solve_game, I used 2 seperate avl trees. The choose_potions_for_vendors uses a Fenwick tree
+of in stock flags over the potions sorted the same way as the tree of add_potions_to_inventory, so it never changes that tree.
 The first method uses the buy price of potions as the key whereas the second method uses the times as the key. 
 The main reason to use avl trees is because it can sort the items based on the keys and the time complexity of inserting is always log(n)
 where n is the total number of nodes in the tree. Furthermore, the key is flexible, as it can be an integer or string. 
@@ -168,11 +628,14 @@ this means the adventure is willing to pay 3 times more for this potion.
 
 I will create a new AVLTree(), self.tree_solvegame to store the potions according to the key explained above. However, I will not
 consider any potion that does not make any profit, so I will only store potions that has profit > 1 times into this AVL tree.
-Furthermore, I will use the key as a string of "Potion name" + "times", this is to avoid cases where 2 potions have the same times.
-The data in the tree will be a tuple (Potion(), the price adventure willing to pay)
+Furthermore, I will use the key as a tuple (times, -potion id), this is to avoid cases where 2 potions have the same times.
+Tuples compare on times first as numbers, so 10.0 times correctly comes after 9.0 times (a string key would put "10.0" before "9.0"),
+and the id is only compared when the times are equal. The id is negated so that, going from the largest key, potions with the
+same times come in the order they were given to set_total_potion_data.
+The data in the tree will be a tuple (potion id, the price adventure willing to pay)
 
 Next approach is to use the starting money to buy all possible litres of the potion that has most times. Then if there are still money,
-I will buy all possible litres of the potion that has second most times. I will use kth largest() to do this.
+I will buy all possible litres of the potion that has second most times. I will go through the tree from the largest key to do this.
 
 How to decide how many litres to buy
 For this part, I will find the minimum of the 2 condition below,
@@ -188,8 +651,8 @@ So the min(1,2) is 3 litres.
 After buying 3 litres
 starting money = 80 - (5*3) = 65
 The next potion I will buy is “Potion of Health Regeneration” because it is second most times (x1.5),
-althought the “Potion of Extreme Speed” is also (x1.5) but according to my key, kth largest will find the above potion first 
-simply because the length of string is longer.
+althought the “Potion of Extreme Speed” is also (x1.5) but according to my key, going from the largest key will find the above potion first 
+simply because it comes first in the potion data. With the same times the total would be the same either way.
 1. 65 / 20 = 3.25 litres
 2. The vendor has 4 litres
 So the min(1,2) is 3.25 litres
@@ -0,0 +1,272 @@
+""" AVL tree that counts the work its operations do.
+
+    InstrumentedAVLTree is an AVLTree that also counts key comparisons, single and double rotations and the nodes visited by
+    every lookup, insert and delete, and reports them with the height and average depth through statistics(), like the hash table.
+    The counting lives only in this subclass, so a plain AVLTree does not pay for it: the key of an operation is wrapped in
+    a CountingKey that counts the comparisons the real walk of AVLTree makes, so nothing is walked twice. Use it as the tree_class of Game to see
+    how much of a slow day went into the trees.
+"""
+
+from avl import AVLTree
+from typing import TypeVar, Generic
+from node import AVLTreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class TreeStatistics:
+    """ Counters of an instrumented tree, shared by every version (snapshot, split) made from it. """
+
+    __slots__ = ('comparison_count', 'single_rotation_count', 'double_rotation_count', 'operation_count', 'visited_total', 'visited_max')
+
+    def __init__(self) -> None:
+        """
+        A method to set every counter to 0
+
+        Time complexity: O(1)
+        """
+        self.comparison_count = 0
+        self.single_rotation_count = 0
+        self.double_rotation_count = 0
+        self.operation_count = 0
+        self.visited_total = 0
+        self.visited_max = 0
+
+
+
+class CountingKey:
+    """ Key that counts the comparisons made with it, so a walk of the tree is counted while it runs.
+
+        Consecutive comparisons with the same key of the tree are one visit of its node.
+    """
+
+    __slots__ = ('key', 'counters', 'last', 'visited')
+
+    def __init__(self, key: K, counters: TreeStatistics) -> None:
+        """
+        A method to wrap key, counting into counters
+
+        Time complexity: O(1)
+        """
+        self.key = key
+        self.counters = counters
+        self.last = None
+        self.visited = 0
+
+    def count(self, other: K) -> None:
+        """
+        A method to count one comparison with other, and a visit when other is not the key compared with last
+
+        Time complexity: O(1)
+        """
+        self.counters.comparison_count += 1
+        if other is not self.last or self.visited == 0:
+            self.last = other
+            self.visited += 1
+
+    def __eq__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is equal to other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key == other
+
+    def __ne__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is not equal to other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key != other
+
+    def __lt__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is less than other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key < other
+
+    def __le__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is less than or equal to other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key <= other
+
+    def __gt__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is greater than other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key > other
+
+    def __ge__(self, other: K) -> bool:
+        """
+        A method to count the comparison and return whether the key is greater than or equal to other
+
+        Time complexity: O(1) plus the comparison of the keys
+        """
+        self.count(other)
+        return self.key >= other
+
+    def __str__(self) -> str:
+        """
+        A method to return the string of the key, so messages about the key read the same as without the wrapper
+
+        Time complexity: O(1) plus the string of the key
+        """
+        return str(self.key)
+
+    def __format__(self, spec: str) -> str:
+        """
+        A method to format the key, so messages about the key read the same as without the wrapper
+
+        Time complexity: O(1) plus formatting the key
+        """
+        return format(self.key, spec)
+
+
+
+class InstrumentedAVLTree(AVLTree, Generic[K, I]):
+    """ AVLTree with counters for key comparisons, rotations and nodes visited per operation. """
+
+
+    def __init__(self, persistent: bool = False) -> None:
+        """
+        A method to initialise an empty tree with every counter at 0
+
+        Time complexity: O(1)
+        """
+        AVLTree.__init__(self, persistent)
+        self.counters = TreeStatistics()
+
+
+
+    def wrap(self, root: AVLTreeNode) -> 'InstrumentedAVLTree':
+        """
+        A method to make a new tree with root as its root that adds to the same counters as this tree
+
+        Time complexity: O(1)
+        """
+        tree = AVLTree.wrap(self, root)
+        tree.counters = self.counters
+        return tree
+
+
+
+    def statistics(self) -> tuple:
+        """
+        A method to return (comparison_count, single_rotation_count, double_rotation_count, operation_count, visited_total,
+        visited_max, height, average_depth). operation_count is the number of lookups, inserts and deletes, so
+        visited_total / operation_count is the average number of nodes one of them visits. visited_total and visited_max are
+        the total and the most nodes visited by one lookup, insert or delete, counting the nodes the key was compared with
+        (the walk of a delete down to the successor compares no keys). The average depth
+        is that of all nodes, with the root at depth 1.
+
+        Time complexity: O(n) where n is the number of nodes, to add up the depths
+        """
+        counters = self.counters
+        return (counters.comparison_count, counters.single_rotation_count, counters.double_rotation_count,
+                counters.operation_count, counters.visited_total, counters.visited_max, self.get_height(self.root), self.average_depth())
+
+
+
+    def reset_statistics(self) -> None:
+        """
+        A method to set every counter back to 0
+
+        Time complexity: O(1)
+        """
+        self.counters = TreeStatistics()
+
+
+
+    def average_depth(self) -> float:
+        """
+        A method to return the average depth of the nodes, with the root at depth 1, or 0 for an empty tree.
+        Every node of a sub-tree is one deeper than its root, so the total depth is the sum of the sizes of all sub-trees.
+
+        Time complexity: O(n) where n is the number of nodes
+        """
+        if self.root is None:
+            return 0
+        total = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            total += node.size
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        return total / self.root.size
+
+
+
+    def count_operation(self, counted: 'CountingKey') -> None:
+        """
+        A method to add one operation that visited the nodes counted compared itself with
+
+        Time complexity: O(1)
+        """
+        counters = self.counters
+        counters.operation_count += 1
+        counters.visited_total += counted.visited
+        if counted.visited > counters.visited_max:
+            counters.visited_max = counted.visited
+
+
+
+    def get_tree_node_by_key_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
+        """
+        A method to find key like AVLTree, with key wrapped so every comparison of the lookup is counted
+
+        Time complexity: O(log n)
+        """
+        counted = CountingKey(key, self.counters)
+        try:
+            return AVLTree.get_tree_node_by_key_aux(self, current, counted)
+        finally:
+            self.count_operation(counted)
+
+
+
+    def walk_down(self, current: AVLTreeNode, key: K) -> tuple:
+        """
+        A method to walk down to key like AVLTree, the search of every insert and delete, with key wrapped so every
+        comparison of the walk is counted. Only the walk sees the wrapper, the tree keeps the key itself.
+
+        Time complexity: O(log n)
+        """
+        counted = CountingKey(key, self.counters)
+        result = AVLTree.walk_down(self, current, counted)
+        self.count_operation(counted)
+        return result
+
+
+
+    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+        A method to count whether AVLTree.rebalance is about to do a single or a double rotation, then rebalance like AVLTree
+
+        Time complexity: O(1)
+        """
+        balance = self.get_balance(current)
+        if balance >= 2 or balance <= -2:
+            child = current.right if balance >= 2 else current.left
+            inner, outer = (child.left, child.right) if balance >= 2 else (child.right, child.left)
+            if self.get_height(inner) > self.get_height(outer):
+                self.counters.double_rotation_count += 1
+            else:
+                self.counters.single_rotation_count += 1
+        return AVLTree.rebalance(self, current)
@@ -0,0 +1,346 @@
+""" Ordered map for keys with a small non-negative integer part.
+
+    The inventory is keyed by (buy_price, potion_id), and buy prices are small integers in practice. IntegerKeyIndex puts every
+    key in the bucket of its integer part (floor of the price) and keeps each bucket as a short sorted list, with a FenwickTree
+    over the bucket counts as the positional index. Insert and delete are a list insert or delete in one bucket, O(B) for a
+    bucket of B keys, plus O(log U) to update the FenwickTree over U buckets. kth_largest is O(log U). No tree node is made per key.
+    Every bucket up to the largest key is allocated, so the universe is bounded by LIMIT and larger keys are rejected.
+    It has the same map interface as AVLTree, so it can be used as the inventory tree of Game, whose keys are prices. It is not
+    meant for keys like the valuation / price ratios of solve_game, which are not bounded, so Game uses AVLTree for those.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import TypeVar, Generic
+from fenwick import FenwickTree
+from node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class IntegerKeyIndex(Generic[K, I]):
+    """ Ordered map over integer buckets.
+
+        Keys are numbers from 0 up to but not including LIMIT, or tuples that start with one, like (buy_price, potion_id), and
+        the bucket of a key is the floor of that number. Keys in a lower bucket are always smaller, so the buckets in order give
+        the keys in order.
+
+        Attributes:
+            keys: sorted list of keys for every bucket
+            values: the items, in the same buckets and positions as their keys
+            index: FenwickTree of the bucket lengths
+            length: number of keys
+    """
+
+    UNIVERSE = 1024 # buckets to start with, doubled when a larger key comes in
+    LIMIT = 1 << 20 # most buckets, keys from LIMIT on are rejected instead of allocating a bucket for every number below them
+
+
+    def __init__(self, universe: int = UNIVERSE) -> None:
+        """
+        A method to initialise an empty map with buckets 0 to universe - 1
+        :raises ValueError: when universe is more than LIMIT
+
+        Time complexity: O(U) where U is universe
+        """
+        if universe > self.LIMIT:
+            raise ValueError('universe must be at most {0}'.format(self.LIMIT))
+        self.keys = [[] for _ in range(universe)]
+        self.values = [[] for _ in range(universe)]
+        self.index = FenwickTree([0] * universe)
+        self.length = 0
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list) -> 'IntegerKeyIndex':
+        """
+        A method to build the map from (key, item) pairs sorted by key in increasing order, with just enough buckets for the largest key.
+        :raises ValueError: when two keys are equal, the pairs are not sorted or a key is out of range
+
+        Time complexity: O(n + U) where n is the length of pairs and U the number of buckets
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls(max(cls.UNIVERSE, cls.bucket(pairs[-1][0]) + 1) if pairs else cls.UNIVERSE)
+        for key, item in pairs:
+            bucket = cls.bucket(key)
+            tree.keys[bucket].append(key)
+            tree.values[bucket].append(item)
+        tree.index = FenwickTree([len(keys) for keys in tree.keys])
+        tree.length = len(pairs)
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs) -> 'IntegerKeyIndex':
+        """
+        A method to build the map from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal or a key is out of range
+
+        Time complexity: O(n log n) for the sort where n is the number of pairs, then O(n + U)
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]))
+
+
+
+    @classmethod
+    def bucket(cls, key: K, lookup: bool = False) -> int:
+        """
+        A method to return the bucket of key, the floor of the key or of its first element.
+        A lookup of a key from LIMIT on gets LIMIT, past every bucket, as such a key can not be in the map.
+        :raises ValueError: when that number is negative, not a number (nan), or not less than LIMIT outside a lookup
+
+        Time complexity: O(1)
+        """
+        number = key[0] if isinstance(key, tuple) else key
+        if lookup and number >= cls.LIMIT:
+            return cls.LIMIT
+        if not 0 <= number < cls.LIMIT:
+            raise ValueError('keys must be from 0 to {0}: {1}'.format(cls.LIMIT - 1, key))
+        return int(number)
+
+
+
+    def grow(self, bucket: int) -> None:
+        """
+        A method to make room for bucket by at least doubling the number of buckets, but to no more than LIMIT, rebuilding the index
+
+        Time complexity: O(U) where U is the new number of buckets, O(1) amortised over the keys that needed it
+        """
+        universe = min(max(2 * len(self.keys), bucket + 1), self.LIMIT)
+        self.keys.extend([] for _ in range(universe - len(self.keys)))
+        self.values.extend([] for _ in range(universe - len(self.values)))
+        self.index = FenwickTree([len(keys) for keys in self.keys])
+
+
+
+    def __len__(self) -> int:
+        """
+        A method that returns the number of keys
+
+        Time complexity: O(1)
+        """
+        return self.length
+
+
+
+    def is_empty(self) -> bool:
+        """
+        A method to check if the map is empty
+
+        Time complexity: O(1)
+        """
+        return self.length == 0
+
+
+
+    def locate(self, key: K) -> tuple:
+        """
+        A method to return (bucket, position) of key, or None when key is not in the map
+
+        Time complexity: O(log B) where B is the length of the bucket
+        """
+        bucket = self.bucket(key, True)
+        if bucket >= len(self.keys):
+            return None
+        keys = self.keys[bucket]
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            return bucket, position
+        return None
+
+
+
+    def __contains__(self, key: K) -> bool:
+        """
+        A method to check if the key is in the map
+
+        Time complexity: O(log B)
+        """
+        return self.locate(key) is not None
+
+
+
+    def __getitem__(self, key: K) -> I:
+        """
+        A method to return the item of key
+        :raises KeyError: when key is not in the map
+
+        Time complexity: O(log B)
+        """
+        found = self.locate(key)
+        if found is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.values[found[0]][found[1]]
+
+
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+        A method to insert key with item into its bucket
+        :raises ValueError: when key is already in the map or is out of range
+
+        Time complexity: O(B + log U), the list insert into a bucket of B keys and the index update
+        """
+        bucket = self.bucket(key)
+        if bucket >= len(self.keys):
+            self.grow(bucket)
+        keys = self.keys[bucket]
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            raise ValueError('Inserting duplicate item')
+        keys.insert(position, key)
+        self.values[bucket].insert(position, item)
+        self.index.add(bucket, 1)
+        self.length += 1
+
+
+
+    def __delitem__(self, key: K) -> None:
+        """
+        A method to delete key from its bucket
+        :raises ValueError: when key is not in the map or is out of range
+
+        Time complexity: O(B + log U), the list delete from a bucket of B keys and the index update
+        """
+        found = self.locate(key)
+        if found is None:
+            raise ValueError('Deleting non-existent item')
+        bucket, position = found
+        del self.keys[bucket][position]
+        del self.values[bucket][position]
+        self.index.add(bucket, -1)
+        self.length -= 1
+
+
+
+    def node_at(self, position: int) -> TreeNode:
+        """
+        A method to return a TreeNode with the key and item at position (0 is the smallest key)
+
+        Time complexity: O(log U)
+        """
+        bucket = self.index.find(position + 1)
+        offset = position - self.index.prefix_sum(bucket)
+        return TreeNode(self.keys[bucket][offset], self.values[bucket][offset])
+
+
+
+    def kth_largest(self, k: int) -> TreeNode:
+        """
+        A method that returns (a TreeNode copy of) the kth largest entry, k = 1 is the largest.
+        :raises IndexError: when k is not between 1 and the number of keys
+
+        Time complexity: O(log U)
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k is out of range')
+        return self.node_at(self.length - k)
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True)
+
+        Time complexity: O(log U + log B)
+        """
+        bucket = self.bucket(key, True)
+        if bucket >= len(self.keys):
+            return self.length
+        search = bisect_right if inclusive else bisect_left
+        return self.index.prefix_sum(bucket) + search(self.keys[bucket], key)
+
+
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        A method to return the number of keys with lo <= key <= hi
+
+        Time complexity: O(log U + log B)
+        """
+        if hi < lo:
+            return 0
+        return self.count_less(hi, True) - self.count_less(lo, False)
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator of the (key, item) pairs with lo <= key <= hi in increasing order
+
+        Time complexity: O(k + number of buckets from lo to hi) where k is the number of pairs yielded
+        """
+        bucket = self.bucket(lo, True)
+        position = bisect_left(self.keys[bucket], lo) if bucket < len(self.keys) else 0
+        while bucket < len(self.keys):
+            keys = self.keys[bucket]
+            values = self.values[bucket]
+            while position < len(keys):
+                if hi < keys[position]:
+                    return
+                yield keys[position], values[position]
+                position += 1
+            bucket += 1
+            position = 0
+
+
+
+    def items(self):
+        """
+        A generator of the (key, item) pairs in increasing order of key, bucket by bucket
+
+        Time complexity: O(n + U)
+        """
+        for keys, values in zip(self.keys, self.values):
+            yield from zip(keys, values)
+
+
+
+    def items_desc(self):
+        """
+        A generator of the (key, item) pairs in decreasing order of key
+
+        Time complexity: O(n + U)
+        """
+        for bucket in range(len(self.keys) - 1, -1, -1):
+            yield from zip(reversed(self.keys[bucket]), reversed(self.values[bucket]))
+
+
+
+    def __iter__(self):
+        """
+        A generator of the keys in increasing order
+
+        Time complexity: O(n + U)
+        """
+        for keys in self.keys:
+            yield from keys
+
+
+
+    def reversed(self):
+        """
+        A generator of the keys in decreasing order
+
+        Time complexity: O(n + U)
+        """
+        for key, _ in self.items_desc():
+            yield key
+
+
+
+    def __reversed__(self):
+        """
+        A method so that reversed(index) gives the keys in decreasing order
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.reversed()
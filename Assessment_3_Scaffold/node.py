@@ -21,6 +21,8 @@ class ListNode(Generic[T]):
 class TreeNode(Generic[K, I]):
     """ Node class represent BST nodes. """
 
+    __slots__ = ('key', 'item', 'left', 'right', 'size') # no per-node __dict__, trees hold millions of nodes
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -31,6 +33,7 @@ class TreeNode(Generic[K, I]):
         self.item = item
         self.left = None
         self.right = None
+        self.size = 1 # number of nodes in the sub-tree rooted here
 
     def __str__(self):
         """
@@ -46,12 +49,55 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
         Objects of this class have an additional variable - height.
     """
 
+    __slots__ = ('height',)
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
-            and sets the left and right pointers to None
+            and sets the left and right pointers to None.
+            The fields are set here instead of through TreeNode.__init__, which saves a call for every node of a bulk load.
             :complexity: O(1)
         """
 
-        super(AVLTreeNode, self).__init__(key, item)
+        self.key = key
+        self.item = item
+        self.left = None
+        self.right = None
+        self.size = 1
         self.height = 1
+
+class TreapNode(TreeNode, Generic[K, I]):
+    """ Node class for treaps.
+        Objects of this class have an additional variable - priority.
+    """
+
+    __slots__ = ('priority',)
+
+    def __init__(self, key: K, item: I = None, priority: int = 0) -> None:
+        """
+            Initialises the node with a key, optional item and its random priority
+            and sets the left and right pointers to None
+            :complexity: O(1)
+        """
+
+        super(TreapNode, self).__init__(key, item)
+        self.priority = priority
+
+class ScapegoatNode(TreeNode, Generic[K, I]):
+    """ Node class for scapegoat trees.
+        size only counts the nodes in the sub-tree that are not deleted, total counts every node
+        and deleted marks a node that was removed but is still linked in.
+    """
+
+    __slots__ = ('total', 'deleted')
+
+    def __init__(self, key: K, item: I = None) -> None:
+        """
+            Initialises the node with a key and optional item
+            and sets the left and right pointers to None
+            :complexity: O(1)
+        """
+
+        super(ScapegoatNode, self).__init__(key, item)
+        self.total = 1
+        self.deleted = False
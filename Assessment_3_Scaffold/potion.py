@@ -7,9 +7,12 @@ Last modified by: Ally Teh Tze-Rou on 29/05/2022
 """
 
 from primes import largest_prime
+from array import array
 
 class Potion:
 
+    __slots__ = ('potion_type', 'name', 'buy_price', 'quantity') # no per object __dict__, the four properties are stored inline
+
     def __init__(self, potion_type: str, name: str, buy_price: float, quantity: float) -> None:
         
         """
@@ -33,12 +36,7 @@ class Potion:
 
         Time complexity: O(1)
         """
-        #raise NotImplementedError()
-        cls.potion_type = potion_type
-        cls.name = name
-        cls.buy_price = buy_price
-        cls.quantity = 0.0
-        return Potion(cls.potion_type, cls.name, cls.buy_price, cls.quantity)
+        return cls(potion_type, name, buy_price, 0.0)
 
 
 
@@ -103,10 +101,156 @@ class Potion:
         Time complexity: O(k) where k is the string created without formatting
         """
 
-        return str("{}'s potion_type = {}, buy_price = {} and potion_quantity = {}").format(self.name, self.potion_type, self.buy_price, self.quantity) 
+        return str("{}'s potion_type = {}, buy_price = {} and potion_quantity = {}").format(self.name, self.potion_type, self.buy_price, self.quantity)
 
-  
-        
 
-    
-        
+
+class PotionView:
+    """
+    A lightweight view of one potion stored in a PotionCatalog.
+    It has the same properties as Potion but reads and writes them from the columns of the catalog.
+    """
+
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog: 'PotionCatalog', index: int) -> None:
+
+        """
+        A method to initialise the view with the catalog and the position of the potion in it
+
+        Time complexity: O(1)
+        """
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def potion_type(self) -> str:
+        """ The potion_type column of the catalog at this position, O(1) """
+        return self.catalog.types[self.index]
+
+    @property
+    def name(self) -> str:
+        """ The name column of the catalog at this position, O(1) """
+        return self.catalog.names[self.index]
+
+    @property
+    def buy_price(self) -> float:
+        """ The buy_price column of the catalog at this position, O(1) """
+        return self.catalog.prices[self.index]
+
+    @buy_price.setter
+    def buy_price(self, value: float) -> None:
+        self.catalog.prices[self.index] = value
+
+    @property
+    def quantity(self) -> float:
+        """ The quantity column of the catalog at this position, O(1) """
+        return self.catalog.quantities[self.index]
+
+    @quantity.setter
+    def quantity(self, value: float) -> None:
+        self.catalog.quantities[self.index] = value
+
+    def __str__(self):
+
+        """
+        A method to return the same string as Potion.__str__ for the viewed potion
+
+        Time complexity: O(k) where k is the string created without formatting
+        """
+        return str("{}'s potion_type = {}, buy_price = {} and potion_quantity = {}").format(self.name, self.potion_type, self.buy_price, self.quantity)
+
+
+
+class PotionCatalog:
+    """
+    Columnar store of potions. Types and names are kept in lists and buy prices and quantities in array('d'),
+    so a potion costs two references and two float64 values instead of a whole object.
+    A potion is identified by its position in the columns, which never changes once it is added.
+
+    attributes:
+        types: potion types, indexed by position
+        names: potion names, indexed by position
+        prices: buy prices, indexed by position
+        quantities: quantities in litres, indexed by position
+    """
+
+    def __init__(self) -> None:
+
+        """
+        A method to initialise the empty columns
+
+        Time complexity: O(1)
+        """
+        self.types = []
+        self.names = []
+        self.prices = array('d')
+        self.quantities = array('d')
+
+
+
+    def __len__(self) -> int:
+
+        """
+        A method to return the number of potions in the catalog
+
+        Time complexity: O(1)
+        """
+        return len(self.names)
+
+
+
+    def append(self, potion_type: str, name: str, buy_price: float, quantity: float = 0.0) -> int:
+
+        """
+        A method to add a potion to the end of every column and return its position
+
+        Time complexity: O(1) amortised, appending to a list or an array is O(1) amortised
+        """
+        self.types.append(potion_type)
+        self.names.append(name)
+        self.prices.append(buy_price)
+        self.quantities.append(quantity)
+        return len(self.names) - 1
+
+
+
+    def extend(self, rows: list) -> int:
+
+        """
+        A method to add a chunk of (potion_type, name, buy_price) rows to the columns at once and return the position of the first one.
+        Every potion in the chunk gets quantity 0. rows can be any iterable (a generator is read once): every row is split into
+        the chunk's own columns in one pass, and the catalog is only extended when the whole chunk was read, so a bad row
+        leaves the catalog as it was.
+        :raises TypeError: when a buy price is not a number
+
+        Time complexity: O(R) where R is the number of rows
+        """
+        types = []
+        names = []
+        prices = array('d')
+        for row in rows:
+            prices.append(row[2]) # checks the price before anything is added
+            types.append(row[0])
+            names.append(row[1])
+
+        first = len(self.names)
+        self.types.extend(types)
+        self.names.extend(names)
+        self.prices.extend(prices)
+        self.quantities.extend(array('d', bytes(8 * len(prices))))
+        return first
+
+
+
+    def __getitem__(self, index: int) -> PotionView:
+
+        """
+        A method to return a view of the potion at the given position
+        :raises IndexError: when index is not a valid position
+
+        Time complexity: O(1)
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("Potion index out of range")
+        return PotionView(self, index % len(self))
@@ -0,0 +1,131 @@
+"""
+Streaming readers for potion catalog and inventory files.
+
+Rows are read one at a time from CSV or JSON lines files and passed on through generators,
+so a file never has to be held in memory as a list.
+A CSV file has one potion per line, in the same order as the tuples given to Game
+(potion_type, name, buy_price for a catalog and name, quantity for an inventory). A first line that
+is just the field names is skipped.
+A JSON lines file has one JSON array in the same order, or one JSON object keyed by the field names, per line.
+"""
+
+import csv
+import json
+from typing import Iterable, Iterator
+
+CATALOG_FIELDS = ('potion_type', 'name', 'buy_price')
+INVENTORY_FIELDS = ('name', 'quantity')
+
+
+
+def read_rows(path: str, fields: tuple) -> Iterator[tuple]:
+    """
+    A generator that yields every row of the file at path as a tuple ordered like fields.
+    The format is chosen by the extension, .jsonl (or .ndjson) for JSON lines and anything else as CSV.
+    :raises ValueError: when a row does not have a value for every field
+
+    Time complexity: O(1) per row, ignoring the length of the line
+    """
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        rows = _read_jsonl(path, fields)
+    else:
+        rows = _read_csv(path, fields)
+    for row in rows:
+        if len(row) < len(fields):
+            raise ValueError("Row {} does not have the fields {}".format(row, fields))
+        yield row
+
+
+
+def _read_csv(path: str, fields: tuple) -> Iterator[tuple]:
+    """
+    A generator that yields the rows of a CSV file, skipping blank lines and a header of the field names.
+
+    Time complexity: O(1) per row
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        first = True
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if first and tuple(cell.strip() for cell in row[:len(fields)]) == fields:
+                first = False
+                continue
+            first = False
+            yield tuple(row)
+
+
+
+def _read_jsonl(path: str, fields: tuple) -> Iterator[tuple]:
+    """
+    A generator that yields the rows of a JSON lines file, skipping blank lines.
+
+    Time complexity: O(1) per row
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if isinstance(value, dict):
+                yield tuple(value[field] for field in fields if field in value)
+            else:
+                yield tuple(value)
+
+
+
+def catalog_rows(path: str) -> Iterator[tuple]:
+    """
+    A generator that yields (potion_type, name, buy_price) for every potion in a catalog file.
+
+    Time complexity: O(1) per row
+    """
+    for row in read_rows(path, CATALOG_FIELDS):
+        yield str(row[0]), str(row[1]), float(row[2])
+
+
+
+def inventory_rows(path: str) -> Iterator[tuple]:
+    """
+    A generator that yields (name, quantity) for every potion in an inventory file.
+
+    Time complexity: O(1) per row
+    """
+    for row in read_rows(path, INVENTORY_FIELDS):
+        yield str(row[0]), float(row[1])
+
+
+
+def count_rows(path: str) -> int:
+    """
+    A method to count the non blank lines of a file without keeping them, which is an upper bound on the number of rows.
+    It is used to size the hash table before the rows are streamed in.
+
+    Time complexity: O(L) where L is the number of lines
+    """
+    count = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                count += 1
+    return count
+
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    """
+    A generator that groups rows into lists of at most size rows, so they can be inserted in bulk.
+    :raises ValueError: when size is less than 1
+
+    Time complexity: O(size) per chunk
+    """
+    if size < 1:
+        raise ValueError("chunk size must be at least 1")
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
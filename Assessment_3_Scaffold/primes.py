@@ -7,9 +7,11 @@ Last modified by: Tuan Muhammad Zafri on 29/05/2022
 """
 
 from math import isqrt
+from functools import lru_cache
 
 
 
+@lru_cache(maxsize=32) # hash functions ask for the same table size on every call, so the sieve only runs once per size
 def largest_prime(k: int) -> int:
     """
     Returns the largest prime number strictly less than k. 
@@ -26,14 +26,21 @@ class RandomGen:
     """A class for random number generation"""
     # class variable
     record = 0    #record is initialise to 0
+
+    MODULUS = pow(2,32)
+    MULTIPLIER = 134775813
+    INCREMENT = 1
     
     def __init__(self, seed: int=0) -> None:
         """
-        A method is to initialise seed with the value from the parameter
+        A method is to initialise seed with the value from the parameter.
+        state holds the raw lcg value after the last number consumed, so randint can carry on from there
+        instead of replaying every step from the seed.
         
         Time complexity: O(1) because it only initialise seed with the value from the parameter
         """
         self.seed = seed
+        self.state = seed
         
 
 
@@ -45,46 +52,46 @@ class RandomGen:
         which is 16 bits long and has a 1 in each bit if at least 3 of the 5 generated numbers have a 1 in this bit.
         Return the new number, modulo k, plus 1
 
-        Time complexity: O(1) since initialising the variables and looping in the range of a fixed variable are O(1).
-                         The second and third for-loop is also looping in the range of 6 and 16, which is a fixed input.
+        Time complexity: O(1) since the lcg continues from self.state, so only 5 numbers are generated per call.
+                         The loop over the 16 bits is also a fixed input.
                          Therefore the time complexity is O(1) 
         """
-        arr=[]
-        new_num_arr = [0] * 16
-        new_num = '0b'
-        power = pow(2,16) 
-        Random_gen = lcg(pow(2,32), 134775813, 1, self.seed) 
-        for _ in range(self.record): #keep track of next() so it wont restart when randint is called everytime
-            next(Random_gen)
-        for i in range (6):
-            arr += [format(next(Random_gen)//power, "016b")] # remove 16 least significant bits
+        arr = []
+        state = self.state
+        for _ in range(5):
+            state = (self.MULTIPLIER * state + self.INCREMENT) % self.MODULUS
+            arr.append(state >> 16) # remove 16 least significant bits
+        new_num = 0
         for i in range(16):
-            a=arr[0][i]
-            b=arr[1][i]
-            c=arr[2][i]
-            d=arr[3][i]
-            e=arr[4][i]
-            if eval(a + '+' + b + '+' + c + '+' + d + '+' + e) >= 3: # check if there are at least 3 numbers that have 1 bit
-                new_num_arr[i] = 1
-            new_num += str(new_num_arr[i])
+            if sum((num >> i) & 1 for num in arr) >= 3: # check if there are at least 3 numbers that have 1 bit
+                new_num |= 1 << i
+        self.state = state
         self.record += 5
-        return int(eval(new_num)) % k + 1
- 
-           
-        
-       
+        return new_num % k + 1
 
-                
 
 
-       
+    def getstate(self) -> tuple:
+        """
+        A method to return the position of the generator as a tuple (seed, record, state),
+        where state is the raw lcg value. The tuple can be passed to setstate to resume from this point.
 
-       
+        Time complexity: O(1) because it only returns the values of the variables
+        """
+        return self.seed, self.record, self.state
 
 
-     
-        
 
+    def setstate(self, state: tuple) -> None:
+        """
+        A method to restore a position previously returned by getstate, without replaying any steps.
+
+        Time complexity: O(1) because it only initialise the variables from the tuple
+        """
+        self.seed, self.record, self.state = state
+
+
+ 
 if __name__ == "__main__":
     Random_gen = lcg(pow(2,32), 134775813, 1, 0)
 
@@ -0,0 +1,419 @@
+""" Scapegoat tree implemented on top of the standard BST.
+
+    Nodes store no height. An insert that lands deeper than log(total) / log(1 / ALPHA) walks back up to the first ancestor
+    (the scapegoat) with a child holding more than ALPHA of its nodes, and that sub-tree is rebuilt perfectly balanced.
+    A delete only marks its node as deleted, and once more than DEAD_FRACTION of the nodes are deleted the whole tree is rebuilt
+    without them. Every operation is O(log n) amortised, even when the keys come in sorted order.
+"""
+
+from __future__ import annotations
+from bst import BinarySearchTree
+from typing import TypeVar, Generic
+from node import ScapegoatNode
+import math
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class ScapegoatTree(BinarySearchTree, Generic[K, I]):
+    """ Binary search tree that keeps itself balanced by rebuilding sub-trees, with lazy deletion. """
+
+    ALPHA = 0.7 # a child may hold at most this fraction of the nodes of its parent's sub-tree
+    DEAD_FRACTION = 0.5 # the whole tree is rebuilt when more than this fraction of its nodes are deleted
+
+
+    def __init__(self) -> None:
+        """
+        A method to initialise an empty tree
+
+        Time complexity: O(1)
+        """
+        BinarySearchTree.__init__(self)
+        self.rebuild_count = 0
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list) -> 'ScapegoatTree':
+        """
+        A method to build a perfectly balanced tree from a list of (key, item) pairs sorted by key in increasing order.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) where n is the length of pairs
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls()
+        tree.root = tree.link_balanced([ScapegoatNode(key, item) for key, item in pairs])
+        tree.length = len(pairs)
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs) -> 'ScapegoatTree':
+        """
+        A method to build a balanced tree from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort where n is the number of pairs, then O(n) to build the tree
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]))
+
+
+
+    def is_empty(self) -> bool:
+        """
+        A method to check if the tree is empty. The root may be a deleted node, so the number of keys is checked.
+
+        Time complexity: O(1)
+        """
+        return self.length == 0
+
+
+
+    def get_total(self, current: ScapegoatNode) -> int:
+        """
+        A method to return the number of nodes in the sub-tree of current, deleted or not, 0 for an empty sub-tree
+
+        Time complexity: O(1)
+        """
+        if current is not None:
+            return current.total
+        return 0
+
+
+
+    def stack_capacity(self) -> int:
+        """
+        A method to return how many slots the stack of an in-order traversal starts with: the height an insert allows,
+        log(total) / log(1 / ALPHA) plus the root and the new leaf, where total includes the deleted nodes that are still linked in.
+        in_order doubles the stack if a path is ever deeper.
+
+        Time complexity: O(1)
+        """
+        total = self.get_total(self.root)
+        if total == 0:
+            return 0
+        return int(math.log(total) / math.log(1 / self.ALPHA)) + 2
+
+
+
+    def live_nodes(self, current: ScapegoatNode) -> list:
+        """
+        A method to return the nodes of the sub-tree of current that are not deleted, in increasing order of key.
+
+        Time complexity: O(s) where s is the number of nodes in the sub-tree
+        """
+        nodes = []
+        stack = []
+        while True:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            if not stack:
+                return nodes
+            current = stack.pop()
+            if not current.deleted:
+                nodes.append(current)
+            current = current.right
+
+
+
+    def link_balanced(self, nodes: list) -> ScapegoatNode:
+        """
+        A method to link nodes, sorted by key, into a perfectly balanced sub-tree and return its root.
+        The middle node of every range becomes the root of that range; the ranges are kept on a stack instead of recursing.
+        Sizes are set on the way back, once both children are linked.
+
+        Time complexity: O(s) where s is the length of nodes
+        """
+        if not nodes:
+            return None
+        stack = [(0, len(nodes), False)] # (lo, hi, children done) of ranges still to link
+        while stack:
+            lo, hi, done = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            if done:
+                node.size = hi - lo
+                node.total = hi - lo
+                continue
+            node.left = nodes[(lo + mid) // 2] if lo < mid else None
+            node.right = nodes[(mid + 1 + hi) // 2] if mid + 1 < hi else None
+            stack.append((lo, hi, True))
+            if lo < mid:
+                stack.append((lo, mid, False))
+            if mid + 1 < hi:
+                stack.append((mid + 1, hi, False))
+        return nodes[len(nodes) // 2]
+
+
+
+    def rebuild(self, current: ScapegoatNode) -> ScapegoatNode:
+        """
+        A method to rebuild the sub-tree of current perfectly balanced and without its deleted nodes, and return its new root.
+
+        Time complexity: O(s) where s is the number of nodes in the sub-tree
+        """
+        self.rebuild_count += 1
+        return self.link_balanced(self.live_nodes(current))
+
+
+
+    def get_tree_node_by_key_aux(self, current: ScapegoatNode, key: K) -> ScapegoatNode:
+        """
+        A method to get the tree node of key, like BinarySearchTree but a deleted node is not found.
+        :raises KeyError: when key is not in the tree
+
+        Time complexity: O(D) where D is the depth of the tree, O(log n) amortised
+        """
+        node = BinarySearchTree.get_tree_node_by_key_aux(self, current, key)
+        if node.deleted:
+            raise KeyError('Key not found: {0}'.format(key))
+        return node
+
+
+
+    def insert_aux(self, current: ScapegoatNode, key: K, item: I) -> ScapegoatNode:
+        """
+        A method to insert key with item into the sub-tree of current and return its root.
+        A deleted node with the same key is simply brought back. A new leaf that is deeper than log(total) / log(1 / ALPHA) makes
+        the walk go back up to the first ancestor whose child on the path has more than ALPHA of its nodes, and that sub-tree is rebuilt.
+        :raises ValueError: when key is already in the tree
+
+        Time complexity: O(log n) amortised, a rebuild of s nodes is paid for by the inserts that unbalanced the sub-tree
+        """
+        path = []
+        node = current
+        while node is not None:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            elif node.deleted: # bring the deleted node back
+                node.deleted = False
+                node.item = item
+                for ancestor in path:
+                    ancestor.size += 1
+                self.length += 1
+                return current
+            else:
+                raise ValueError('Inserting duplicate item')
+
+        new = ScapegoatNode(key, item)
+        self.length += 1
+        if not path:
+            return new
+        if key < path[-1].key:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+        for ancestor in path:
+            ancestor.size += 1
+            ancestor.total += 1
+
+        if len(path) <= math.log(current.total) / math.log(1 / self.ALPHA):
+            return current
+        child = new
+        for i in range(len(path) - 1, -1, -1): # find the scapegoat
+            if child.total > self.ALPHA * path[i].total:
+                before = path[i].total
+                rebuilt = self.rebuild(path[i])
+                if i == 0:
+                    return rebuilt
+                removed = before - self.get_total(rebuilt) # deleted nodes dropped by the rebuild
+                if path[i - 1].left is path[i]:
+                    path[i - 1].left = rebuilt
+                else:
+                    path[i - 1].right = rebuilt
+                for j in range(i):
+                    path[j].total -= removed
+                return current
+            child = path[i]
+        return current
+
+
+
+    def delete_aux(self, current: ScapegoatNode, key: K) -> ScapegoatNode:
+        """
+        A method to delete key from the sub-tree of current and return its root. The node is only marked as deleted
+        and its item released, and the whole tree is rebuilt when more than DEAD_FRACTION of its nodes are deleted.
+        :raises ValueError: when key is not in the tree
+
+        Time complexity: O(log n) amortised, a rebuild of n nodes only happens after n / 2 deletes
+        """
+        path = []
+        node = current
+        while node is not None:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                break
+        if node is None or node.deleted:
+            raise ValueError('Deleting non-existent item')
+
+        node.deleted = True
+        node.item = None
+        for ancestor in path:
+            ancestor.size -= 1
+        self.length -= 1
+        if self.length < (1 - self.DEAD_FRACTION) * current.total:
+            return self.rebuild(current)
+        return current
+
+
+
+    def __iter__(self):
+        """
+        A method to create an in-order iterator over the keys that are not deleted
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.in_order(True, False)
+
+
+
+    def in_order(self, ascending: bool, with_items: bool):
+        """
+        A generator like BinarySearchTree.in_order that skips the deleted nodes
+
+        Time complexity: O(N) for the whole traversal where N is the number of nodes, deleted or not
+        """
+        stack = [None] * self.stack_capacity()
+        top = 0
+        current = self.root
+        while True:
+            while current is not None:
+                if top == len(stack):
+                    stack.extend([None] * (len(stack) or 1))
+                stack[top] = current
+                top += 1
+                current = current.left if ascending else current.right
+            if top == 0:
+                return
+            top -= 1
+            node = stack[top]
+            if not node.deleted:
+                yield (node.key, node.item) if with_items else node.key
+            current = node.right if ascending else node.left
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator like BinarySearchTree.range that skips the deleted nodes
+
+        Time complexity: O(D + k) where D is the depth of the tree and k is the number of nodes in the range, deleted or not
+        """
+        stack = []
+        current = self.root
+        while current is not None:  # go down to lo, remembering the nodes that are >= lo
+            if current.key < lo:
+                current = current.right
+            else:
+                stack.append(current)
+                current = current.left
+
+        while stack:
+            node = stack.pop()
+            if hi < node.key:
+                return
+            if not node.deleted:
+                yield node.key, node.item
+            current = node.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True),
+        counting a node on the path only if it is not deleted.
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        count = 0
+        current = self.root
+        while current is not None:
+            if current.key < key or (inclusive and current.key == key):
+                count += self.get_size(current.left) + (0 if current.deleted else 1)
+                current = current.right
+            else:
+                current = current.left
+        return count
+
+
+
+    def aux_kthLargest(self, root, k):
+        """
+        A helper method that finds the kth largest node that is not deleted in the sub-tree of root, using the sub-tree sizes,
+        which only count the nodes that are not deleted.
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        while root is not None:
+            larger = self.get_size(root.right)
+            if k <= larger:
+                root = root.right
+            elif k == larger + 1 and not root.deleted:
+                return root
+            else:
+                k -= larger + (0 if root.deleted else 1)
+                root = root.left
+        raise IndexError('k is out of range')
+
+
+
+    def floor(self, key: K) -> ScapegoatNode:
+        """
+        A method to return the node with the largest key <= key that is not deleted, or None, found by its rank
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        rank = self.count_less(key, True)
+        return self.kth_largest(self.length - rank + 1) if rank else None
+
+
+
+    def ceiling(self, key: K) -> ScapegoatNode:
+        """
+        A method to return the node with the smallest key >= key that is not deleted, or None, found by its rank
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        rank = self.count_less(key, False)
+        return self.kth_largest(self.length - rank) if rank < self.length else None
+
+
+
+    def predecessor(self, key: K) -> ScapegoatNode:
+        """
+        A method to return the node with the largest key < key that is not deleted, or None, found by its rank
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        rank = self.count_less(key, False)
+        return self.kth_largest(self.length - rank + 1) if rank else None
+
+
+
+    def successor(self, key: K) -> ScapegoatNode:
+        """
+        A method to return the node with the smallest key > key that is not deleted, or None, found by its rank
+
+        Time complexity: O(D) where D is the depth of the tree
+        """
+        rank = self.count_less(key, True)
+        return self.kth_largest(self.length - rank) if rank < self.length else None
@@ -0,0 +1,378 @@
+""" Indexable skip list.
+
+    The keys are kept in a sorted linked list, and a node also belongs to the higher levels with probability 1/2 for each level,
+    so the higher levels skip over more and more nodes and a search goes down from the top level in O(log n) expected steps.
+    Every link also stores its width, the number of positions it moves forward, which gives the position of a key and the node
+    at a position (kth_largest) in O(log n) as well. The levels are drawn from RandomGen, so the same seed gives the same list.
+"""
+
+from __future__ import annotations
+from typing import TypeVar, Generic
+from random_gen import RandomGen
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class SkipNode(Generic[K, I]):
+    """ Node of a skip list, with a next node and the width of the link to it for each of its levels. """
+
+    __slots__ = ('key', 'item', 'next', 'width')
+
+    def __init__(self, key: K, item: I, levels: int) -> None:
+        """
+        A method to initialise a node that is in the lowest levels levels
+
+        Time complexity: O(levels)
+        """
+        self.key = key
+        self.item = item
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+
+class SkipList(Generic[K, I]):
+    """ Ordered map as an indexable skip list.
+
+        Attributes:
+            head: node before the first key, in every level. A link to None goes past the last key.
+            length: number of keys
+            rand: RandomGen the levels of new nodes are drawn from
+    """
+
+    MAX_LEVEL = 17 # one level for each of the 16 bits of randint, plus the lowest level
+
+
+    def __init__(self, rand: RandomGen = None) -> None:
+        """
+        A method to initialise an empty skip list, drawing the levels from rand (a RandomGen with seed 0 if not given)
+
+        Time complexity: O(MAX_LEVEL)
+        """
+        self.head = SkipNode(None, None, self.MAX_LEVEL)
+        self.length = 0
+        self.rand = rand if rand is not None else RandomGen()
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list, rand: RandomGen = None) -> 'SkipList':
+        """
+        A method to build a skip list from a list of (key, item) pairs sorted by key in increasing order, by linking the nodes
+        to the last node of each of their levels.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) expected where n is the length of pairs, a node has 2 levels on average
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls(rand)
+        last = [tree.head] * cls.MAX_LEVEL # last node of each level so far
+        position = [0] * cls.MAX_LEVEL # and its position, the head is at 0
+        for i in range(len(pairs)):
+            node = SkipNode(pairs[i][0], pairs[i][1], tree.random_levels())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = i + 1 - position[level]
+                last[level] = node
+                position[level] = i + 1
+        for level in range(cls.MAX_LEVEL):
+            last[level].width[level] = len(pairs) + 1 - position[level]
+        tree.length = len(pairs)
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs, rand: RandomGen = None) -> 'SkipList':
+        """
+        A method to build a skip list from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort where n is the number of pairs, then O(n) to build the list
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]), rand)
+
+
+
+    def random_levels(self) -> int:
+        """
+        A method to return the number of levels of a new node: 1 plus the number of trailing 1 bits of a 16 bit random number,
+        so a node is in level i + 1 with probability 1/2 ** i.
+
+        Time complexity: O(1)
+        """
+        bits = self.rand.randint(RandomGen.MODULUS >> 16) - 1
+        levels = 1
+        while bits & 1:
+            levels += 1
+            bits >>= 1
+        return levels
+
+
+
+    def __len__(self) -> int:
+        """
+        A method that returns the number of keys
+
+        Time complexity: O(1)
+        """
+        return self.length
+
+
+
+    def is_empty(self) -> bool:
+        """
+        A method to check if the skip list is empty
+
+        Time complexity: O(1)
+        """
+        return self.length == 0
+
+
+
+    def find_before(self, key: K) -> tuple:
+        """
+        A method to return (chain, ranks): for each level the last node with a key smaller than key, and its position.
+
+        Time complexity: O(log n) expected
+        """
+        chain = [None] * self.MAX_LEVEL
+        ranks = [0] * self.MAX_LEVEL
+        node = self.head
+        rank = 0
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                rank += node.width[level]
+                node = following
+                following = node.next[level]
+            chain[level] = node
+            ranks[level] = rank
+        return chain, ranks
+
+
+
+    def get_node(self, key: K) -> SkipNode:
+        """
+        A method to return the node of key, or None when key is not in the list
+
+        Time complexity: O(log n) expected
+        """
+        node = self.head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                node = following
+                following = node.next[level]
+        node = node.next[0]
+        if node is not None and node.key == key:
+            return node
+        return None
+
+
+
+    def __contains__(self, key: K) -> bool:
+        """
+        A method to check if the key is in the list
+
+        Time complexity: O(log n) expected
+        """
+        return self.get_node(key) is not None
+
+
+
+    def __getitem__(self, key: K) -> I:
+        """
+        A method to return the item of key
+        :raises KeyError: when key is not in the list
+
+        Time complexity: O(log n) expected
+        """
+        node = self.get_node(key)
+        if node is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        return node.item
+
+
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+        A method to insert key with item. The new node is linked after the chain node of each of its levels, splitting the width
+        of that link, and every higher link over it gets one wider.
+        :raises ValueError: when key is already in the list
+
+        Time complexity: O(log n) expected
+        """
+        chain, ranks = self.find_before(key)
+        following = chain[0].next[0]
+        if following is not None and following.key == key:
+            raise ValueError('Inserting duplicate item')
+
+        node = SkipNode(key, item, self.random_levels())
+        rank = ranks[0] + 1 # position of the new node
+        for level in range(len(node.next)):
+            before = chain[level]
+            node.next[level] = before.next[level]
+            node.width[level] = ranks[level] + before.width[level] + 1 - rank
+            before.next[level] = node
+            before.width[level] = rank - ranks[level]
+        for level in range(len(node.next), self.MAX_LEVEL):
+            chain[level].width[level] += 1
+        self.length += 1
+
+
+
+    def __delitem__(self, key: K) -> None:
+        """
+        A method to delete key. Each link into the node is replaced by the link out of it, and every higher link over it gets one narrower.
+        :raises ValueError: when key is not in the list
+
+        Time complexity: O(log n) expected
+        """
+        chain, _ = self.find_before(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise ValueError('Deleting non-existent item')
+
+        for level in range(len(node.next)):
+            before = chain[level]
+            before.width[level] += node.width[level] - 1
+            before.next[level] = node.next[level]
+        for level in range(len(node.next), self.MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self.length -= 1
+
+
+
+    def node_at(self, rank: int) -> SkipNode:
+        """
+        A method to return the node at position rank, where 1 is the smallest key, following the widths down from the top level
+
+        Time complexity: O(log n) expected
+        """
+        node = self.head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= rank:
+                rank -= node.width[level]
+                node = node.next[level]
+        return node
+
+
+
+    def kth_largest(self, k: int) -> SkipNode:
+        """
+        A method that returns the node of the kth largest key, k = 1 is the largest.
+        :raises IndexError: when k is not between 1 and the number of keys
+
+        Time complexity: O(log n) expected
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k is out of range')
+        return self.node_at(self.length - k + 1)
+
+
+
+    def count_less(self, key: K, inclusive: bool) -> int:
+        """
+        A method to return the number of keys less than key (or less than or equal to key when inclusive is True)
+
+        Time complexity: O(log n) expected
+        """
+        chain, ranks = self.find_before(key)
+        following = chain[0].next[0]
+        if inclusive and following is not None and following.key == key:
+            return ranks[0] + 1
+        return ranks[0]
+
+
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        A method to return the number of keys with lo <= key <= hi
+
+        Time complexity: O(log n) expected
+        """
+        if hi < lo:
+            return 0
+        return self.count_less(hi, True) - self.count_less(lo, False)
+
+
+
+    def range(self, lo: K, hi: K):
+        """
+        A generator of the (key, item) pairs with lo <= key <= hi in increasing order
+
+        Time complexity: O(log n + k) expected where k is the number of pairs yielded
+        """
+        chain, _ = self.find_before(lo)
+        node = chain[0].next[0]
+        while node is not None and not hi < node.key:
+            yield node.key, node.item
+            node = node.next[0]
+
+
+
+    def items(self):
+        """
+        A generator of the (key, item) pairs in increasing order of key
+
+        Time complexity: O(n) for the whole traversal
+        """
+        node = self.head.next[0]
+        while node is not None:
+            yield node.key, node.item
+            node = node.next[0]
+
+
+
+    def items_desc(self):
+        """
+        A generator of the (key, item) pairs in decreasing order of key. The links only go forward, so the nodes are collected first.
+
+        Time complexity: O(n) for the whole traversal, with O(n) extra memory
+        """
+        nodes = []
+        node = self.head.next[0]
+        while node is not None:
+            nodes.append(node)
+            node = node.next[0]
+        for i in range(len(nodes) - 1, -1, -1):
+            yield nodes[i].key, nodes[i].item
+
+
+
+    def __iter__(self):
+        """
+        A generator of the keys in increasing order
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for key, _ in self.items():
+            yield key
+
+
+
+    def reversed(self):
+        """
+        A generator of the keys in decreasing order
+
+        Time complexity: O(n) for the whole traversal
+        """
+        for key, _ in self.items_desc():
+            yield key
+
+
+
+    def __reversed__(self):
+        """
+        A method so that reversed(skip_list) gives the keys in decreasing order
+
+        Time complexity: O(1) to create the generator
+        """
+        return self.reversed()
@@ -0,0 +1,58 @@
+import unittest
+
+from array_avl import ArrayAVLTree
+
+class TestArrayAVL(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.b = ArrayAVLTree()
+        self.b[15] = "A"
+        self.b[10] = "B"
+        self.b[20] = "C"
+        self.b[17] = "D"
+        self.b[5] = "E"
+        self.b[3] = "F"
+        self.b[4] = "G"
+        self.b[22] = "H"
+        return super().setUp()
+
+    def test_run_through(self):
+        # same shape as the AVLTree in test_avl
+        self.assertEqual(self.b.values[self.b.root], "A")
+        self.assertEqual(self.b.values[self.b.left[self.b.left[self.b.root]]], "F")
+        del self.b[20]
+        del self.b[17]
+        self.assertEqual(self.b.values[self.b.root], "E")
+        self.assertEqual(len(self.b), 6)
+        self.assertRaises(ValueError, self.b.__delitem__, 17)
+        self.assertRaises(KeyError, self.b.__getitem__, 17)
+        # deleted slots are reused
+        self.b[30] = "I"
+        self.assertEqual(len(self.b.keys), 9)
+        self.assertEqual(self.b[30], "I")
+
+    def test_queries(self):
+        self.assertEqual([self.b.kth_largest(x).key for x in range(1, 9)], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(list(self.b.items())[:3], [(3, "F"), (4, "G"), (5, "E")])
+        self.assertEqual(list(self.b.reversed()), [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(list(self.b.range(10, 17)), [(10, "B"), (15, "A"), (17, "D")])
+        self.assertEqual(self.b.count_range(4, 20), 6)
+        self.assertEqual(self.b.floor(16).key, 15)
+        self.assertEqual(self.b.successor(22), None)
+        self.assertEqual(list(ArrayAVLTree.from_items([(2, "B"), (1, "A")]).items()), [(1, "A"), (2, "B")])
+
+    def test_from_sorted(self):
+        t = ArrayAVLTree.from_sorted([(x, str(x)) for x in range(1000)])
+        self.assertEqual(list(t), list(range(1000)))
+        self.assertEqual(t.heights[t.root], 10)
+        self.assertEqual(t.sizes[t.root], 1000)
+        # kth_largest and floor hand out the same node each time, no node is allocated per call
+        node = t.kth_largest(1)
+        self.assertEqual((node.key, node.item), (999, "999"))
+        self.assertIs(t.floor(500.5), node)
+        self.assertEqual(node.key, 500)
+        self.assertIsNone(ArrayAVLTree.from_sorted([]).floor(3))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestArrayAVL)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,3 +1,5 @@
+import io
+import pickle
 import unittest
 
 from avl import AVLTree
@@ -59,6 +61,79 @@ class TestAVL(unittest.TestCase):
         self.b[4] = "G"
         self.b[22] = "H"
         self.assertEqual([self.b.kth_largest(x).key for x in range(1, 9)], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertRaises(IndexError, self.b.kth_largest, 9)
+        del self.b[20]
+        self.assertEqual(self.b.kth_largest(2).key, 17)
+        self.assertEqual(self.b.count_range(5, 17), 4)
+        self.assertEqual(list(self.b.range(16, 100)), [(17, "D"), (22, "H")])
+        self.assertEqual(list(self.b.items_desc()), [(22, "H"), (17, "D"), (15, "A"), (10, "B"), (5, "E"), (4, "G"), (3, "F")])
+        self.assertEqual(list(self.b.reversed()), [22, 17, 15, 10, 5, 4, 3])
+
+    def test_from_sorted(self):
+        self.b = AVLTree.from_sorted([(x, str(x)) for x in range(1, 101)])
+        self.assertEqual(len(self.b), 100)
+        self.assertEqual(self.b.root.height, 7)
+        self.assertEqual(list(self.b), list(range(1, 101)))
+        self.assertEqual(self.b[42], "42")
+        # still a normal avl tree afterwards
+        self.b[0] = "0"
+        del self.b[50]
+        self.assertEqual(self.b.kth_largest(1).key, 100)
+        self.assertEqual(AVLTree.from_items([(3, "C"), (1, "A"), (2, "B")]).root.item, "B")
+        self.assertEqual(len(AVLTree.from_sorted([])), 0)
+        self.assertRaises(ValueError, AVLTree.from_sorted, [(1, "A"), (1, "B")])
+        self.assertRaises(ValueError, AVLTree.from_sorted, [(2, "A"), (1, "B")])
+
+    def test_split_join(self):
+        self.b = AVLTree()
+        for x in range(1, 51):
+            self.b[x] = str(x)
+        left, right = self.b.split(20)
+        self.assertEqual(len(self.b), 0)
+        self.assertEqual(list(left), list(range(1, 20)))
+        self.assertEqual(list(right), list(range(20, 51)))
+        self.assertEqual(right.kth_largest(31).key, 20)
+        self.assertRaises(ValueError, AVLTree.join, right, left)
+        joined = AVLTree.join(left, right)
+        self.assertEqual(list(joined), list(range(1, 51)))
+        self.assertEqual(joined[20], "20")
+        self.assertEqual(len(left) + len(right), 0)
+        self.assertLessEqual(joined.root.height, 7)
+
+        merged = AVLTree.merge(AVLTree.from_sorted([(1, "A"), (3, "C")]), AVLTree.from_sorted([(2, "B"), (4, "D")]))
+        self.assertEqual(list(merged.items()), [(1, "A"), (2, "B"), (3, "C"), (4, "D")])
+        self.assertRaises(ValueError, AVLTree.merge, merged, AVLTree.from_sorted([(2, "B")]))
+
+    def test_snapshot(self):
+        self.b = AVLTree()
+        for x in range(1, 33):
+            self.b[x] = str(x)
+        version = self.b.snapshot()
+        for x in range(1, 33, 2):
+            del self.b[x]
+        self.b[40] = "40"
+        self.assertEqual(list(version), list(range(1, 33)))
+        self.assertEqual(list(self.b), list(range(2, 33, 2)) + [40])
+        del version[2]
+        self.assertTrue(2 in self.b)
+        self.assertEqual(len(version), 31)
+        self.assertEqual(version.kth_largest(1).key, 32)
+
+    def test_dump_load(self):
+        self.b = AVLTree.from_items([((x % 7, x), str(x)) for x in range(1000)])
+        del self.b[(3, 3)]
+        fp = io.BytesIO()
+        self.b.dump(fp)
+        fp.seek(0)
+        loaded = AVLTree.load(fp)
+        self.assertEqual(list(loaded.items()), list(self.b.items()))
+        self.assertEqual(loaded.root.height, 10)
+        self.assertEqual(loaded.kth_largest(1).key, (6, 993))
+        fp = io.BytesIO()
+        AVLTree().dump(fp)
+        fp.seek(0)
+        self.assertEqual(len(AVLTree.load(fp)), 0)
+        self.assertRaises(ValueError, AVLTree.load, io.BytesIO(pickle.dumps(('nope', 1))))
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestAVL)
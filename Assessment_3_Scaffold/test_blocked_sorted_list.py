@@ -0,0 +1,42 @@
+import unittest
+
+from blocked_sorted_list import BlockedSortedList
+
+class TestBlockedSortedList(unittest.TestCase):
+
+    def test_insert_delete(self):
+        b = BlockedSortedList()
+        keys = [(x * 37) % 1000 for x in range(1000)]
+        for key in keys:
+            b[key] = str(key)
+        self.assertEqual(len(b), 1000)
+        self.assertGreater(len(b.key_blocks), 1)
+        self.assertEqual(list(b), list(range(1000)))
+        self.assertEqual(b[500], "500")
+        self.assertRaises(ValueError, b.__setitem__, 500, "again")
+        for key in range(0, 1000, 2):
+            del b[key]
+        self.assertEqual(list(b), list(range(1, 1000, 2)))
+        self.assertRaises(KeyError, b.__getitem__, 2)
+        self.assertRaises(ValueError, b.__delitem__, 2)
+        self.assertFalse(2 in b)
+        self.assertTrue(3 in b)
+
+    def test_order_queries(self):
+        b = BlockedSortedList.from_items([(x, x * 10) for x in range(0, 2000, 2)])
+        self.assertEqual(b.kth_largest(1).key, 1998)
+        self.assertEqual(b.kth_largest(1000).item, 0)
+        self.assertRaises(IndexError, b.kth_largest, 1001)
+        self.assertEqual(list(b.range(9, 15)), [(10, 100), (12, 120), (14, 140)])
+        self.assertEqual(b.count_range(9, 15), 3)
+        self.assertEqual(b.floor(9).key, 8)
+        self.assertEqual(b.ceiling(9).key, 10)
+        self.assertEqual(b.predecessor(10).key, 8)
+        self.assertEqual(b.successor(10).key, 12)
+        self.assertIsNone(b.successor(1998))
+        self.assertEqual(list(b.items_desc())[:2], [(1998, 19980), (1996, 19960)])
+        self.assertRaises(ValueError, BlockedSortedList.from_sorted, [(1, 'a'), (1, 'b')])
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBlockedSortedList)
+    unittest.TextTestRunner(verbosity=0).run(suite)
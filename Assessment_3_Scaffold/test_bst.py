@@ -1,6 +1,6 @@
 import unittest
 
-from bst import BinarySearchTree
+from bst import BinarySearchTree, BSTInOrderIterator
 
 class TestBST(unittest.TestCase):
     
@@ -39,6 +39,52 @@ class TestBST(unittest.TestCase):
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(15)).item, "D")
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(5)), None)
 
+    def test_range(self):
+        self.assertEqual(list(self.b.range(4, 17)), [(4, "G"), (5, "E"), (10, "B"), (15, "A"), (17, "D")])
+        self.assertEqual(list(self.b.range(18, 19)), [])
+        self.assertEqual(self.b.count_range(4, 17), 5)
+        self.assertEqual(self.b.count_range(0, 100), 8)
+        self.assertEqual(self.b.count_range(17, 4), 0)
+        self.assertEqual(self.b.floor(16).key, 15)
+        self.assertEqual(self.b.ceiling(16).key, 17)
+        self.assertEqual(self.b.predecessor(15).key, 10)
+        self.assertEqual(self.b.successor(15).key, 17)
+        self.assertIsNone(self.b.floor(2))
+        self.assertIsNone(self.b.successor(22))
+        del self.b[15]
+        self.assertEqual(self.b.count_range(4, 17), 4)
+
+    def test_iterators(self):
+        self.assertEqual(list(self.b.items()), [(3, "F"), (4, "G"), (5, "E"), (10, "B"), (15, "A"), (17, "D"), (20, "C"), (22, "H")])
+        self.assertEqual(list(self.b.reversed()), [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(list(reversed(self.b)), [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(list(self.b.items_desc())[:2], [(22, "H"), (20, "C")])
+        self.assertEqual(list(BinarySearchTree().items()), [])
+
+    def test_in_order_iterator(self):
+        self.assertEqual(list(self.b), [3, 4, 5, 10, 15, 17, 20, 22])
+        # the stack grows past a capacity that is too small, and the iterator stays finished
+        it = BSTInOrderIterator(self.b.root, 1)
+        self.assertEqual(list(it), [3, 4, 5, 10, 15, 17, 20, 22])
+        self.assertRaises(StopIteration, next, it)
+        self.assertEqual(list(BinarySearchTree()), [])
+
+    def test_deep_tree(self):
+        # sorted keys build a linked list, deeper than the recursion limit
+        b = BinarySearchTree()
+        for x in range(3000):
+            b[x] = x
+        self.assertEqual(b[2999], 2999)
+        self.assertEqual(b.get_minimal(b.root).key, 0)
+        del b[1500]
+        self.assertFalse(1500 in b)
+        self.assertEqual(len(b), 2999)
+        # the traversal stack starts small and grows down the 2999 deep path
+        self.assertEqual(b.stack_capacity(), BinarySearchTree.STACK_START)
+        self.assertEqual(list(b.items())[-1], (2999, 2999))
+        self.assertEqual(next(b.reversed()), 2999)
+        self.assertEqual(len(list(b.items_desc())), 2999)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestBST)
     unittest.TextTestRunner(verbosity=0).run(suite)
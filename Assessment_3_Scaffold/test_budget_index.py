@@ -0,0 +1,50 @@
+import unittest
+
+from budget_index import BudgetIndex
+
+class TestBudgetIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # (id, buy price, quantity, valuation): ratios 3, 2, 2 and 0.5
+        self.b = BudgetIndex([(0, 10, 2, 20), (1, 5, 4, 15), (2, 2, 3, 4), (3, 4, 5, 2)])
+        return super().setUp()
+
+    def test_max_revenue(self):
+        self.assertEqual(self.b.order(), [1, 0, 2, 3])
+        self.assertEqual(self.b.max_revenue(0), 0)
+        self.assertEqual(self.b.max_revenue(20), 60)
+        self.assertEqual(self.b.max_revenue(30), 80)
+        self.assertEqual(self.b.max_revenue(42), 104) # 40 buys the first two, 2 buys one litre of id 2
+        # the potion that makes no profit is never bought
+        self.assertEqual(self.b.max_revenue(1000), 112)
+        self.assertEqual(self.b.solve([20, 30]), [60, 80])
+
+    def test_updates(self):
+        self.b.set_quantity(1, 0)
+        self.assertEqual(self.b.max_revenue(20), 40)
+        # a valuation that keeps the order, then one that moves the potion to the front
+        self.b.set_valuation(2, 3)
+        self.assertEqual(self.b.order(), [1, 0, 2, 3])
+        self.b.set_valuation(3, 40)
+        self.assertEqual(self.b.order(), [3, 1, 0, 2])
+        self.assertEqual(self.b.max_revenue(20), 200)
+        self.assertRaises(KeyError, self.b.set_quantity, 9, 1)
+        self.assertEqual(BudgetIndex([]).max_revenue(10), 0)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.b.max_revenue, -1)
+        self.assertRaises(ValueError, self.b.solve, [10, -0.5])
+        self.assertRaises(ValueError, BudgetIndex, [(0, 10, 2, 20), (1, 0, 4, 15)])
+        # the 16 bit draws of RandomGen are combined, so a thousand potions get a thousand different priorities
+        index = BudgetIndex([(i, 1 + i % 7, 1, 2 + i % 5) for i in range(1000)])
+        priorities = []
+        stack = [index.tree.root]
+        while stack:
+            node = stack.pop()
+            priorities.append(node.priority)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+        self.assertEqual(len(set(priorities)), 1000)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBudgetIndex)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from game import Game
+
+class TestCatalogFile(unittest.TestCase):
+
+    def test_round_trip(self):
+        g = Game()
+        g.set_total_potion_data([
+            ["Health", "Potion of Health Regeneration", 20],
+            ["Buff", "Potion of Extreme Speed", 10],
+            ["Damage", "Potion of Deadly Poison", 45.5],
+            ["Health", "Potion of Instant Health", 5],
+        ])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "catalog.bin")
+            g.save_catalog(path)
+
+            mapped = Game()
+            mapped.open_catalog(path)
+            self.assertEqual(len(mapped.catalog), 4)
+            for name in ["Potion of Health Regeneration", "Potion of Deadly Poison", "Potion of Instant Health"]:
+                self.assertEqual(mapped.hashtable[name], g.hashtable[name])
+                self.assertEqual(mapped.get_potion(name).buy_price, g.get_potion(name).buy_price)
+            self.assertEqual(mapped.get_potion("Potion of Extreme Speed").potion_type, "Buff")
+            self.assertFalse("Potion of Nothing" in mapped.hashtable)
+            self.assertRaises(TypeError, mapped.hashtable.insert, "Potion of Nothing", 4)
+
+            mapped.add_potions_to_inventory([("Potion of Deadly Poison", 2), ("Potion of Instant Health", 3)])
+            self.assertEqual(mapped.get_potion("Potion of Deadly Poison").quantity, 2)
+            self.assertEqual(sorted(mapped.choose_potions_for_vendors(2)), [("Potion of Deadly Poison", 2), ("Potion of Instant Health", 3)])
+
+            # opening a catalog drops the inventory of the one before, and the mapped catalog can not grow
+            g.add_potions_to_inventory([("Potion of Extreme Speed", 5)])
+            g.open_catalog(path)
+            self.assertEqual(g.length_potion_with_quantity, 0)
+            self.assertRaises(ValueError, g.choose_potions_for_vendors, 1)
+            self.assertRaises(TypeError, g.add_catalog_rows, [["Buff", "Potion of Nothing", 3]])
+            del mapped, g
+
+            with open(path, "wb") as f:
+                f.write(b"not a catalog")
+            self.assertRaises(ValueError, Game().open_catalog, path)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCatalogFile)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,22 @@
+import unittest
+
+from fenwick import FenwickTree
+
+class TestFenwick(unittest.TestCase):
+
+    def test_sums(self):
+        f = FenwickTree([3, 0, 2, 5, 1])
+        self.assertEqual(len(f), 5)
+        self.assertEqual(f.total(), 11)
+        self.assertEqual(f.prefix_sum(3), 5)
+        f.add(1, 4)
+        self.assertEqual(f.prefix_sum(2), 7)
+        # find returns the first index whose running total reaches k
+        self.assertEqual(f.find(1), 0)
+        self.assertEqual(f.find(4), 1)
+        self.assertEqual(f.find(8), 2)
+        self.assertEqual(f.find(15), 4)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestFenwick)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,6 +1,74 @@
+import operator
+import os
+import tempfile
 import unittest
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 
+import game
 from game import Game
+from random_gen import RandomGen
+from blocked_sorted_list import BlockedSortedList
+from treap import Treap
+from skip_list import SkipList
+from scapegoat import ScapegoatTree
+from integer_index import IntegerKeyIndex
+from avl import AVLTree
+
+
+class ListArray(list):
+    """ 1-d stand-in for a numpy array: a list with elementwise arithmetic and comparison, and indexing by a list of positions """
+
+    def apply(self, other, function):
+        others = other if isinstance(other, list) else [other] * len(self)
+        return ListArray(function(x, y) for x, y in zip(self, others))
+
+    def __add__(self, other):
+        return self.apply(other, operator.add)
+
+    def __sub__(self, other):
+        return self.apply(other, operator.sub)
+
+    def __mul__(self, other):
+        return self.apply(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self.apply(other, operator.truediv)
+
+    def __lt__(self, other):
+        return self.apply(other, operator.lt)
+
+    def __getitem__(self, index):
+        if isinstance(index, list):
+            return ListArray(list.__getitem__(self, i) for i in index) # negative positions wrap around like in numpy
+        found = list.__getitem__(self, index)
+        return ListArray(found) if isinstance(index, slice) else found
+
+    def any(self):
+        return any(self)
+
+    def tolist(self):
+        return list(self)
+
+class ListNumpy:
+    """ The numpy functions used by Game.solve_vectorized, over ListArray, so its array path runs without numpy """
+
+    @staticmethod
+    def asarray(values, dtype=float):
+        return ListArray(dtype(x) for x in values)
+
+    @staticmethod
+    def concatenate(arrays):
+        return ListArray(x for array in arrays for x in array)
+
+    @staticmethod
+    def cumsum(values):
+        return ListArray(accumulate(values))
+
+    @staticmethod
+    def searchsorted(array, values, side='left'):
+        search = bisect_right if side == 'right' else bisect_left
+        return ListArray(search(array, x) for x in values)
 
 class TestGame(unittest.TestCase):
     
@@ -19,11 +87,24 @@ class TestGame(unittest.TestCase):
         res = g.choose_potions_for_vendors(99)
         self.assertFalse("1" in res)
         # Vendor Selection can be redone - inventory is not changed
+        self.assertEqual([price for price, _ in g.tree], list(range(2, 101)))
         res2 = g.choose_potions_for_vendors(99)
         self.assertTrue(len(res2) == 99)
         # Vendor Selection gives unique results
         self.assertTrue(len(set(res)) == len(set(res2)) == 99)
 
+    def test_reload_catalog(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 101)])
+        g.add_potions_to_inventory([(str(x), x) for x in range(50, 101)])
+        # a new catalog gives new ids, so the old inventory is gone
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 11)])
+        self.assertEqual(g.length_potion_with_quantity, 0)
+        self.assertEqual(list(g.tree), [])
+        self.assertRaises(ValueError, g.choose_potions_for_vendors, 1)
+        g.add_potions_to_inventory([("5", 5), ("6", 6), ("8", 8)])
+        self.assertEqual(sorted(g.choose_potions_for_vendors(3)), [("5", 5), ("6", 6), ("8", 8)])
+
     def test_example(self):
         G = Game()
         # There are these potions, with these stats, available over the course of the game.
@@ -58,6 +139,228 @@ class TestGame(unittest.TestCase):
         results = G.solve_game(full_vendor_info, [12.5, 45, 80])
         self.assertEqual(results, [37.5, 90, 142.5])
 
+        # the budget index gives the same answers and follows changes of stock
+        index = G.build_budget_index(full_vendor_info)
+        self.assertEqual(index.solve([12.5, 45, 80]), results)
+        # all attempts at once, with numpy when it is installed
+        for money, answer in zip([0, 12.5, 45, 80, 1000], G.solve_game(full_vendor_info, [0, 12.5, 45, 80, 1000], vectorized=True)):
+            self.assertAlmostEqual(answer, G.solve_game(full_vendor_info, [money])[0])
+        self.assertRaises(ValueError, G.solve_game, full_vendor_info, [1], True, True)
+
+        # adventurers who buy one after another share the stock, the catalog keeps its quantities
+        self.assertEqual(G.solve_game(full_vendor_info, [12.5, 45, 80], shared_stock=True), [37.5, 71.25, 120.0])
+        self.assertEqual(G.get_potion("Potion of Instant Health").quantity, 3)
+
+        G.apply_inventory_delta([("Potion of Instant Health", -3)])
+        self.assertEqual(index.solve([12.5, 45, 80]), G.solve_game(full_vendor_info, [12.5, 45, 80]))
+
+    def test_vendor_flags(self):
+        g = Game(seed=4)
+        g.set_total_potion_data([
+            (str(x), str(x), x % 7)
+            for x in range(1, 61)
+        ])
+        g.add_potions_to_inventory([
+            (str(x), x)
+            for x in range(10, 50)
+        ])
+        state = g.rand.getstate()
+        res = g.choose_potions_for_vendors(25)
+        # the same picks as taking the pth largest out of the tree
+        rand = RandomGen()
+        rand.setstate(state)
+        version = g.tree.snapshot()
+        expected = []
+        for i in range(25):
+            node = version.kth_largest(rand.randint(40 - i))
+            expected.append((str(node.item + 1), node.item + 1))
+            del version[node.key]
+        self.assertEqual(res, expected)
+        # every flag is set again afterwards
+        self.assertEqual(g.stock_flags.total(), 40)
+        g.apply_inventory_delta([("5", 5)])
+        self.assertEqual(g.stock_flags.total(), 41)
+        self.assertEqual(len(g.choose_potions_for_vendors(41)), 41)
+
+    def test_inventory_delta(self):
+        g = Game()
+        g.set_total_potion_data([
+            (str(x), str(x), x)
+            for x in range(1, 11)
+        ])
+        g.add_potions_to_inventory([("1", 1), ("2", 2), ("3", 3)])
+        g.choose_potions_for_vendors(1)  # builds the stock flags
+        g.apply_inventory_delta([("2", -2), ("3", 4), ("7", 1), ("7", 1)])
+        self.assertEqual(g.length_potion_with_quantity, 3)
+        self.assertEqual([price for price, _ in g.tree], [1, 3, 7])
+        self.assertEqual(g.get_potion("3").quantity, 7)
+        self.assertEqual(g.get_potion("7").quantity, 2)
+        self.assertEqual(sorted(g.choose_potions_for_vendors(3)), [("1", 1), ("3", 7), ("7", 2)])
+        # nothing changes when a row is invalid
+        self.assertRaises(ValueError, g.apply_inventory_delta, [("1", 5), ("2", -1)])
+        self.assertRaises(KeyError, g.apply_inventory_delta, [("nope", 1)])
+        self.assertEqual(g.get_potion("1").quantity, 1)
+        # fractions that add up to 0 leave float residue (2e-16 and -4e-16 here), which still takes the potion out of stock
+        g.apply_inventory_delta([("1", 0.1), ("1", 0.1), ("1", -1.2)])
+        self.assertEqual(g.get_potion("1").quantity, 0)
+        g.apply_inventory_delta([("7", 0.3), ("7", -0.1), ("7", -2.2)])
+        self.assertEqual(g.get_potion("7").quantity, 0)
+        self.assertEqual([price for price, _ in g.tree], [3])
+        self.assertEqual(g.choose_potions_for_vendors(1), [("3", 7)])
+        # a delta can be the first stock of the day
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 11)])
+        g.apply_inventory_delta([("4", 2), ("9", 1)])
+        self.assertEqual(g.length_potion_with_quantity, 2)
+        self.assertEqual(sorted(g.choose_potions_for_vendors(2)), [("4", 2), ("9", 1)])
+
+    def test_vectorized_fallback(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 21)])
+        g.add_potions_to_inventory([(str(x), x % 4) for x in range(1, 21)])
+        valuations = [(str(x), x * (x % 3 + 0.5)) for x in range(1, 21)]
+        budgets = [0, 1, 7.5, 30, 100, 250, 10000]
+        expected = g.solve_game(valuations, budgets)
+        numpy = game.numpy
+        try:
+            game.numpy = None # force the plain list path
+            fallback = g.solve_game(valuations, budgets, vectorized=True)
+            self.assertRaises(ValueError, g.solve_game, valuations, [10, -1], vectorized=True)
+        finally:
+            game.numpy = numpy
+        for answer, scalar in zip(fallback, expected):
+            self.assertAlmostEqual(answer, scalar)
+
+    @unittest.skipIf(game.numpy is None, "numpy is not installed")
+    def test_vectorized_numpy(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 21)])
+        g.add_potions_to_inventory([(str(x), x % 4) for x in range(1, 21)])
+        valuations = [(str(x), x * (x % 3 + 0.5)) for x in range(1, 21)]
+        budgets = [0, 1, 7.5, 30, 100, 250, 10000]
+        vectorized = g.solve_game(valuations, budgets, vectorized=True)
+        numpy = game.numpy
+        try:
+            game.numpy = None
+            fallback = g.solve_game(valuations, budgets, vectorized=True)
+        finally:
+            game.numpy = numpy
+        for answer, other, scalar in zip(vectorized, fallback, g.solve_game(valuations, budgets)):
+            self.assertAlmostEqual(answer, other)
+            self.assertAlmostEqual(answer, scalar)
+        self.assertRaises(ValueError, g.solve_game, valuations, [10, -1], vectorized=True)
+
+    def test_vectorized_array_path(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 21)])
+        g.add_potions_to_inventory([(str(x), x % 4) for x in range(1, 21)])
+        valuations = [(str(x), x * (x % 3 + 0.5)) for x in range(1, 21)]
+        # the total cost of every profitable potion, to buy out exactly and to have money left over
+        total = sum(int(name) * (int(name) % 4) for name, value in valuations if value > int(name))
+        budgets = [0, 1, 7.5, 30, 100, 250, total, total + 1]
+        expected = g.solve_game(valuations, budgets)
+        numpy = game.numpy
+        try:
+            # the numpy path over ListNumpy: the padding keeps potion k in range once every potion is bought out, side='right'
+            # makes a budget of exactly cost[k] buy out potion k, and potions with no stock (same cost twice) are skipped
+            game.numpy = ListNumpy
+            vectorized = g.solve_game(valuations, budgets, vectorized=True)
+            self.assertRaises(ValueError, g.solve_game, valuations, [10, -1], vectorized=True)
+        finally:
+            game.numpy = numpy
+        self.assertEqual(len(vectorized), len(budgets))
+        for answer, scalar in zip(vectorized, expected):
+            self.assertAlmostEqual(answer, scalar)
+
+    def test_equal_keys(self):
+        g = Game()
+        g.set_total_potion_data([
+            ["Health", "A", 10],
+            ["Health", "B", 10],
+            ["Buff", "C", 1],
+            ["Buff", "D", 2],
+        ])
+        # equal buy prices can be in the inventory together
+        g.add_potions_to_inventory([("A", 1), ("B", 2), ("C", 3)])
+        self.assertEqual(sorted(g.choose_potions_for_vendors(3)), [("A", 1), ("B", 2), ("C", 3)])
+        # a valuation of 10 times must be bought before 9 times (string keys put "10.0" before "9.0")
+        g.add_potions_to_inventory([("C", 1), ("D", 1)])
+        self.assertEqual(g.solve_game([("C", 10), ("D", 18)], [1]), [10])
+
+    def test_snapshot(self):
+        g = Game(seed=3)
+        g.set_total_potion_data([
+            (str(x), str(x), x)
+            for x in range(1, 51)
+        ])
+        g.add_potions_to_inventory([
+            (str(x), x)
+            for x in range(10, 41)
+        ])
+        g.choose_potions_for_vendors(5)
+        blob = g.snapshot()
+        expected = g.choose_potions_for_vendors(10)
+
+        restored = Game()
+        restored.restore(blob)
+        self.assertEqual(restored.choose_potions_for_vendors(10), expected)
+        self.assertEqual(restored.get_potion("40").quantity, 40)
+        self.assertEqual(restored.get_potion("5").quantity, 0)
+        self.assertRaises(ValueError, restored.restore, b'nope')
+
+    def test_blocked_engine(self):
+        games = [Game(seed=7), Game(seed=7, tree_class=BlockedSortedList)]
+        for engine in (Treap, SkipList, ScapegoatTree, IntegerKeyIndex):
+            games.append(Game(seed=7, tree_class=engine))
+        for g in games:
+            g.set_total_potion_data([
+                (str(x), str(x), x)
+                for x in range(1, 101)
+            ])
+            g.add_potions_to_inventory([
+                (str(x), x)
+                for x in range(2, 101)
+            ])
+        # every engine picks the same potions and the engines without snapshots get their inventory back
+        expected = games[0].choose_potions_for_vendors(40)
+        valuations = [(str(x), x * 1.5) for x in range(2, 60)]
+        answers = games[0].solve_game(valuations, [10, 500])
+        for g in games[1:]:
+            self.assertEqual(g.choose_potions_for_vendors(40), expected)
+            self.assertEqual([price for price, _ in g.tree], list(range(2, 101)))
+            self.assertEqual(g.solve_game(valuations, [10, 500]), answers)
+        # the ratio keys of solve_game are not bounded, so IntegerKeyIndex only keeps the prices
+        self.assertEqual(games[-1].solve_game([("2", 1e8)], [2]), [1e8])
+        self.assertIs(type(games[-1].tree_solvegame), AVLTree)
+
+    def test_load_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            catalog = os.path.join(d, "catalog.csv")
+            inventory = os.path.join(d, "inventory.jsonl")
+            with open(catalog, "w") as f:
+                f.writelines("Type,{0},{0}\n".format(x) for x in range(1, 101))
+            with open(inventory, "w") as f:
+                f.writelines('["{0}", {0}]\n'.format(x) for x in range(2, 101))
+            g = Game()
+            self.assertEqual(g.load_catalog(catalog, chunk_size=7)[0], 100)
+            self.assertEqual(g.load_inventory(inventory, chunk_size=7)[0], 99)
+        self.assertEqual(g.get_potion("50").quantity, 50)
+        self.assertEqual(len(g.choose_potions_for_vendors(99)), 99)
+        # the file gives the same tree as add_potions_to_inventory, and both start from a cleared inventory
+        g.build_budget_index([("50", 100)])
+        g.clear_inventory()
+        self.assertIsNone(g.budget_index)
+        h = Game()
+        h.set_total_potion_data([("Type", str(x), x) for x in range(1, 101)])
+        h.add_potions_to_inventory([(str(x), x) for x in range(2, 101)])
+        with tempfile.TemporaryDirectory() as d:
+            inventory = os.path.join(d, "inventory.jsonl")
+            with open(inventory, "w") as f:
+                f.writelines('["{0}", {0}]\n'.format(x) for x in range(2, 101))
+            g.load_inventory(inventory, chunk_size=7)
+        self.assertEqual(list(g.tree.items()), list(h.tree.items()))
+        self.assertEqual(g.length_potion_with_quantity, 99)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestGame)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,53 @@
+import unittest
+
+from instrumented_avl import InstrumentedAVLTree
+
+class TestInstrumentedAVL(unittest.TestCase):
+
+    def test_rotations(self):
+        t = InstrumentedAVLTree()
+        for key in [15, 10, 20, 17, 5, 3, 4, 22]:
+            t[key] = str(key)
+        # inserting 3 under 10 -> 5 is the only rotation, a single right rotation at 10
+        self.assertEqual(t.statistics()[1:3], (1, 0))
+        t = InstrumentedAVLTree()
+        for key in [3, 1, 2]:
+            t[key] = str(key)
+        # 2 goes right of 1, which is left of 3, so 3 needs a double rotation
+        self.assertEqual(t.statistics()[1:3], (0, 1))
+        self.assertEqual(t.root.key, 2)
+        t.reset_statistics()
+        self.assertEqual(t.statistics()[:6], (0, 0, 0, 0, 0, 0))
+
+    def test_visits(self):
+        t = InstrumentedAVLTree.from_sorted([(x, x) for x in range(7)])
+        self.assertEqual(t[3], 3)
+        # the root is found with one comparison
+        self.assertEqual(t.statistics(), (1, 0, 0, 1, 1, 1, 3, 17 / 7))
+        self.assertEqual(t[0], 0)
+        comparisons, _, _, operations, visited_total, visited_max, height, _ = t.statistics()
+        self.assertEqual((comparisons, operations, visited_total, visited_max, height), (1 + 5, 2, 1 + 3, 3, 3))
+        # two lookups visiting 1 + 3 nodes, 2 on average
+        self.assertEqual(visited_total / operations, 2)
+        # versions made by snapshot add to the same counters
+        version = t.snapshot()
+        del version[6]
+        self.assertEqual(t.statistics()[3:5], (3, 1 + 3 + 3))
+
+    def test_counted_in_the_walk(self):
+        t = InstrumentedAVLTree()
+        for key in [2, 1, 3]:
+            t[key] = key
+        # the tree keeps the keys themselves, only the walk sees the counting wrapper
+        self.assertTrue(all(type(key) is int for key in t))
+        with self.assertRaises(KeyError) as error:
+            t[4]
+        self.assertEqual(str(error.exception), "'Key not found: 4'")
+        # 0 + 1 + 2 comparisons for the inserts (1 and 3 take one and two), then 2 + 2 for the failed lookup of 4
+        self.assertEqual(t.statistics()[0], 3 + 4)
+        # three inserts and the failed lookup
+        self.assertEqual(t.statistics()[3], 4)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestInstrumentedAVL)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,53 @@
+import unittest
+
+from integer_index import IntegerKeyIndex
+
+class TestIntegerKeyIndex(unittest.TestCase):
+
+    def test_buckets(self):
+        t = IntegerKeyIndex(4)
+        for potion_id in range(30):
+            t[(potion_id % 10, potion_id)] = potion_id
+        # price 9 is past the 4 starting buckets
+        self.assertGreaterEqual(len(t.keys), 10)
+        self.assertEqual(len(t), 30)
+        self.assertEqual(t.kth_largest(1).key, (9, 29))
+        self.assertEqual(t.kth_largest(30).key, (0, 0))
+        self.assertEqual(t[(3, 13)], 13)
+        self.assertRaises(ValueError, t.__setitem__, (3, 13), 13)
+        self.assertRaises(ValueError, t.__setitem__, (-1, 40), 40)
+        del t[(9, 29)]
+        self.assertEqual(t.kth_largest(1).key, (9, 19))
+        self.assertRaises(ValueError, t.__delitem__, (9, 29))
+        self.assertRaises(KeyError, t.__getitem__, (9, 29))
+        self.assertEqual(t.count_range((2, 0), (3, 100)), 6)
+        self.assertEqual(list(t.range((8, 20), (9, 100))), [((8, 28), 28), ((9, 9), 9), ((9, 19), 19)])
+
+    def test_from_sorted(self):
+        t = IntegerKeyIndex.from_items([(2.5, "b"), (0, "a"), (2000, "c")])
+        self.assertEqual(list(t.items()), [(0, "a"), (2.5, "b"), (2000, "c")])
+        self.assertEqual(list(t.reversed()), [2000, 2.5, 0])
+        self.assertRaises(ValueError, IntegerKeyIndex.from_sorted, [(1, "a"), (1, "b")])
+
+    def test_universe_limit(self):
+        class SmallIndex(IntegerKeyIndex):
+            UNIVERSE = 4
+            LIMIT = 64
+        t = SmallIndex.from_sorted([((10, 0), "a")])
+        t[(63.5, 0)] = "b"
+        self.assertEqual(len(t.keys), 64)
+        # keys past the last bucket are rejected instead of growing the universe without bound
+        for price in (64, 5e7, float('inf'), float('nan')):
+            self.assertRaises(ValueError, t.__setitem__, (price, 1), "c")
+        self.assertRaises(ValueError, IntegerKeyIndex.from_items, [((5e7, 0), "a")])
+        self.assertRaises(ValueError, SmallIndex, 65)
+        self.assertEqual((len(t.keys), len(t)), (64, 2))
+        # but looking them up just does not find them
+        self.assertNotIn((5e7, 0), t)
+        self.assertRaises(ValueError, t.__delitem__, (float('inf'), 0))
+        self.assertEqual(t.count_range((0, 0), (5e7, 0)), 2)
+        self.assertEqual(list(t.range((5e7, 0), (6e7, 0))), [])
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestIntegerKeyIndex)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,6 +1,6 @@
 import unittest
 
-from potion import Potion
+from potion import Potion, PotionCatalog
 
 class TestPotion(unittest.TestCase):
     
@@ -15,6 +15,28 @@ class TestPotion(unittest.TestCase):
         self.assertEqual(p2.potion_type, "Health")
         self.assertEqual(p2.buy_price, 20)
         self.assertEqual(p2.quantity, 0)
+        # create_empty must not leak into the class
+        self.assertEqual(p.name, "Potion of Extreme Speed")
+        self.assertFalse(hasattr(p, "__dict__"))
+
+    def test_catalog(self):
+        c = PotionCatalog()
+        self.assertEqual(c.append("Buff", "Potion of Extreme Speed", 10), 0)
+        self.assertEqual(c.append("Health", "Potion of Instant Health", 5, 3), 1)
+        self.assertEqual(len(c), 2)
+        view = c[1]
+        self.assertEqual(view.name, "Potion of Instant Health")
+        self.assertEqual(view.potion_type, "Health")
+        self.assertEqual(view.quantity, 3)
+        view.quantity = 7
+        self.assertEqual(c.quantities[1], 7)
+        self.assertEqual(c[-2].buy_price, 10)
+        self.assertRaises(IndexError, c.__getitem__, 2)
+        # extend reads a generator once, and a bad price leaves every column as it was
+        self.assertEqual(c.extend(("Buff", str(x), x) for x in range(3)), 2)
+        self.assertEqual((c.names[4], c.prices[4], c.quantities[4]), ("2", 2, 0))
+        self.assertRaises(TypeError, c.extend, [("Buff", "A", 1), ("Buff", "B", "free")])
+        self.assertEqual((len(c.types), len(c.names), len(c.prices), len(c.quantities)), (5, 5, 5, 5))
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPotion)
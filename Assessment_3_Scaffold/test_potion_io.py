@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from potion_io import catalog_rows, inventory_rows, count_rows, chunked
+
+class TestPotionIO(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.dir.name, "catalog.csv")
+        with open(self.csv, "w") as f:
+            f.write("potion_type,name,buy_price\nHealth,Potion of Instant Health,5\n\nBuff,\"Potion of Speed, Extreme\",10\n")
+        self.jsonl = os.path.join(self.dir.name, "inventory.jsonl")
+        with open(self.jsonl, "w") as f:
+            f.write('["Potion of Instant Health", 3]\n{"name": "Potion of Speed, Extreme", "quantity": 2.5}\n')
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+        return super().tearDown()
+
+    def test_rows(self):
+        self.assertEqual(list(catalog_rows(self.csv)), [
+            ("Health", "Potion of Instant Health", 5.0),
+            ("Buff", "Potion of Speed, Extreme", 10.0),
+        ])
+        self.assertEqual(list(inventory_rows(self.jsonl)), [
+            ("Potion of Instant Health", 3.0),
+            ("Potion of Speed, Extreme", 2.5),
+        ])
+        self.assertEqual(count_rows(self.csv), 3)
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertRaises(ValueError, lambda: list(chunked([], 0)))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestPotionIO)
+    unittest.TextTestRunner(verbosity=0).run(suite)
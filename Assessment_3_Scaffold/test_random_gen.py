@@ -11,6 +11,15 @@ class TestRandom(unittest.TestCase):
         r = RandomGen(seed=25)
         self.assertEqual(r.randint(100), 69)
 
+    def test_state(self):
+        r = RandomGen(seed=7)
+        r.randint(50)
+        state = r.getstate()
+        expected = [r.randint(100) for _ in range(10)]
+        r2 = RandomGen()
+        r2.setstate(state)
+        self.assertEqual([r2.randint(100) for _ in range(10)], expected)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestRandom)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,50 @@
+import math
+import unittest
+
+from scapegoat import ScapegoatTree
+
+class TestScapegoat(unittest.TestCase):
+
+    def height(self, node):
+        if node is None:
+            return 0
+        return 1 + max(self.height(node.left), self.height(node.right))
+
+    def test_sorted_inserts(self):
+        t = ScapegoatTree()
+        for key in range(2000):
+            t[key] = str(key)
+        # a plain bst would be 2000 deep here
+        self.assertLessEqual(self.height(t.root), math.log(2000) / math.log(1 / ScapegoatTree.ALPHA) + 2)
+        self.assertGreater(t.rebuild_count, 0)
+        self.assertEqual(list(t), list(range(2000)))
+        self.assertEqual(t.kth_largest(1).key, 1999)
+        self.assertRaises(ValueError, t.__setitem__, 5, "again")
+
+    def test_lazy_delete(self):
+        t = ScapegoatTree.from_sorted([(x, str(x)) for x in range(100)])
+        for key in range(0, 40):
+            del t[key]
+        # deleted nodes stay linked in but are not found
+        self.assertEqual(t.root.total, 100)
+        self.assertRaises(KeyError, t.__getitem__, 10)
+        self.assertFalse(10 in t)
+        self.assertRaises(ValueError, t.__delitem__, 10)
+        self.assertEqual(t.count_range(0, 50), 11)
+        self.assertEqual(list(t.range(35, 42)), [(40, "40"), (41, "41"), (42, "42")])
+        self.assertIsNone(t.floor(20))
+        self.assertEqual(t.ceiling(20).key, 40)
+        self.assertEqual(t.kth_largest(60).key, 40)
+        # bringing a deleted key back reuses its node
+        t[10] = "ten"
+        self.assertEqual(t[10], "ten")
+        self.assertEqual(t.root.total, 100)
+        # past half of the nodes deleted the tree is rebuilt without them
+        for key in range(40, 52):
+            del t[key]
+        self.assertEqual(t.root.total, len(t))
+        self.assertEqual(list(t), [10] + list(range(52, 100)))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestScapegoat)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,35 @@
+import unittest
+
+from skip_list import SkipList
+from random_gen import RandomGen
+
+class TestSkipList(unittest.TestCase):
+
+    def test_insert_delete(self):
+        s = SkipList(RandomGen(2))
+        for key in [(x * 37) % 500 for x in range(500)]:
+            s[key] = str(key)
+        self.assertEqual(len(s), 500)
+        self.assertEqual(list(s), list(range(500)))
+        self.assertEqual(s[123], "123")
+        self.assertRaises(ValueError, s.__setitem__, 123, "again")
+        for key in range(0, 500, 2):
+            del s[key]
+        self.assertEqual(list(s), list(range(1, 500, 2)))
+        self.assertRaises(KeyError, s.__getitem__, 2)
+        self.assertRaises(ValueError, s.__delitem__, 2)
+
+    def test_positions(self):
+        s = SkipList.from_sorted([(x, x * 10) for x in range(0, 200, 2)])
+        self.assertEqual([s.kth_largest(k).key for k in (1, 2, 100)], [198, 196, 0])
+        self.assertRaises(IndexError, s.kth_largest, 101)
+        del s[196]
+        s[197] = 1970
+        self.assertEqual(s.kth_largest(2).key, 197)
+        self.assertEqual(s.count_range(10, 20), 6)
+        self.assertEqual(list(s.range(9, 14)), [(10, 100), (12, 120), (14, 140)])
+        self.assertEqual(list(s.reversed())[:3], [198, 197, 194])
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSkipList)
+    unittest.TextTestRunner(verbosity=0).run(suite)
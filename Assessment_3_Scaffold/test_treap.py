@@ -0,0 +1,55 @@
+import unittest
+
+from treap import Treap
+from random_gen import RandomGen
+
+class TestTreap(unittest.TestCase):
+
+    def check_heap(self, node):
+        if node is None:
+            return 0
+        for child in (node.left, node.right):
+            if child is not None:
+                self.assertLessEqual(child.priority, node.priority)
+        size = 1 + self.check_heap(node.left) + self.check_heap(node.right)
+        self.assertEqual(node.size, size)
+        return size
+
+    def test_insert_delete(self):
+        t = Treap(RandomGen(5))
+        for key in range(500):  # sorted keys do not make a treap deep
+            t[key] = str(key)
+        self.assertEqual(self.check_heap(t.root), 500)
+        self.assertEqual(t[250], "250")
+        self.assertRaises(ValueError, t.__setitem__, 250, "again")
+        # a duplicate is caught above the split or inside it, and the treap is left as it was either way
+        for key in range(0, 500, 7):
+            self.assertRaises(ValueError, t.__setitem__, key, "again")
+        self.assertEqual(self.check_heap(t.root), 500)
+        self.assertEqual(list(t), list(range(500)))
+        for key in range(0, 500, 2):
+            del t[key]
+        self.check_heap(t.root)
+        self.assertEqual(list(t), list(range(1, 500, 2)))
+        self.assertEqual(t.kth_largest(1).key, 499)
+        self.assertRaises(ValueError, t.__delitem__, 2)
+
+    def test_reproducible(self):
+        first = Treap.from_items([(x, x) for x in range(100)], RandomGen(1))
+        second = Treap.from_items([(x, x) for x in range(100)], RandomGen(1))
+        self.assertEqual(first.root.key, second.root.key)
+        self.check_heap(first.root)
+
+    def test_split_join(self):
+        t = Treap.from_sorted([(x, x) for x in range(100)])
+        left, right = t.split(40)
+        self.assertEqual(list(left), list(range(40)))
+        self.assertEqual(list(right), list(range(40, 100)))
+        self.assertRaises(ValueError, Treap.join, right, left)
+        joined = Treap.join(left, right)
+        self.assertEqual(list(joined), list(range(100)))
+        self.assertEqual(self.check_heap(joined.root), 100)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTreap)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,291 @@
+""" Treap implemented on top of the standard BST.
+
+    Every node gets a random priority from RandomGen when it is inserted, and the tree is kept a binary search tree by key
+    and a max-heap by priority. The shape is then that of a bst built by inserting the keys in random order, so the
+    expected depth is O(log n) whatever the order of the keys. Insert and delete are done with split and merge.
+"""
+
+from __future__ import annotations
+from bst import BinarySearchTree
+from typing import TypeVar, Generic
+from node import TreapNode
+from random_gen import RandomGen
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class Treap(BinarySearchTree, Generic[K, I]):
+    """ Randomised binary search tree (treap) driven by RandomGen, so the same seed always gives the same tree. """
+
+    DRAW = pow(2, 16) # randint gives 16 bit numbers
+    PRIORITIES = DRAW * DRAW # two draws per priority, see new_priority
+
+
+    def __init__(self, rand: RandomGen = None) -> None:
+        """
+        A method to initialise an empty treap, drawing the priorities from rand (a RandomGen with seed 0 if not given)
+
+        Time complexity: O(1)
+        """
+        BinarySearchTree.__init__(self)
+        self.rand = rand if rand is not None else RandomGen()
+
+
+
+    def new_priority(self) -> int:
+        """
+        A method to draw the priority of a new node, from 1 to PRIORITIES.
+        With one 16 bit draw a few hundred nodes already share priorities, so two draws make one 32 bit priority.
+
+        Time complexity: O(1)
+        """
+        high = self.rand.randint(self.DRAW) - 1
+        return high * self.DRAW + self.rand.randint(self.DRAW)
+
+
+
+    @classmethod
+    def from_sorted(cls, pairs: list, rand: RandomGen = None) -> 'Treap':
+        """
+        A method to build a treap from a list of (key, item) pairs sorted by key in increasing order.
+        Nodes are added left to right on the right spine: nodes of the spine with a lower priority than the new node become its
+        left sub-tree. The sub-tree of a node is a run of consecutive pairs, so its size is known when it leaves the spine.
+        :raises ValueError: when two keys are equal or the pairs are not sorted
+
+        Time complexity: O(n) where n is the length of pairs, every node is pushed on and popped off the spine once
+        """
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('pairs are not sorted by key')
+
+        tree = cls(rand)
+        spine = [] # right spine of the tree built so far
+        first = [] # position of the first pair in the sub-tree of each spine node
+        for i in range(len(pairs)):
+            node = TreapNode(pairs[i][0], pairs[i][1], tree.new_priority())
+            start = i
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+                start = first.pop()
+                last.size = i - start
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+            first.append(start)
+        for j in range(len(spine)):
+            spine[j].size = len(pairs) - first[j]
+        tree.root = spine[0] if spine else None
+        tree.length = len(pairs)
+        return tree
+
+
+
+    @classmethod
+    def from_items(cls, pairs, rand: RandomGen = None) -> 'Treap':
+        """
+        A method to build a treap from (key, item) pairs in any order, by sorting them first and calling from_sorted.
+        :raises ValueError: when two keys are equal
+
+        Time complexity: O(n log n) for the sort where n is the number of pairs, then O(n) to build the tree
+        """
+        return cls.from_sorted(sorted(pairs, key=lambda pair: pair[0]), rand)
+
+
+
+    def split(self, key: K) -> tuple:
+        """
+        A method to split the treap into two treaps, the first with every key < key and the second with every key >= key.
+        The nodes are moved, so this treap is empty afterwards. Both treaps share the random generator of this one.
+
+        Time complexity: O(log n) expected, please refer to split_aux
+        """
+        left, right = self.split_aux(self.root, key)
+        self.root = None
+        self.length = 0
+        return self.wrap(left), self.wrap(right)
+
+
+
+    @classmethod
+    def join(cls, left: 'Treap', right: 'Treap') -> 'Treap':
+        """
+        A method to join two treaps, where every key of left is smaller than every key of right, into one treap.
+        The nodes are moved, so left and right are empty afterwards.
+        :raises ValueError: when a key of left is not smaller than every key of right
+
+        Time complexity: O(log n) expected where n is the number of nodes in both treaps
+        """
+        if left.root is not None and right.root is not None and not left.kth_largest(1).key < right.get_minimal(right.root).key:
+            raise ValueError('Every key of left must be smaller than every key of right')
+
+        tree = left.wrap(left.merge_aux(left.root, right.root))
+        left.root, left.length = None, 0
+        right.root, right.length = None, 0
+        return tree
+
+
+
+    def wrap(self, root: TreapNode) -> 'Treap':
+        """
+        A method to make a new treap with root as its root, using the same random generator
+
+        Time complexity: O(1)
+        """
+        tree = type(self)(self.rand)
+        tree.root = root
+        tree.length = self.get_size(root)
+        return tree
+
+
+
+    def stack_capacity(self) -> int:
+        """
+        A method to return how many slots the stack of an in-order traversal starts with. The expected height of a treap is
+        about 3 log2(n), so that many slots are taken, and in_order doubles the stack on the rare deeper path.
+
+        Time complexity: O(1)
+        """
+        return 3 * self.length.bit_length()
+
+
+
+    def update_node(self, node: TreapNode) -> None:
+        """
+        A method to set the size of node from its children, after they changed.
+        Every change of the shape goes through here, so a subclass that keeps more about each sub-tree overrides it.
+
+        Time complexity: O(1)
+        """
+        node.size = 1 + self.get_size(node.left) + self.get_size(node.right)
+
+
+
+    def split_aux(self, current: TreapNode, key: K, unique: bool = False) -> tuple:
+        """
+        A method to split the sub-tree of current into (sub-tree of keys < key, sub-tree of keys >= key).
+        It walks down to key once. A node with a smaller key keeps its left sub-tree and is hung on the right of the last such node,
+        a node with a larger or equal key keeps its right sub-tree and is hung on the left of the last such node.
+        The sizes are fixed on the way back up.
+        :raises ValueError: when unique is True and key is in the sub-tree, before anything is changed
+
+        Time complexity: O(D) where D is the depth of the sub-tree, O(log n) expected
+        """
+        left_path = []
+        right_path = []
+        while current is not None:
+            if current.key < key:
+                left_path.append(current)
+                current = current.right
+            else:
+                if unique and current.key == key:
+                    raise ValueError('Inserting duplicate item')
+                right_path.append(current)
+                current = current.left
+
+        for i in range(len(left_path)):
+            left_path[i].right = left_path[i + 1] if i + 1 < len(left_path) else None
+        for i in range(len(right_path)):
+            right_path[i].left = right_path[i + 1] if i + 1 < len(right_path) else None
+        for path in (left_path, right_path):
+            for i in range(len(path) - 1, -1, -1):
+                self.update_node(path[i])
+        return (left_path[0] if left_path else None), (right_path[0] if right_path else None)
+
+
+
+    def merge_aux(self, left: TreapNode, right: TreapNode) -> TreapNode:
+        """
+        A method to merge the sub-trees left and right, where every key of left is smaller than every key of right, into one sub-tree.
+        It walks down the right spine of left and the left spine of right together, always taking the node with the higher priority.
+        returns the root of the merged sub-tree.
+
+        Time complexity: O(D) where D is the sum of the depths of the two sub-trees, O(log n) expected
+        """
+        path = [] # nodes taken, in order from the root
+        while left is not None and right is not None:
+            if left.priority > right.priority:
+                path.append(left)
+                left = left.right
+            else:
+                path.append(right)
+                right = right.left
+        rest = left if left is not None else right
+
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            below = path[i + 1] if i + 1 < len(path) else rest
+            if below is not None and below.key < node.key:
+                node.left = below
+            else:
+                node.right = below
+            self.update_node(node)
+        return path[0] if path else rest
+
+
+
+    def insert_aux(self, current: TreapNode, key: K, item: I) -> TreapNode:
+        """
+        A method to insert key with item into the sub-tree of current and return the root of the sub-tree.
+        It walks down while the nodes have a higher priority than the new node, then the sub-tree found there is split around key
+        and becomes the two children of the new node. A duplicate key is found on the way, either above that sub-tree or by the
+        split, which checks before it changes anything, so the whole insert is one walk down.
+        :raises ValueError: when key is already in the tree
+
+        Time complexity: O(log n) expected, one walk down plus a split
+        """
+        new = TreapNode(key, item, self.new_priority())
+        path = []
+        node = current
+        while node is not None and node.priority >= new.priority:
+            if key == node.key:
+                raise ValueError('Inserting duplicate item')
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        new.left, new.right = self.split_aux(node, key, True)
+        self.update_node(new)
+
+        self.length += 1
+        if not path:
+            return new
+        if key < path[-1].key:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+        for i in range(len(path) - 1, -1, -1): # every node above the new node has one more node in its sub-tree
+            self.update_node(path[i])
+        return current
+
+
+
+    def delete_aux(self, current: TreapNode, key: K) -> TreapNode:
+        """
+        A method to delete key from the sub-tree of current and return the root of the sub-tree.
+        The node is replaced by the merge of its two sub-trees.
+        :raises ValueError: when key is not in the tree
+
+        Time complexity: O(log n) expected, one walk down and one merge
+        """
+        path = []
+        node = current
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            raise ValueError('Deleting non-existent item')
+
+        child = self.merge_aux(node.left, node.right)
+        self.length -= 1
+        if not path:
+            return child
+        if path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        for i in range(len(path) - 1, -1, -1):
+            self.update_node(path[i])
+        return current
@@ -0,0 +1,217 @@
+"""
+Throughput benchmarks for the tree ADTs.
+
+Run with the number of keys as the only argument (default 10**6), e.g.
+    python tree_benchmark.py 100000
+Every benchmark prints operations per second.
+"""
+
+import io
+import random
+import sys
+import time
+import tracemalloc
+from avl import AVLTree
+from array_avl import ArrayAVLTree
+from bst import BinarySearchTree
+from blocked_sorted_list import BlockedSortedList
+from treap import Treap
+from skip_list import SkipList
+from scapegoat import ScapegoatTree
+from integer_index import IntegerKeyIndex
+
+
+
+def ops_per_second(count: int, start: float) -> float:
+    """
+    A method to return the number of operations per second if count operations were run since start
+
+    Time complexity: O(1)
+    """
+    elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed > 0 else float('inf')
+
+
+
+def bench_insert_lookup_delete(tree, keys: list) -> tuple:
+    """
+    A method to insert every key into tree, look every key up and then delete every key, in the order of keys.
+    Returns the operations per second of (insert, lookup, delete).
+
+    Time complexity: O(n * cost of one operation) where n is the length of keys
+    """
+    start = time.perf_counter()
+    for key in keys:
+        tree[key] = key
+    insert = ops_per_second(len(keys), start)
+
+    start = time.perf_counter()
+    for key in keys:
+        tree[key]
+    lookup = ops_per_second(len(keys), start)
+
+    start = time.perf_counter()
+    for key in keys:
+        del tree[key]
+    delete = ops_per_second(len(keys), start)
+    return insert, lookup, delete
+
+
+
+def bench_kth_largest(tree, count: int) -> float:
+    """
+    A method to call kth_largest count times with random k on a filled tree and return the operations per second
+
+    Time complexity: O(count * cost of one kth_largest)
+    """
+    rng = random.Random(1)
+    ks = [rng.randint(1, len(tree)) for _ in range(count)]
+    start = time.perf_counter()
+    for k in ks:
+        tree.kth_largest(k)
+    return ops_per_second(count, start)
+
+
+
+def bench_churn(tree, count: int) -> float:
+    """
+    A method to run count rounds of the inventory workload on a filled tree: pick the kth largest node with random k, delete it
+    and insert it back. Returns the rounds per second.
+
+    Time complexity: O(count * (cost of kth_largest + delete + insert))
+    """
+    rng = random.Random(2)
+    ks = [rng.randint(1, len(tree)) for _ in range(count)]
+    start = time.perf_counter()
+    for k in ks:
+        node = tree.kth_largest(k)
+        key, item = node.key, node.item
+        del tree[key]
+        tree[key] = item
+    return ops_per_second(count, start)
+
+
+
+def bench_iteration(tree) -> tuple:
+    """
+    A method to go through tree in-order with its iterator (keys) and with items(). Returns the keys per second of both.
+
+    Time complexity: O(n) where n is the number of nodes
+    """
+    start = time.perf_counter()
+    for _ in tree:
+        pass
+    keys = ops_per_second(len(tree), start)
+    start = time.perf_counter()
+    for _ in tree.items():
+        pass
+    return keys, ops_per_second(len(tree), start)
+
+
+
+def bench_delete_heavy(tree, keys: list) -> float:
+    """
+    A method to insert every key into tree, then delete three quarters of them, each delete followed by a lookup of a key that stays.
+    Returns the operations per second of the delete and lookup phase.
+
+    Time complexity: O(n * cost of one operation) where n is the length of keys
+    """
+    for key in keys:
+        tree[key] = key
+    cut = len(keys) * 3 // 4
+    kept = keys[cut:]
+    start = time.perf_counter()
+    for i in range(cut):
+        del tree[keys[i]]
+        tree[kept[i % len(kept)]]
+    return ops_per_second(2 * cut, start)
+
+
+
+def bench_dump_load(tree) -> tuple:
+    """
+    A method to dump tree to memory and load it back. Returns the seconds taken by (dump, load).
+
+    Time complexity: O(n) where n is the number of nodes
+    """
+    fp = io.BytesIO()
+    start = time.perf_counter()
+    tree.dump(fp)
+    dump = time.perf_counter() - start
+    fp.seek(0)
+    start = time.perf_counter()
+    type(tree).load(fp)
+    return dump, time.perf_counter() - start
+
+
+
+def bytes_per_node(tree, keys: list) -> float:
+    """
+    A method to insert every key of keys into tree (with None as the item) and return the memory allocated per node.
+    The keys already exist before the measurement, so only the memory of the tree itself is counted.
+
+    Time complexity: O(n * cost of one insert) where n is the length of keys
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for key in keys:
+        tree[key] = None
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / max(1, len(keys))
+
+
+
+def report(name: str, results: tuple) -> None:
+    """
+    A method to print one line of (insert, lookup, delete) operations per second
+
+    Time complexity: O(1)
+    """
+    print('{:<28} insert {:>12,.0f}/s   lookup {:>12,.0f}/s   delete {:>12,.0f}/s'.format(name, *results))
+
+
+
+def main(n: int) -> None:
+    """
+    A method to run the benchmarks on n random keys, and on sorted keys where that finishes in reasonable time
+
+    Time complexity: O(n log n) for the random keys, O(m^2) for the sorted keys into the plain bst where m = min(n, 5000)
+    """
+    keys = list(range(n))
+    random.Random(0).shuffle(keys)
+    print('n = {:,}'.format(n))
+    report('AVLTree random', bench_insert_lookup_delete(AVLTree(), keys))
+    report('ArrayAVLTree random', bench_insert_lookup_delete(ArrayAVLTree(), keys))
+    report('BlockedSortedList random', bench_insert_lookup_delete(BlockedSortedList(), keys))
+    report('Treap random', bench_insert_lookup_delete(Treap(), keys))
+    report('SkipList random', bench_insert_lookup_delete(SkipList(), keys))
+    report('ScapegoatTree random', bench_insert_lookup_delete(ScapegoatTree(), keys))
+    report('BinarySearchTree random', bench_insert_lookup_delete(BinarySearchTree(), keys))
+    report('AVLTree sorted', bench_insert_lookup_delete(AVLTree(), sorted(keys)))
+    report('BlockedSortedList sorted', bench_insert_lookup_delete(BlockedSortedList(), sorted(keys)))
+    report('Treap sorted', bench_insert_lookup_delete(Treap(), sorted(keys)))
+    report('SkipList sorted', bench_insert_lookup_delete(SkipList(), sorted(keys)))
+    report('ScapegoatTree sorted', bench_insert_lookup_delete(ScapegoatTree(), sorted(keys)))
+    m = min(n, 5000) # a plain bst degrades to a linked list on sorted keys
+    report('BinarySearchTree sorted {}'.format(m), bench_insert_lookup_delete(BinarySearchTree(), list(range(m))))
+
+    pairs = [(key, key) for key in range(n)]
+    for tree_class in (AVLTree, BlockedSortedList, Treap, SkipList, IntegerKeyIndex):
+        print('{:<28} kth_largest {:>12,.0f}/s'.format(tree_class.__name__, bench_kth_largest(tree_class.from_sorted(pairs), min(n, 100000))))
+    for tree_class in (AVLTree, BlockedSortedList, Treap, SkipList, IntegerKeyIndex):
+        print('{:<28} churn {:>12,.0f}/s'.format(tree_class.__name__, bench_churn(tree_class.from_sorted(pairs), min(n, 100000))))
+
+    print('{:<28} iterate {:>12,.0f}/s   items {:>12,.0f}/s'.format('AVLTree', *bench_iteration(AVLTree.from_sorted(pairs))))
+    for tree_class in (AVLTree, ScapegoatTree):
+        print('{:<28} delete heavy {:>12,.0f}/s'.format(tree_class.__name__, bench_delete_heavy(tree_class(), keys)))
+
+    print('{:<28} dump {:.3f}s   load {:.3f}s'.format('AVLTree', *bench_dump_load(AVLTree.from_sorted(pairs))))
+
+    for tree_class in (AVLTree, ArrayAVLTree, BlockedSortedList, Treap, SkipList, ScapegoatTree):
+        print('{:<28} {:.1f} bytes per node'.format(tree_class.__name__, bytes_per_node(tree_class(), keys)))
+
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)